@@ -1,8 +1,12 @@
 # core/action_executor.py
 
 import time
-import win32con
-import win32gui  # 이 라인 추가
+try:
+    import win32con
+    import win32gui  # 이 라인 추가
+except ImportError:
+    # 윈도우가 아닌 환경 (리플레이/합성 캡처 백엔드로 파이프라인만 실행)
+    win32con = win32gui = None
 from .window_utils import WindowUtils
 
 class ActionExecutor:
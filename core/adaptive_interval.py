@@ -0,0 +1,97 @@
+# core/adaptive_interval.py
+
+import time
+
+class AdaptiveInterval:
+    """
+    활동 여부에 따라 모니터링 간격을 조절하는 정책
+
+    규칙이 발견되거나 화면이 바뀌면 즉시 최소 간격으로 돌아가고,
+    idle_after초 동안 아무 일도 없으면 주기마다 backoff배씩 늘려 최대 간격까지 늦춥니다.
+    """
+
+    def __init__(self, min_interval=0.1, max_interval=3.0, idle_after=5.0, backoff=1.5, initial=None):
+        """
+        적응형 간격 초기화
+
+        Args:
+            min_interval (float): 활동 중 간격 (초)
+            max_interval (float): 유휴 상태 최대 간격 (초)
+            idle_after (float): 마지막 활동 후 간격을 늘리기 시작할 때까지의 시간 (초)
+            backoff (float): 유휴 상태에서 주기마다 간격에 곱할 값 (1보다 큼)
+            initial (float, optional): 시작 간격 (기본: min_interval)
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f"잘못된 적응형 간격 범위: {min_interval} - {max_interval}")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_after = idle_after
+        self.backoff = max(1.0, backoff)
+        self.initial = min(max(initial or min_interval, min_interval), max_interval)
+
+        self.current = self.initial
+        self._last_activity = None
+
+    @staticmethod
+    def from_config(config, default_interval=1.0):
+        """
+        설정 딕셔너리로 적응형 간격 생성
+
+        설정 예:
+            adaptive_interval: {enabled: true, min: 0.1, max: 3.0, idle_after: 5.0, backoff: 1.5}
+
+        Args:
+            config (dict): 적응형 간격 설정
+            default_interval (float): 고정 모니터링 간격 (시작 간격, 범위 기본값으로 사용)
+
+        Returns:
+            AdaptiveInterval: 적응형 간격 (설정이 없거나 비활성화면 None)
+        """
+        if not config or not config.get('enabled', False):
+            return None
+
+        min_interval = config.get('min', min(0.1, default_interval))
+        max_interval = config.get('max', max(3.0, default_interval))
+        try:
+            return AdaptiveInterval(
+                min_interval=min_interval,
+                max_interval=max_interval,
+                idle_after=config.get('idle_after', 5.0),
+                backoff=config.get('backoff', 1.5),
+                initial=config.get('initial', default_interval)
+            )
+        except ValueError as e:
+            print(f"적응형 간격 설정 오류, 고정 간격 사용: {e}")
+            return None
+
+    def update(self, active, now=None):
+        """
+        이번 주기의 활동 여부를 반영하여 다음 간격 계산
+
+        Args:
+            active (bool): 규칙 발견 또는 화면 변화가 있었는지 여부
+            now (float, optional): 현재 시각 (time.monotonic 기준)
+
+        Returns:
+            float: 다음 주기까지 대기할 간격 (초)
+        """
+        if now is None:
+            now = time.monotonic()
+
+        if active:
+            # 활동 감지: 즉시 최소 간격으로
+            self._last_activity = now
+            self.current = self.min_interval
+        elif self._last_activity is None:
+            # 첫 활동 전에도 유휴 시간 계산 기준은 있어야 함
+            self._last_activity = now
+        elif now - self._last_activity >= self.idle_after:
+            self.current = min(self.max_interval, self.current * self.backoff)
+
+        return self.current
+
+    def reset(self):
+        """시작 상태로 되돌림"""
+        self.current = self.initial
+        self._last_activity = None
@@ -0,0 +1,596 @@
+# core/capture_backends.py
+
+import os
+import time
+import cv2
+import numpy as np
+from .capture_session import CaptureSession, clip_rect, prepare_buffer
+from .session_recording import SessionRecording
+from .shared_frame_pool import SharedFramePool
+
+class CaptureBackend:
+    """
+    화면 캡처 백엔드 인터페이스
+
+    모니터는 캡처 방식과 관계없이 capture()로 BGR 프레임을 받습니다.
+    윈도우가 필요 없는 백엔드(리플레이, 합성)는 requires_window가 False이며
+    게임 없이 윈도우가 아닌 환경에서도 모니터링 파이프라인 전체를 실행할 수 있습니다.
+    """
+
+    # 캡처하려면 대상 윈도우 핸들이 필요한지 여부
+    requires_window = True
+
+    @property
+    def finished(self):
+        """더 이상 캡처할 프레임이 없는지 여부 (반복하지 않는 리플레이 등)"""
+        return False
+
+    def frame_size(self, hwnd=None):
+        """
+        다음 캡처의 전체 프레임 크기 (부분 영역 계산용)
+
+        Args:
+            hwnd (int, optional): 대상 윈도우 핸들
+
+        Returns:
+            tuple: (w, h) 프레임 크기 (알 수 없으면 None)
+        """
+        return None
+
+    def capture(self, hwnd=None, out=None, rect=None):
+        """
+        프레임 한 장 캡처
+
+        Args:
+            hwnd (int, optional): 대상 윈도우 핸들 (requires_window가 True인 백엔드)
+            out (numpy.ndarray, optional): 결과를 기록할 (h, w, 3) uint8 버퍼
+            rect (tuple, optional): 캡처할 (x, y, w, h) 부분 영역 (프레임 기준, None이면 전체)
+
+        Returns:
+            numpy.ndarray: 캡처된 BGR 이미지 (실패 시 None)
+        """
+        raise NotImplementedError
+
+    def to_screen(self, hwnd, x, y):
+        """
+        프레임 좌표를 화면 좌표로 변환 (클릭 위치 계산용)
+
+        Args:
+            hwnd (int): 대상 윈도우 핸들
+            x (int): 프레임 X 좌표
+            y (int): 프레임 Y 좌표
+
+        Returns:
+            tuple: (screen_x, screen_y) - 실제 윈도우가 없는 백엔드는 그대로 반환
+        """
+        return (int(x), int(y))
+
+    def retain_frames(self):
+        """
+        캡처 결과를 다음 캡처 이후에도 그대로 쓸 수 있게 설정 (백그라운드 캡처 링 버퍼용)
+
+        기본 백엔드는 호출자 버퍼나 새 배열에 기록하므로 따로 할 일이 없습니다.
+        """
+        pass
+
+    def close(self):
+        """백엔드가 보유한 리소스 해제"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class WindowCaptureBackend(CaptureBackend):
+    """WindowUtils.capture_window를 사용하는 실제 윈도우 캡처 (pyautogui / DC 방식)"""
+
+    def __init__(self, method="auto", area="client"):
+        """
+        윈도우 캡처 백엔드 초기화
+
+        Args:
+            method (str): 캡처 방식 ("dc", "pyautogui", "auto" 중 선택)
+            area (str): 캡처 영역 ("client": 클라이언트 영역, "window": 제목 표시줄, 테두리 포함)
+        """
+        self.method = method
+        self.area = area
+        self._sessions = {}  # 윈도우 핸들 -> 이 백엔드 전용 캡처 세션 (GUI 등의 공유 세션과 별도)
+
+    @property
+    def client_only(self):
+        """클라이언트 영역만 캡처하는지 여부"""
+        return self.area != 'window'
+
+    @staticmethod
+    def from_config(config, templates=None):
+        return WindowCaptureBackend(method=config.get('method', 'auto'), area=config.get('area', 'client'))
+
+    def frame_size(self, hwnd=None):
+        # pywin32는 실제 윈도우를 캡처할 때만 필요하므로 여기서 가져옴
+        from .window_utils import WindowUtils
+        try:
+            if self.client_only:
+                left, top, right, bottom = WindowUtils.get_client_rect(hwnd)
+            else:
+                left, top, right, bottom = WindowUtils.get_window_rect(hwnd)
+        except Exception as e:
+            print(f"캡처 영역 크기 확인 오류: {e}")
+            return None
+        return (right - left, bottom - top)
+
+    def capture(self, hwnd=None, out=None, rect=None):
+        from .window_utils import WindowUtils
+        session = None
+        if hwnd and self.method != "pyautogui":
+            session = self._sessions.get(hwnd)
+            if session is None or session.closed:
+                session = CaptureSession(hwnd)
+                self._sessions[hwnd] = session
+        return WindowUtils.capture_window(hwnd, method=self.method, out=out, rect=rect,
+                                          client_only=self.client_only, session=session)
+
+    def to_screen(self, hwnd, x, y):
+        from .window_utils import WindowUtils
+        if self.client_only:
+            return WindowUtils.client_to_screen(hwnd, int(x), int(y))
+
+        left, top, right, bottom = WindowUtils.get_window_rect(hwnd)
+        return (left + int(x), top + int(y))
+
+    def close(self):
+        # 이 백엔드가 만든 세션만 해제 (같은 윈도우의 공유 세션은 다른 사용자가 계속 사용)
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                print(f"캡처 세션 해제 오류: {e}")
+
+class DirectoryReplayBackend(CaptureBackend):
+    """디렉토리의 이미지 파일을 파일 이름 순서대로 프레임으로 재생하는 백엔드"""
+
+    requires_window = False
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+    def __init__(self, path, fps=0, loop=True, preload=True):
+        """
+        리플레이 백엔드 초기화
+
+        Args:
+            path (str): 프레임 이미지 디렉토리 경로
+            fps (float): 재생 속도 (0이면 capture 호출마다 다음 프레임 - 최대 속도)
+            loop (bool): 마지막 프레임 이후 처음부터 다시 재생할지 여부
+            preload (bool): 모든 프레임을 미리 디코딩해 둘지 여부
+                (디코딩 비용이 측정에 섞이지 않음)
+        """
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+
+        self.files = sorted(
+            os.path.join(path, filename) for filename in os.listdir(path)
+            if filename.lower().endswith(self.IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            raise ValueError(f"재생할 프레임 이미지가 없음: {path}")
+
+        self._frames = [self._read(file) for file in self.files] if preload else None
+        self.position = 0           # 다음에 재생할 프레임 번호 (반복 포함 누적)
+        self._start_time = None
+        self._finished = False
+        self._last_read = (None, None)  # 미리 디코딩하지 않을 때 마지막으로 읽은 (번호, 프레임)
+
+    @staticmethod
+    def from_config(config, templates=None):
+        return DirectoryReplayBackend(
+            config['path'],
+            fps=config.get('fps', 0),
+            loop=config.get('loop', True),
+            preload=config.get('preload', True)
+        )
+
+    @property
+    def finished(self):
+        return self._finished
+
+    @property
+    def frame_count(self):
+        """디렉토리의 프레임 수"""
+        return len(self.files)
+
+    def frame_size(self, hwnd=None):
+        index = self._next_index()
+        if index is None:
+            return None
+
+        frame = self._frame(index)
+        return (frame.shape[1], frame.shape[0]) if frame is not None else None
+
+    def capture(self, hwnd=None, out=None, rect=None):
+        index = self._next_index()
+        if index is None:
+            self._finished = True
+            return None
+
+        if not self.fps:
+            self.position += 1
+
+        frame = self._frame(index)
+        if frame is None:
+            return None
+
+        region = clip_rect(rect, frame.shape[1], frame.shape[0])
+        if region is None:
+            return None
+        x, y, w, h = region
+
+        # 미리 디코딩된 프레임은 호출자가 수정하지 못하도록 버퍼로 복사
+        out = prepare_buffer(out, h, w)
+        np.copyto(out, frame[y:y + h, x:x + w])
+        return out
+
+    def _next_index(self):
+        """
+        다음에 재생할 프레임 파일 번호 (내부 사용)
+
+        Returns:
+            int: 프레임 번호 (반복하지 않는 재생이 끝났으면 None)
+        """
+        if self._finished:
+            return None
+
+        if self.fps and self.fps > 0:
+            # 실시간 재생: 경과 시간에 해당하는 프레임 (처리가 늦으면 중간 프레임은 건너뜀)
+            now = time.monotonic()
+            if self._start_time is None:
+                self._start_time = now
+            self.position = int((now - self._start_time) * self.fps)
+
+        if self.position >= len(self.files):
+            if not self.loop:
+                return None
+            return self.position % len(self.files)
+        return self.position
+
+    def _frame(self, index):
+        """
+        프레임 이미지 가져오기 (내부 사용)
+
+        Args:
+            index (int): 프레임 번호
+
+        Returns:
+            numpy.ndarray: BGR 이미지 (읽기 실패 시 None)
+        """
+        if self._frames is not None:
+            return self._frames[index]
+
+        if self._last_read[0] != index:
+            self._last_read = (index, self._read(self.files[index]))
+        return self._last_read[1]
+
+    def _read(self, file):
+        """
+        프레임 이미지 읽기 (내부 사용)
+
+        Args:
+            file (str): 이미지 파일 경로
+
+        Returns:
+            numpy.ndarray: BGR 이미지 (읽기 실패 시 None)
+        """
+        frame = cv2.imread(file, cv2.IMREAD_COLOR)
+        if frame is None:
+            print(f"프레임 이미지 읽기 실패: {file}")
+        return frame
+
+class RecordingReplayBackend(CaptureBackend):
+    """SessionRecorder로 기록한 세션의 프레임을 순서대로 재생하는 백엔드"""
+
+    requires_window = False
+
+    def __init__(self, path, loop=False):
+        """
+        기록 재생 백엔드 초기화
+
+        Args:
+            path (str): 기록 디렉토리 경로
+            loop (bool): 마지막 프레임 이후 처음부터 다시 재생할지 여부
+        """
+        self.recording = SessionRecording(path)
+        if not len(self.recording):
+            raise ValueError(f"재생할 프레임이 없는 기록: {path}")
+
+        self.loop = loop
+        self.position = 0
+        self._finished = False
+
+    @staticmethod
+    def from_config(config, templates=None):
+        return RecordingReplayBackend(config['path'], loop=config.get('loop', False))
+
+    @property
+    def finished(self):
+        return self._finished
+
+    def frame_size(self, hwnd=None):
+        if self._finished:
+            return None
+
+        entry = self.recording.entries[self.position % len(self.recording)]
+        if entry.get('frame_size'):
+            return tuple(entry['frame_size'])
+        return (entry['shape'][1], entry['shape'][0])
+
+    def capture(self, hwnd=None, out=None, rect=None):
+        if self._finished:
+            return None
+
+        if self.position >= len(self.recording) and not self.loop:
+            self._finished = True
+            return None
+
+        image, entry = self.recording.frame(self.position % len(self.recording))
+        self.position += 1
+
+        # 요청 영역을 기록된 (부분) 이미지 기준 좌표로 변환
+        if rect is not None:
+            ox, oy = entry.get('origin') or (0, 0)
+            rect = (rect[0] - ox, rect[1] - oy, rect[2], rect[3])
+
+        region = clip_rect(rect, image.shape[1], image.shape[0])
+        if region is None:
+            return None
+        x, y, w, h = region
+
+        out = prepare_buffer(out, h, w)
+        np.copyto(out, image[y:y + h, x:x + w])
+        return out
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """배경 위에 템플릿 이미지를 배치한 합성 프레임을 생성하는 백엔드 (부하 테스트용)"""
+
+    requires_window = False
+
+    def __init__(self, width=800, height=600, templates=None, template_names=None,
+                 move_every=0, noise=0, seed=None):
+        """
+        합성 캡처 백엔드 초기화
+
+        Args:
+            width (int): 프레임 너비
+            height (int): 프레임 높이
+            templates (Mapping, optional): 템플릿 이름 -> 이미지 (ImageRecognition.templates 등)
+            template_names (list, optional): 프레임에 배치할 템플릿 이름 (None이면 전체)
+            move_every (int): 템플릿 위치를 다시 정하는 프레임 간격 (0이면 고정 위치)
+            noise (int): 프레임마다 더할 무작위 밝기 잡음 크기 (0이면 없음)
+            seed (int, optional): 난수 시드 (같은 시드면 같은 프레임 순서)
+        """
+        self.width = int(width)
+        self.height = int(height)
+        self.move_every = int(move_every)
+        self.noise = int(noise)
+        self.frame_index = 0
+
+        self._rng = np.random.default_rng(seed)
+
+        # 매칭이 실제 화면처럼 동작하도록 부드러운 질감의 배경을 한 번만 생성
+        coarse = self._rng.integers(0, 256, (max(1, self.height // 16), max(1, self.width // 16), 3), dtype=np.uint8)
+        self._background = cv2.resize(coarse, (self.width, self.height), interpolation=cv2.INTER_LINEAR)
+
+        self._sprites = []
+        templates = templates or {}
+        names = template_names if template_names is not None else list(templates)
+        for name in names:
+            if name not in templates:
+                print(f"합성 프레임 템플릿 없음: {name}")
+                continue
+
+            image = np.asarray(templates[name])
+            if len(image.shape) == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            h, w = image.shape[:2]
+            if w > self.width or h > self.height:
+                print(f"합성 프레임보다 큰 템플릿 제외: {name} ({w}x{h})")
+                continue
+            self._sprites.append((name, image))
+
+        # 마지막 프레임에 배치된 템플릿 [(name, (x, y, w, h)), ...] - 인식 정확도 확인용
+        self.placements = []
+        self._frame = None
+        self._noise_buffer = None
+
+    @staticmethod
+    def from_config(config, templates=None):
+        return SyntheticCaptureBackend(
+            width=config.get('width', 800),
+            height=config.get('height', 600),
+            templates=templates,
+            template_names=config.get('templates'),
+            move_every=config.get('move_every', 0),
+            noise=config.get('noise', 0),
+            seed=config.get('seed')
+        )
+
+    def frame_size(self, hwnd=None):
+        return (self.width, self.height)
+
+    def capture(self, hwnd=None, out=None, rect=None):
+        region = clip_rect(rect, self.width, self.height)
+        if region is None:
+            return None
+
+        if not self.placements or (self.move_every and self.frame_index % self.move_every == 0):
+            self._place_sprites()
+        self.frame_index += 1
+
+        # 전체 프레임이면 결과 버퍼에 바로 합성, 부분 영역이면 내부 버퍼에 합성 후 복사
+        full = region == (0, 0, self.width, self.height)
+        if full:
+            frame = out = prepare_buffer(out, self.height, self.width)
+        else:
+            frame = self._frame = prepare_buffer(self._frame, self.height, self.width)
+
+        np.copyto(frame, self._background)
+        for (name, image), (_, (x, y, w, h)) in zip(self._sprites, self.placements):
+            frame[y:y + h, x:x + w] = image
+
+        if self.noise > 0:
+            self._noise_buffer = prepare_buffer(self._noise_buffer, self.height, self.width)
+            cv2.randu(self._noise_buffer, 0, self.noise + 1)
+            cv2.add(frame, self._noise_buffer, dst=frame)
+
+        if full:
+            return out
+
+        x, y, w, h = region
+        out = prepare_buffer(out, h, w)
+        np.copyto(out, frame[y:y + h, x:x + w])
+        return out
+
+    def _place_sprites(self):
+        """
+        템플릿 배치 위치를 무작위로 다시 정하기 (내부 사용)
+        """
+        self.placements = []
+        for name, image in self._sprites:
+            h, w = image.shape[:2]
+            x = int(self._rng.integers(0, self.width - w + 1))
+            y = int(self._rng.integers(0, self.height - h + 1))
+            self.placements.append((name, (x, y, w, h)))
+
+class SharedFrameBackend(CaptureBackend):
+    """
+    다른 프로세스가 SharedFramePool에 게시한 프레임을 읽는 백엔드
+
+    캡처는 생산자 프로세스가 담당하므로 윈도우 핸들이 필요 없으며,
+    프레임은 공유 메모리를 직접 가리키는 읽기 전용 뷰로 반환됩니다 (copy가 False일 때).
+    """
+
+    requires_window = False
+
+    def __init__(self, name, timeout=1.0, copy=False):
+        """
+        공유 프레임 백엔드 초기화
+
+        Args:
+            name (str): 공유 프레임 풀 이름
+            timeout (float): 새 프레임을 기다릴 최대 시간 (초)
+            copy (bool): 공유 메모리 뷰 대신 out 버퍼에 복사해 반환할지 여부
+        """
+        self.pool = SharedFramePool.attach(name)
+        self.timeout = timeout
+        self.copy = copy
+        self.last_seq = 0
+        self.last_frame = None
+
+    @staticmethod
+    def from_config(config, templates=None):
+        return SharedFrameBackend(config['name'], timeout=config.get('timeout', 1.0),
+                                  copy=config.get('copy', False))
+
+    @property
+    def finished(self):
+        return self.pool.shm is None or self.pool.closed
+
+    def frame_size(self, hwnd=None):
+        if self.last_frame is not None:
+            return self.last_frame.frame_size
+        return None
+
+    def capture(self, hwnd=None, out=None, rect=None):
+        if self.finished:
+            return None
+
+        frame = self.pool.wait(self.last_seq, timeout=self.timeout)
+        if frame is None:
+            return None
+        self.last_seq = frame.seq
+        self.last_frame = frame
+
+        # 요청 영역을 게시된 (부분) 이미지 기준 좌표로 변환
+        if rect is not None:
+            ox, oy = frame.origin
+            rect = (rect[0] - ox, rect[1] - oy, rect[2], rect[3])
+
+        region = clip_rect(rect, frame.image.shape[1], frame.image.shape[0])
+        if region is None:
+            return None
+        x, y, w, h = region
+
+        image = frame.image[y:y + h, x:x + w]
+        if not self.copy:
+            return image
+
+        out = prepare_buffer(out, h, w)
+        np.copyto(out, image)
+        return out
+
+    def retain_frames(self):
+        # 공유 메모리 뷰는 다음 capture() 때 보호가 풀려 생산자가 덮어쓸 수 있으므로 복사
+        self.copy = True
+
+    def to_screen(self, hwnd, x, y):
+        # 생산자가 기록한 윈도우 핸들 기준 클라이언트 좌표로 변환
+        if self.last_frame is None or not self.last_frame.hwnd:
+            return (int(x), int(y))
+
+        from .window_utils import WindowUtils
+        try:
+            return WindowUtils.client_to_screen(self.last_frame.hwnd, int(x), int(y))
+        except Exception as e:
+            print(f"화면 좌표 변환 오류: {e}")
+            return (int(x), int(y))
+
+    def close(self):
+        self.last_frame = None
+        self.pool.close()
+
+# 설정의 backend 이름 -> 백엔드 클래스 (from_config 정적 메서드 필요)
+CAPTURE_BACKENDS = {
+    'window': WindowCaptureBackend,
+    'replay': DirectoryReplayBackend,
+    'recording': RecordingReplayBackend,
+    'synthetic': SyntheticCaptureBackend,
+    'shared': SharedFrameBackend,
+}
+
+def create_capture_backend(config=None, templates=None):
+    """
+    프로그램 설정으로 캡처 백엔드 생성
+
+    설정 예:
+        capture: {backend: window, method: auto, area: client}  # 실제 윈도우 (기본값)
+        capture: {backend: replay, path: frames/run1, fps: 0, loop: true}
+        capture: {backend: recording, path: recordings/Gersang_20240101_120000}
+        capture: {backend: synthetic, width: 800, height: 600, templates: [ok_button], move_every: 10}
+        capture: {backend: shared, name: gersang_frames, timeout: 1.0}  # 다른 프로세스의 공유 프레임
+
+    Args:
+        config (dict, optional): 캡처 설정 (없으면 윈도우 캡처)
+        templates (Mapping, optional): 합성 백엔드가 사용할 템플릿 이름 -> 이미지
+
+    Returns:
+        CaptureBackend: 캡처 백엔드 (설정이 잘못되면 윈도우 캡처로 대체)
+    """
+    config = config or {}
+    name = config.get('backend', 'window')
+
+    # 기존 캡처 방식 이름도 그대로 허용 (backend: dc / pyautogui / auto)
+    if name in ('dc', 'pyautogui', 'auto'):
+        return WindowCaptureBackend(method=name, area=config.get('area', 'client'))
+
+    backend_class = CAPTURE_BACKENDS.get(name)
+    if backend_class is None:
+        print(f"알 수 없는 캡처 백엔드 '{name}', 윈도우 캡처 사용")
+        return WindowCaptureBackend()
+
+    try:
+        return backend_class.from_config(config, templates=templates)
+    except (KeyError, OSError, ValueError) as e:
+        print(f"캡처 백엔드 '{name}' 생성 오류, 윈도우 캡처 사용: {e}")
+        return WindowCaptureBackend()
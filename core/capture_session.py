@@ -0,0 +1,326 @@
+# core/capture_session.py
+
+import ctypes
+import threading
+import cv2
+import numpy as np
+
+def prepare_buffer(out, height, width, channels=3):
+    """
+    결과 버퍼 확인 (크기나 형식이 맞지 않으면 새로 할당)
+
+    Args:
+        out (numpy.ndarray): 재사용할 버퍼 (None 가능)
+        height (int): 이미지 높이
+        width (int): 이미지 너비
+        channels (int): 채널 수
+
+    Returns:
+        numpy.ndarray: (h, w, channels) uint8 버퍼
+    """
+    shape = (height, width, channels)
+    if out is None or out.shape != shape or out.dtype != np.uint8:
+        return np.empty(shape, dtype=np.uint8)
+    return out
+
+def clip_rect(rect, width, height):
+    """
+    캡처 영역을 이미지 범위로 자르기
+
+    Args:
+        rect (tuple): (x, y, w, h) 영역 (None이면 전체)
+        width (int): 이미지 너비
+        height (int): 이미지 높이
+
+    Returns:
+        tuple: 잘린 (x, y, w, h) 영역 (겹치는 부분이 없으면 None)
+    """
+    if rect is None:
+        return (0, 0, width, height)
+
+    x, y, w, h = [int(v) for v in rect]
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(width, x + w), min(height, y + h)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+def bgra_to_bgr(bgra, out=None):
+    """
+    (h, w, 4) BGRA 배열에서 알파 채널 제거
+
+    Args:
+        bgra (numpy.ndarray): BGRA 이미지
+        out (numpy.ndarray, optional): 결과를 기록할 (h, w, 3) uint8 버퍼
+
+    Returns:
+        numpy.ndarray: BGR 이미지 (out 크기가 맞으면 out 자체)
+    """
+    out = prepare_buffer(out, bgra.shape[0], bgra.shape[1])
+    return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+
+class GdiBackend:
+    """
+    캡처 세션이 사용하는 GDI 호출 인터페이스
+
+    실제 윈도우 환경에서는 Win32GdiBackend를 사용하고,
+    윈도우가 아닌 환경의 테스트에서는 같은 메서드를 가진 가짜 구현으로 대체합니다.
+    """
+
+    def get_window_size(self, hwnd):
+        """(w, h) 윈도우 전체 크기 (제목 표시줄, 테두리 포함)"""
+        raise NotImplementedError
+
+    def get_client_size(self, hwnd):
+        """(w, h) 클라이언트 영역 크기"""
+        raise NotImplementedError
+
+    def get_window_dc(self, hwnd):
+        """윈도우 DC 가져오기"""
+        raise NotImplementedError
+
+    def create_compatible_dc(self, window_dc):
+        """윈도우 DC와 호환되는 메모리 DC 생성"""
+        raise NotImplementedError
+
+    def create_bitmap(self, window_dc, width, height):
+        """윈도우 DC와 호환되는 비트맵 생성"""
+        raise NotImplementedError
+
+    def select_object(self, mem_dc, bitmap):
+        """메모리 DC에 비트맵 선택"""
+        raise NotImplementedError
+
+    def print_window(self, hwnd, mem_dc, flags):
+        """윈도우 내용을 메모리 DC에 그리기 (성공 여부 반환)"""
+        raise NotImplementedError
+
+    def read_bits(self, bitmap, width, height, out):
+        """비트맵 위쪽 height개 행의 픽셀을 (height, w, 4) BGRA 버퍼로 읽기 (읽은 배열 반환)"""
+        raise NotImplementedError
+
+    def delete_bitmap(self, bitmap):
+        """비트맵 해제"""
+        raise NotImplementedError
+
+    def delete_dc(self, mem_dc):
+        """메모리 DC 해제"""
+        raise NotImplementedError
+
+    def release_window_dc(self, hwnd, window_dc):
+        """윈도우 DC 반환"""
+        raise NotImplementedError
+
+class Win32GdiBackend(GdiBackend):
+    """pywin32를 사용하는 실제 GDI 구현"""
+
+    # PrintWindow 플래그
+    PW_CLIENTONLY = 1
+    PW_RENDERFULLCONTENT = 2
+
+    def __init__(self):
+        import win32gui
+        import win32ui
+        from ctypes import windll
+        self._win32gui = win32gui
+        self._win32ui = win32ui
+        self._windll = windll
+        self._direct_bits = True  # GetBitmapBits로 NumPy 버퍼에 직접 기록 가능 여부
+
+    def get_window_size(self, hwnd):
+        left, top, right, bottom = self._win32gui.GetWindowRect(hwnd)
+        return right - left, bottom - top
+
+    def get_client_size(self, hwnd):
+        left, top, right, bottom = self._win32gui.GetClientRect(hwnd)
+        return right - left, bottom - top
+
+    def get_window_dc(self, hwnd):
+        hwnd_dc = self._win32gui.GetWindowDC(hwnd)
+        try:
+            return (hwnd_dc, self._win32ui.CreateDCFromHandle(hwnd_dc))
+        except Exception:
+            self._win32gui.ReleaseDC(hwnd, hwnd_dc)
+            raise
+
+    def create_compatible_dc(self, window_dc):
+        return window_dc[1].CreateCompatibleDC()
+
+    def create_bitmap(self, window_dc, width, height):
+        bitmap = self._win32ui.CreateBitmap()
+        bitmap.CreateCompatibleBitmap(window_dc[1], width, height)
+        return bitmap
+
+    def select_object(self, mem_dc, bitmap):
+        mem_dc.SelectObject(bitmap)
+
+    def print_window(self, hwnd, mem_dc, flags):
+        return bool(self._windll.user32.PrintWindow(hwnd, mem_dc.GetSafeHdc(), flags))
+
+    def read_bits(self, bitmap, width, height, out):
+        # 중간 bytes 객체 없이 GDI가 NumPy 메모리에 직접 기록
+        # (64비트에서 핸들/주소가 C int로 잘리지 않도록 포인터 형식으로 전달)
+        if self._direct_bits:
+            try:
+                copied = self._windll.gdi32.GetBitmapBits(
+                    ctypes.c_void_p(bitmap.GetHandle()), ctypes.c_long(out.nbytes),
+                    out.ctypes.data_as(ctypes.c_void_p)
+                )
+                if copied == out.nbytes:
+                    return out
+            except Exception as e:
+                # 이후 캡처는 바로 pywin32 방식 사용
+                print(f"GetBitmapBits 직접 기록 오류, pywin32 방식 사용: {e}")
+                self._direct_bits = False
+
+        # 실패 시 pywin32 방식으로 대체 (bytes 객체를 복사 없이 참조)
+        bits = bitmap.GetBitmapBits(True)
+        return np.frombuffer(bits, dtype=np.uint8, count=out.nbytes).reshape(height, width, 4)
+
+    def delete_bitmap(self, bitmap):
+        self._win32gui.DeleteObject(bitmap.GetHandle())
+
+    def delete_dc(self, mem_dc):
+        mem_dc.DeleteDC()
+
+    def release_window_dc(self, hwnd, window_dc):
+        hwnd_dc, mfc_dc = window_dc
+        try:
+            mfc_dc.DeleteDC()
+        finally:
+            self._win32gui.ReleaseDC(hwnd, hwnd_dc)
+
+class CaptureSession:
+    """
+    윈도우 하나에 대한 지속 캡처 세션
+
+    윈도우 DC, 메모리 DC, 비트맵을 유지하면서 재사용하고 캡처 크기가 바뀔 때만
+    다시 만듭니다. 할당된 GDI 핸들 수를 추적하며 close() 시 모두 해제합니다.
+    """
+
+    def __init__(self, hwnd, backend=None):
+        """
+        캡처 세션 초기화
+
+        Args:
+            hwnd (int): 윈도우 핸들
+            backend (GdiBackend, optional): GDI 구현 (기본: Win32GdiBackend)
+        """
+        self.hwnd = hwnd
+        self.backend = backend if backend is not None else Win32GdiBackend()
+        self.size = None
+        self.closed = False
+
+        # 핸들 사용 현황
+        self.allocated_handles = 0   # 현재 보유 중인 GDI 핸들 수
+        self.total_allocations = 0   # 세션 동안 생성한 핸들 수 (재생성 포함)
+
+        self._window_dc = None
+        self._mem_dc = None
+        self._bitmap = None
+        self._bgra = None
+        self._lock = threading.Lock()
+
+    def capture(self, out=None, flags=Win32GdiBackend.PW_RENDERFULLCONTENT, rect=None, client_only=True):
+        """
+        윈도우 화면 캡처
+
+        Args:
+            out (numpy.ndarray, optional): 결과를 기록할 (h, w, 3) uint8 버퍼
+            flags (int): PrintWindow 플래그
+            rect (tuple, optional): 캡처할 (x, y, w, h) 부분 영역 (캡처 영역 기준, None이면 전체)
+            client_only (bool): 클라이언트 영역만 캡처할지 여부 (False면 윈도우 전체)
+
+        Returns:
+            numpy.ndarray: 캡처된 BGR 이미지 (실패 시 None)
+        """
+        with self._lock:
+            if self.closed:
+                return None
+
+            if client_only:
+                width, height = self.backend.get_client_size(self.hwnd)
+                flags |= Win32GdiBackend.PW_CLIENTONLY
+            else:
+                width, height = self.backend.get_window_size(self.hwnd)
+            if width <= 0 or height <= 0:
+                return None
+
+            region = clip_rect(rect, width, height)
+            if region is None:
+                return None
+
+            # 크기가 바뀐 경우에만 GDI 리소스 재생성
+            if self.size != (width, height):
+                self._release()
+                self._allocate(width, height)
+
+            if not self.backend.print_window(self.hwnd, self._mem_dc, flags):
+                # 실패 시 대체 방식 시도
+                self.backend.print_window(self.hwnd, self._mem_dc, flags & Win32GdiBackend.PW_CLIENTONLY)
+
+            # 비트맵은 위쪽 행부터 저장되므로 부분 영역 아래쪽 행은 읽지 않음
+            x, y, w, h = region
+            self._bgra = prepare_buffer(self._bgra, height, width, 4)
+            bgra = self.backend.read_bits(self._bitmap, width, y + h, self._bgra[:y + h])
+            return bgra_to_bgr(bgra[y:y + h, x:x + w], out)
+
+    def close(self):
+        """보유한 모든 GDI 리소스 해제"""
+        with self._lock:
+            self._release()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _allocate(self, width, height):
+        """
+        GDI 리소스 생성 (중간에 실패하면 이미 만든 리소스를 해제) (내부 사용)
+
+        Args:
+            width (int): 비트맵 너비
+            height (int): 비트맵 높이
+        """
+        try:
+            self._window_dc = self.backend.get_window_dc(self.hwnd)
+            self._count_allocation()
+            self._mem_dc = self.backend.create_compatible_dc(self._window_dc)
+            self._count_allocation()
+            self._bitmap = self.backend.create_bitmap(self._window_dc, width, height)
+            self._count_allocation()
+            self.backend.select_object(self._mem_dc, self._bitmap)
+            self.size = (width, height)
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        """
+        보유 중인 GDI 리소스를 생성 역순으로 해제 (내부 사용)
+        """
+        try:
+            if self._bitmap is not None:
+                bitmap, self._bitmap = self._bitmap, None
+                self.allocated_handles -= 1
+                self.backend.delete_bitmap(bitmap)
+        finally:
+            try:
+                if self._mem_dc is not None:
+                    mem_dc, self._mem_dc = self._mem_dc, None
+                    self.allocated_handles -= 1
+                    self.backend.delete_dc(mem_dc)
+            finally:
+                if self._window_dc is not None:
+                    window_dc, self._window_dc = self._window_dc, None
+                    self.allocated_handles -= 1
+                    self.backend.release_window_dc(self.hwnd, window_dc)
+                self.size = None
+
+    def _count_allocation(self):
+        """핸들 생성 횟수 기록 (내부 사용)"""
+        self.allocated_handles += 1
+        self.total_allocations += 1
@@ -0,0 +1,217 @@
+# core/fingerprint_cache.py
+
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+from .frame_context import FrameContext
+
+class FingerprintCache:
+    """
+    화면 지문(축소 그레이스케일 + 차이 해시) -> 이전 인식 결과 캐시
+
+    검색 영역을 격자 칸별 밝기 평균과 표준편차(축소 이미지)로 줄이고, 이웃 칸의 평균 밝기
+    대소를 비트로 만든 해시(dHash)와 함께 지문으로 사용합니다. 같은 키(규칙)에 대해 해밍 거리가
+    max_distance 이하이고 축소 이미지의 칸별 차이가 max_pixel_diff 이하인 지문이
+    저장되어 있으면 그때의 결과를 재사용하므로, 메뉴나 로딩 화면처럼 반복해서 나타나는
+    화면은 매칭 없이 처리됩니다.
+
+    찾는 대상(템플릿) 크기를 알려주면 격자 한 칸이 대상의 절반 이하가 되도록 격자를 키워
+    대상 하나가 나타나거나 사라져도 적어도 한 칸의 평균 또는 표준편차(무늬)가 바뀌게 합니다. 이때 격자가
+    max_grid를 넘는 경우(넓은 영역에서 작은 대상 검색)는 지문을 만들지 않고 캐시를 쓰지 않습니다.
+    가장 오래 사용하지 않은 항목부터 제거하며(LRU), 저장 후 ttl초가 지난 결과는 다시 계산합니다.
+    """
+
+    def __init__(self, hash_size=16, max_distance=4, capacity=256, ttl=30.0, max_pixel_diff=6, max_grid=128):
+        """
+        지문 캐시 초기화
+
+        Args:
+            hash_size (int): 해시 격자 크기 (지문 비트 수는 hash_size * hash_size)
+            max_distance (int): 같은 화면으로 볼 최대 해밍 거리 (비트 수)
+            capacity (int): 최대 저장 항목 수
+            ttl (float): 저장된 결과의 유효 시간 (초, None이면 제한 없음)
+            max_pixel_diff (int): 같은 화면으로 볼 축소 이미지 칸별 최대 평균/표준편차 차이 (0-255)
+            max_grid (int): 격자 한 변의 최대 칸 수 (넘으면 캐시 사용 안 함)
+        """
+        self.hash_size = max(2, int(hash_size))
+        self.max_distance = max(0, int(max_distance))
+        self.capacity = max(1, int(capacity))
+        self.ttl = ttl
+        self.max_pixel_diff = max_pixel_diff
+        self.max_grid = max(self.hash_size, int(max_grid))
+
+        self._entries = OrderedDict()   # (키, 해시) -> (결과, 저장 시각, 축소 이미지) - 사용 순서
+        self._by_key = {}               # 키 -> {해시, ...}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0            # 격자가 너무 커서 지문을 만들지 않은 횟수
+
+    @staticmethod
+    def from_config(config):
+        """
+        설정 딕셔너리로 지문 캐시 생성
+
+        설정 예:
+            fingerprint_cache: {enabled: true, hash_size: 16, max_distance: 4, max_pixel_diff: 6,
+                                capacity: 256, ttl: 30.0}
+
+        Args:
+            config (dict): 지문 캐시 설정
+
+        Returns:
+            FingerprintCache: 지문 캐시 (설정이 없거나 비활성화면 None)
+        """
+        if not config or not config.get('enabled', False):
+            return None
+
+        return FingerprintCache(
+            hash_size=config.get('hash_size', 16),
+            max_distance=config.get('max_distance', 4),
+            capacity=config.get('capacity', 256),
+            ttl=config.get('ttl', 30.0),
+            max_pixel_diff=config.get('max_pixel_diff', 6),
+            max_grid=config.get('max_grid', 128)
+        )
+
+    def fingerprint(self, image, rect=None, feature_size=None):
+        """
+        이미지(또는 일부 영역)의 지문 계산
+
+        Args:
+            image (numpy.ndarray | FrameContext): 이미지
+            rect (tuple, optional): (x, y, w, h) 영역 (None이면 이미지 전체)
+            feature_size (tuple, optional): 찾는 대상 (w, h) 크기 (격자 칸 크기 결정)
+
+        Returns:
+            tuple: (해시, 축소 이미지) 지문 - 축소 이미지는 (rows, cols, 2) 칸별 평균과 표준편차
+                (영역이 비어 있거나 격자가 너무 크면 None)
+        """
+        frame = FrameContext.wrap(image)
+        if rect is not None:
+            frame = frame.crop(rect)
+            if frame is None:
+                return None
+
+        height, width = frame.shape[:2]
+        cols, rows = self.hash_size + 1, self.hash_size
+        if feature_size:
+            cell = max(1, min(feature_size) // 2)
+            cols = max(cols, min(width, -(-width // cell)) + 1)
+            rows = max(rows, min(height, -(-height // cell)))
+            if cols > self.max_grid + 1 or rows > self.max_grid:
+                self.uncacheable += 1
+                return None
+
+        # 칸별 평균과 표준편차 (평균이 같은 대상이 나타나도 무늬 변화로 구분)
+        # 영역별 하위 프레임에 캐시되므로 같은 프레임의 같은 영역은 규칙이 여러 개여도 한 번만 계산
+        mean, stddev = frame.cell_stats(cols, rows)
+        small = np.clip(np.dstack((mean, stddev)) + 0.5, 0, 255).astype(np.uint8)
+
+        bits = (mean[:, 1:] > mean[:, :-1]).ravel()
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big'), small
+
+    def lookup(self, key, fingerprint, now=None):
+        """
+        지문이 가까운 저장 결과 찾기
+
+        Args:
+            key (hashable): 결과 구분 키 (규칙 인덱스 등)
+            fingerprint (tuple): fingerprint() 결과
+            now (float, optional): 현재 시각 (time.monotonic 기준)
+
+        Returns:
+            object: 저장된 결과 (없으면 None)
+        """
+        if fingerprint is None:
+            return None
+        if now is None:
+            now = time.monotonic()
+
+        # 해밍 거리가 가까운 순으로, 축소 이미지 칸별 차이까지 허용 범위인 첫 항목 사용
+        value, small = fingerprint
+        candidates = []
+        for candidate in self._by_key.get(key, ()):
+            distance = bin(candidate ^ value).count('1')
+            if distance <= self.max_distance:
+                candidates.append((distance, candidate))
+
+        for distance, candidate in sorted(candidates):
+            entry = (key, candidate)
+            result, stored_at, stored_small = self._entries[entry]
+            if self.ttl is not None and now - stored_at > self.ttl:
+                self._discard(entry)
+                continue
+            if (stored_small.shape == small.shape
+                    and int(cv2.absdiff(stored_small, small).max()) <= self.max_pixel_diff):
+                self._entries.move_to_end(entry)
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def store(self, key, fingerprint, result, now=None):
+        """
+        결과 저장 (용량을 넘으면 가장 오래 사용하지 않은 항목 제거)
+
+        Args:
+            key (hashable): 결과 구분 키
+            fingerprint (tuple): fingerprint() 결과
+            result (object): 저장할 결과
+            now (float, optional): 현재 시각 (time.monotonic 기준)
+        """
+        if fingerprint is None:
+            return
+        if now is None:
+            now = time.monotonic()
+
+        value, small = fingerprint
+        entry = (key, value)
+        self._entries[entry] = (result, now, small)
+        self._entries.move_to_end(entry)
+        self._by_key.setdefault(key, set()).add(value)
+
+        while len(self._entries) > self.capacity:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _discard(self, entry):
+        """
+        항목 제거 (내부 사용)
+
+        Args:
+            entry (tuple): (키, 해시)
+        """
+        del self._entries[entry]
+        key, value = entry
+        values = self._by_key.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del self._by_key[key]
+
+    def reset(self):
+        """저장된 결과 모두 제거"""
+        self._entries.clear()
+        self._by_key.clear()
+
+    def stats(self):
+        """
+        지문 캐시 통계
+
+        Returns:
+            dict: entries, hits, misses, evictions, uncacheable, hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'uncacheable': self.uncacheable,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,204 @@
+# core/frame_change.py
+
+import time
+import cv2
+import numpy as np
+from .frame_context import FrameContext
+
+class FrameChangeDetector:
+    """축소 이미지 평균 절대 차이로 화면 변화 여부를 판단하는 검출기"""
+
+    def __init__(self, threshold=2.0, max_skip_age=5.0, sample_size=(64, 48)):
+        """
+        화면 변화 검출기 초기화
+
+        Args:
+            threshold (float): 변화로 판단할 평균 절대 차이 (0-255 밝기 단위)
+            max_skip_age (float): 변화가 없어도 다시 인식을 수행할 최대 경과 시간 (초)
+            sample_size (tuple): 비교용 축소 이미지 크기 (w, h)
+        """
+        self.threshold = threshold
+        self.max_skip_age = max_skip_age
+        self.sample_size = tuple(sample_size)
+
+        self._reference = None      # 마지막으로 인식을 수행한 프레임의 축소 이미지
+        self._reference_time = 0.0
+        self.last_difference = 0.0
+        self.skipped = 0            # 변화 없음으로 건너뛴 프레임 수
+
+    @staticmethod
+    def from_config(config):
+        """
+        설정 딕셔너리로 검출기 생성
+
+        설정 예:
+            change_detection: {enabled: true, threshold: 2.0, max_skip_age: 5.0}
+
+        Args:
+            config (dict): 변화 검출 설정
+
+        Returns:
+            FrameChangeDetector: 검출기 (설정이 없거나 비활성화면 None)
+        """
+        if not config or not config.get('enabled', False):
+            return None
+
+        return FrameChangeDetector(
+            threshold=config.get('threshold', 2.0),
+            max_skip_age=config.get('max_skip_age', 5.0),
+            sample_size=config.get('sample_size', (64, 48))
+        )
+
+    def should_evaluate(self, image, now=None):
+        """
+        새 프레임에 대해 인식을 다시 수행해야 하는지 확인
+
+        마지막으로 인식한 프레임과 비교하여 변화가 임계값 이하이고
+        최대 건너뛰기 시간이 지나지 않았으면 False를 반환합니다.
+
+        Args:
+            image (numpy.ndarray | FrameContext): 새로 캡처된 이미지
+            now (float, optional): 현재 시각 (time.monotonic 기준)
+
+        Returns:
+            bool: 인식 수행 필요 여부
+        """
+        if now is None:
+            now = time.monotonic()
+
+        sample = self._sample(image)
+
+        if self._reference is None or self._reference.shape != sample.shape:
+            self.last_difference = float('inf')
+        else:
+            self.last_difference = float(cv2.absdiff(sample, self._reference).mean())
+            if (self.last_difference <= self.threshold
+                    and now - self._reference_time < self.max_skip_age):
+                self.skipped += 1
+                return False
+
+        # 이번 프레임을 새 기준으로 저장
+        self._reference = sample
+        self._reference_time = now
+        return True
+
+    def reset(self):
+        """기준 프레임 초기화 (다음 프레임은 항상 인식 수행)"""
+        self._reference = None
+        self._reference_time = 0.0
+
+    def _sample(self, image):
+        """
+        비교용 축소 이미지 생성 (내부 사용)
+
+        Args:
+            image (numpy.ndarray | FrameContext): 이미지
+
+        Returns:
+            numpy.ndarray: 축소된 이미지
+        """
+        if isinstance(image, FrameContext):
+            image = image.image
+        return cv2.resize(image, self.sample_size, interpolation=cv2.INTER_AREA)
+
+class DirtyTileMap:
+    """프레임을 타일 격자로 나누어 직전 프레임 대비 변경된 타일을 추적"""
+
+    def __init__(self, tile_size=64, threshold=10):
+        """
+        변경 타일 맵 초기화
+
+        Args:
+            tile_size (int): 타일 한 변의 크기 (픽셀)
+            threshold (int): 타일 내 픽셀 밝기 차이가 이 값을 넘으면 변경으로 판단
+        """
+        self.tile_size = int(tile_size)
+        self.threshold = threshold
+
+        self._previous = None   # 직전 프레임 그레이스케일 이미지
+        self.dirty = None       # (행, 열) 형태의 변경 여부 배열
+
+    @staticmethod
+    def from_config(config):
+        """
+        설정 딕셔너리로 변경 타일 맵 생성
+
+        설정 예:
+            dirty_tiles: {enabled: true, tile_size: 64, threshold: 10}
+
+        Args:
+            config (dict): 변경 타일 설정
+
+        Returns:
+            DirtyTileMap: 변경 타일 맵 (설정이 없거나 비활성화면 None)
+        """
+        if not config or not config.get('enabled', False):
+            return None
+
+        return DirtyTileMap(
+            tile_size=config.get('tile_size', 64),
+            threshold=config.get('threshold', 10)
+        )
+
+    def update(self, image):
+        """
+        새 프레임으로 변경 타일 계산
+
+        Args:
+            image (numpy.ndarray | FrameContext): 새로 캡처된 이미지
+
+        Returns:
+            numpy.ndarray: (행, 열) 형태의 변경 여부 배열
+        """
+        gray = image.gray if isinstance(image, FrameContext) else image
+        if len(gray.shape) == 3:
+            gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+
+        ts = self.tile_size
+        rows = -(-gray.shape[0] // ts)
+        cols = -(-gray.shape[1] // ts)
+
+        if self._previous is None or self._previous.shape != gray.shape:
+            # 첫 프레임이거나 크기가 바뀌면 전체를 변경으로 처리
+            self.dirty = np.ones((rows, cols), dtype=bool)
+        else:
+            diff = cv2.absdiff(gray, self._previous)
+
+            # 타일 크기의 배수로 맞춘 뒤 블록 단위 최대값 계산
+            pad_h = rows * ts - diff.shape[0]
+            pad_w = cols * ts - diff.shape[1]
+            if pad_h or pad_w:
+                diff = cv2.copyMakeBorder(diff, 0, pad_h, 0, pad_w, cv2.BORDER_CONSTANT, value=0)
+            self.dirty = diff.reshape(rows, ts, cols, ts).max(axis=(1, 3)) > self.threshold
+
+        # 다음 비교를 위해 복사본 보관 (캡처 버퍼가 재사용될 수 있음)
+        self._previous = gray.copy()
+        return self.dirty
+
+    def is_dirty(self, rect=None):
+        """
+        영역이 변경된 타일과 겹치는지 확인
+
+        Args:
+            rect (tuple, optional): (x, y, w, h) 영역 (None이면 프레임 전체)
+
+        Returns:
+            bool: 변경 여부 (아직 프레임이 없으면 True)
+        """
+        if self.dirty is None:
+            return True
+
+        if rect is None:
+            return bool(self.dirty.any())
+
+        ts = self.tile_size
+        x, y, w, h = rect
+        col0, row0 = max(0, int(x) // ts), max(0, int(y) // ts)
+        col1 = max(0, -(-int(x + w) // ts))
+        row1 = max(0, -(-int(y + h) // ts))
+        return bool(self.dirty[row0:row1, col0:col1].any())
+
+    def reset(self):
+        """직전 프레임 초기화 (다음 프레임은 전체 변경으로 처리)"""
+        self._previous = None
+        self.dirty = None
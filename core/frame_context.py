@@ -0,0 +1,171 @@
+# core/frame_context.py
+
+import cv2
+import numpy as np
+
+class FrameContext:
+    """캡처 이미지 한 장과 그 파생 이미지(그레이스케일, HSV, 축소 단계, 영역, 격자 통계) 캐시"""
+
+    def __init__(self, image, client_rect=None):
+        """
+        프레임 컨텍스트 초기화
+
+        Args:
+            image (numpy.ndarray): 캡처된 이미지 (BGR 또는 그레이스케일)
+            client_rect (tuple, optional): 이미지 내 클라이언트 영역 (x, y, w, h)
+        """
+        self.image = image
+        self.client_rect = client_rect
+
+        # 지연 계산되는 파생 이미지
+        self._gray = None
+        self._hsv = None
+        self._levels = {}   # 단계 -> 축소된 그레이스케일 이미지
+        self._crops = {}    # (x, y, w, h) -> FrameContext
+        self._cells = {}    # (cols, rows) -> (칸별 평균, 칸별 표준편차)
+        self._parent = None
+        self._offset = (0, 0)
+
+    @staticmethod
+    def wrap(image):
+        """
+        이미지를 FrameContext로 감싸기 (이미 FrameContext면 그대로 반환)
+
+        Args:
+            image: numpy.ndarray 또는 FrameContext
+
+        Returns:
+            FrameContext: 프레임 컨텍스트 (image가 None이면 None)
+        """
+        if image is None or isinstance(image, FrameContext):
+            return image
+        return FrameContext(image)
+
+    @property
+    def shape(self):
+        """원본 이미지 형태"""
+        return self.image.shape
+
+    @property
+    def offset(self):
+        """부모 프레임 기준 (x, y) 시작 위치 (최상위 프레임은 (0, 0))"""
+        return self._offset
+
+    @property
+    def gray(self):
+        """그레이스케일 이미지 (최초 접근 시 한 번만 변환)"""
+        if self._gray is None:
+            if len(self.image.shape) != 3:
+                self._gray = self.image
+            elif self._parent is not None and self._parent._gray is not None:
+                # 부모 프레임이 이미 변환되어 있으면 해당 영역만 잘라서 사용
+                self._gray = self._parent._slice(self._parent._gray, self._offset, self.image.shape)
+            else:
+                self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def hsv(self):
+        """HSV 이미지 (컬러 이미지에서만 사용, 최초 접근 시 한 번만 변환)"""
+        if self._hsv is None:
+            if self._parent is not None and self._parent._hsv is not None:
+                self._hsv = self._parent._slice(self._parent._hsv, self._offset, self.image.shape)
+            else:
+                self._hsv = cv2.cvtColor(self.image, cv2.COLOR_BGR2HSV)
+        return self._hsv
+
+    def pyramid(self, level):
+        """
+        1/2^level 크기로 축소된 그레이스케일 이미지
+
+        Args:
+            level (int): 축소 단계 (0이면 원본 그레이스케일)
+
+        Returns:
+            numpy.ndarray: 축소된 그레이스케일 이미지
+        """
+        if level <= 0:
+            return self.gray
+
+        if level not in self._levels:
+            self._levels[level] = cv2.pyrDown(self.pyramid(level - 1))
+        return self._levels[level]
+
+    def cell_stats(self, cols, rows, samples=4):
+        """
+        격자 칸별 그레이스케일 평균과 표준편차 (격자 크기별로 한 번만 계산)
+
+        칸마다 최대 samples x samples 화소가 되도록 8비트 이미지를 먼저 줄인 뒤
+        실수로 변환하므로 큰 영역도 작은 배열만 변환합니다.
+
+        Args:
+            cols (int): 가로 칸 수
+            rows (int): 세로 칸 수
+            samples (int): 표준편차 계산에 사용할 칸당 한 변의 화소 수
+
+        Returns:
+            tuple: ((rows, cols) 평균, (rows, cols) 표준편차) float32 배열
+        """
+        key = (cols, rows)
+        if key not in self._cells:
+            gray = self.gray
+            height, width = gray.shape[:2]
+            size = (min(width, cols * samples), min(height, rows * samples))
+            if size != (width, height):
+                gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+            gray = gray.astype(np.float32)
+            mean = cv2.resize(gray, (cols, rows), interpolation=cv2.INTER_AREA)
+            square = cv2.resize(gray * gray, (cols, rows), interpolation=cv2.INTER_AREA)
+            self._cells[key] = (mean, np.sqrt(np.maximum(square - mean * mean, 0)))
+        return self._cells[key]
+
+    def crop(self, rect):
+        """
+        이미지 일부 영역에 대한 하위 프레임 컨텍스트
+
+        Args:
+            rect (tuple): (x, y, w, h) 영역 (이미지 범위로 잘림)
+
+        Returns:
+            FrameContext: 하위 프레임 컨텍스트 (영역이 비어 있으면 None)
+        """
+        img_h, img_w = self.image.shape[:2]
+        x, y, w, h = [int(v) for v in rect]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(img_w, x + w), min(img_h, y + h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        key = (x0, y0, x1 - x0, y1 - y0)
+        if key == (0, 0, img_w, img_h):
+            return self
+
+        if key not in self._crops:
+            child = FrameContext(self.image[y0:y1, x0:x1])
+            child._parent = self
+            child._offset = (x0, y0)
+            self._crops[key] = child
+        return self._crops[key]
+
+    @property
+    def client(self):
+        """클라이언트 영역 프레임 컨텍스트 (영역이 지정되지 않았으면 자기 자신)"""
+        if not self.client_rect:
+            return self
+        return self.crop(self.client_rect) or self
+
+    def _slice(self, array, offset, shape):
+        """
+        파생 이미지에서 하위 영역 잘라내기 (내부 사용)
+
+        Args:
+            array (numpy.ndarray): 파생 이미지
+            offset (tuple): (x, y) 시작 위치
+            shape (tuple): 하위 영역 이미지 형태
+
+        Returns:
+            numpy.ndarray: 잘라낸 영역 (뷰)
+        """
+        x, y = offset
+        return array[y:y + shape[0], x:x + shape[1]]
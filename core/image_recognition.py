@@ -3,66 +3,97 @@
 import cv2
 import numpy as np
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .frame_context import FrameContext
+from .template_store import calc_color_histogram, calc_hsv_histogram
+from .template_registry import TemplateRegistry
 
 class ImageRecognition:
     """이미지 인식 엔진"""
     
-    def __init__(self, templates_dir=None):
+    def __init__(self, templates_dir=None, max_workers=None, use_pack=True, registry=None):
         """
         이미지 인식 엔진 초기화
         
         Args:
             templates_dir (str, optional): 템플릿 이미지 디렉토리 경로
+            max_workers (int, optional): find_templates 병렬 매칭 스레드 수 (기본: CPU 코어 수)
+            use_pack (bool): 컴파일된 템플릿 팩(메모리 매핑) 사용 여부
+            registry (TemplateRegistry, optional): 공유 템플릿 저장소
+                (지정하면 templates_dir을 다시 로드하지 않고 그대로 사용)
         """
-        self.templates = {}
         self.templates_dir = templates_dir
         
-        # 템플릿 디렉토리가 제공된 경우 이미지 로드
-        if templates_dir and os.path.isdir(templates_dir):
-            self.load_templates(templates_dir)
+        # 병렬 매칭용 스레드 풀 (처음 필요할 때 생성)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        
+        if registry is not None:
+            self.registry = registry
+        else:
+            # 템플릿 디렉토리가 제공된 경우 이미지 로드
+            self.registry = TemplateRegistry()
+            if templates_dir and os.path.isdir(templates_dir):
+                self.load_templates(templates_dir, use_pack=use_pack)
     
-    def load_templates(self, directory):
+    @property
+    def templates(self):
+        """
+        현재 템플릿 저장소 (이름 -> 원본 이미지, entry()로 미리 계산된 파생 데이터 접근)
+        
+        다른 스레드가 템플릿을 추가/제거해도 이미 가져간 저장소는 바뀌지 않습니다.
+        """
+        return self.registry.snapshot
+    
+    def load_templates(self, directory, use_pack=True):
         """
         디렉토리에서 모든 템플릿 이미지 로드
         
         Args:
             directory (str): 템플릿 이미지 디렉토리 경로
+            use_pack (bool): 컴파일된 템플릿 팩 사용 여부 (원본 이미지가 바뀌면 자동 재빌드)
             
         Returns:
             int: 로드된 템플릿 수
         """
-        count = 0
-        for filename in os.listdir(directory):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                path = os.path.join(directory, filename)
-                name = os.path.splitext(filename)[0]
-                template = cv2.imread(path)
-                
-                if template is not None:
-                    self.templates[name] = template
-                    count += 1
-        
-        return count
+        return self.registry.load_directory(directory, use_pack=use_pack)
     
     def add_template(self, name, image):
         """
-        템플릿 이미지 추가
+        템플릿 이미지 추가 (그레이스케일, 히스토그램 등 파생 데이터 미리 계산)
         
         Args:
             name (str): 템플릿 이름
             image (numpy.ndarray): 템플릿 이미지
         """
-        self.templates[name] = image
+        self.registry.add(name, image)
+    
+    def remove_template(self, name):
+        """
+        템플릿 이미지 제거
+        
+        Args:
+            name (str): 템플릿 이름
+            
+        Returns:
+            bool: 제거 여부
+        """
+        return self.registry.remove(name)
     
-    def find_template(self, image, template_name, threshold=0.5, method=cv2.TM_CCOEFF_NORMED):
+    def find_template(self, image, template_name, threshold=0.5, method=cv2.TM_CCOEFF_NORMED,
+                      pyramid_levels=0, roi=None):
         """
         이미지에서 템플릿 찾기 (유사 이미지 검색 개선 버전)
         
         Args:
-            image (numpy.ndarray): 검색할 이미지
+            image (numpy.ndarray | FrameContext): 검색할 이미지 (프레임 컨텍스트 사용 시 파생 이미지 재사용)
             template_name (str): 찾을 템플릿 이름
             threshold (float): 매칭 임계값 (0.0-1.0)
             method (int): 매칭 방법 (OpenCV 상수)
+            pyramid_levels (int): 피라미드 단계 수 (0이면 원본 해상도 전체 검색,
+                1 이상이면 1/2^n 축소 이미지에서 후보를 찾은 뒤 원본 해상도로 재확인)
+            roi (tuple, optional): 검색 영역 (x, y, w, h) - 결과 위치는 전체 이미지 기준
             
         Returns:
             tuple: (found, position, confidence)
@@ -71,182 +102,458 @@ class ImageRecognition:
                 confidence (float): 매칭 신뢰도 (0.0-1.0)
         """
         # 템플릿이 존재하는지 확인
-        if template_name not in self.templates:
+        entry = self.templates.entry(template_name)
+        if entry is None:
+            return False, (0, 0, 0, 0), 0.0
+        
+        # 이미지가 유효한지 확인
+        if image is None:
             return False, (0, 0, 0, 0), 0.0
         
-        template = self.templates[template_name]
+        frame = FrameContext.wrap(image)
+        w, h = entry.size
+        
+        # 검색 영역이 지정되면 해당 영역만 매칭
+        offset_x, offset_y = 0, 0
+        if roi:
+            sub_frame = frame.crop(roi)
+            if sub_frame is None:
+                return False, (0, 0, 0, 0), 0.0
+            if sub_frame is not frame:
+                offset_x, offset_y = sub_frame.offset
+                frame = sub_frame
+        
+        if pyramid_levels and pyramid_levels > 0:
+            # 축소 이미지에서 후보를 찾고 주변만 원본 해상도로 재확인
+            best_confidence, top_left = self._match_pyramid(frame, entry, method, pyramid_levels)
+        else:
+            best_confidence, top_left = self._match_template(frame, entry, method)
+        
+        # 임계값과 비교
+        if top_left is not None and best_confidence >= threshold:
+            return True, (top_left[0] + offset_x, top_left[1] + offset_y, w, h), best_confidence
+        else:
+            return False, (0, 0, 0, 0), best_confidence
+    
+    def find_templates(self, image, specs, timings=None):
+        """
+        한 프레임에서 여러 템플릿을 한 번에 찾기 (스레드 풀로 병렬 매칭)
+        
+        OpenCV 매칭 함수는 실행 중 GIL을 해제하므로 여러 코어에서 동시에 수행됩니다.
+        
+        Args:
+            image (numpy.ndarray | FrameContext): 검색할 이미지
+            specs (list): 검색 조건 목록. 각 항목은 (template, threshold, method, roi) 튜플
+                (뒤쪽 값 생략 가능) 또는 다음 키를 가진 딕셔너리:
+                template, threshold, method, roi, pyramid_levels,
+                match_method ('template' 또는 'histogram')
+            timings (list, optional): 전달하면 specs 순서대로 매칭 소요 시간(초)으로 채움
+            
+        Returns:
+            list: specs 순서대로 (found, position, confidence) 목록
+        """
+        if image is None:
+            if timings is not None:
+                timings[:] = [0.0] * len(specs)
+            return [(False, (0, 0, 0, 0), 0.0) for _ in specs]
+        
+        frame = FrameContext.wrap(image)
+        specs = [self._normalize_spec(spec) for spec in specs]
+        
+        # 여러 스레드가 같은 파생 이미지를 중복 계산하지 않도록 미리 준비
+        frame.gray
+        if any(spec['match_method'] == 'histogram' for spec in specs) and len(frame.shape) == 3:
+            frame.hsv
+        for level in {spec['pyramid_levels'] for spec in specs if spec['pyramid_levels']}:
+            frame.pyramid(level)
+        
+        find = self._find_spec if timings is None else self._timed_find_spec
+        if len(specs) <= 1 or self.max_workers <= 1:
+            results = [find(frame, spec) for spec in specs]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='ImageRecognition')
+            results = list(self._executor.map(lambda spec: find(frame, spec), specs))
+        
+        if timings is not None:
+            timings[:] = [elapsed for _, elapsed in results]
+            results = [result for result, _ in results]
+        return results
+    
+    def shutdown(self):
+        """병렬 매칭용 스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def _normalize_spec(self, spec):
+        """
+        검색 조건을 딕셔너리 형태로 정규화 (내부 사용)
+        
+        Args:
+            spec (tuple | dict): 검색 조건
+            
+        Returns:
+            dict: 정규화된 검색 조건
+        """
+        if not isinstance(spec, dict):
+            keys = ('template', 'threshold', 'method', 'roi')
+            spec = dict(zip(keys, spec))
+        
+        return {
+            'template': spec.get('template'),
+            'threshold': spec.get('threshold', 0.8),
+            'method': spec.get('method', cv2.TM_CCOEFF_NORMED),
+            'roi': spec.get('roi'),
+            'pyramid_levels': spec.get('pyramid_levels', 0),
+            'match_method': spec.get('match_method', 'template'),
+        }
+    
+    def _find_spec(self, frame, spec):
+        """
+        정규화된 검색 조건 하나 실행 (내부 사용)
         
-        # 이미지와 템플릿이 유효한지 확인
-        if image is None or template is None:
+        Args:
+            frame (FrameContext): 검색할 프레임
+            spec (dict): 정규화된 검색 조건
+            
+        Returns:
+            tuple: (found, position, confidence)
+        """
+        try:
+            if spec['match_method'] == 'histogram':
+                return self.find_by_histogram(frame, spec['template'], spec['threshold'], roi=spec['roi'])
+            return self.find_template(frame, spec['template'], spec['threshold'], spec['method'],
+                                      pyramid_levels=spec['pyramid_levels'], roi=spec['roi'])
+        except Exception as e:
+            print(f"템플릿 매칭 오류 {spec['template']}: {e}")
             return False, (0, 0, 0, 0), 0.0
+    
+    def _timed_find_spec(self, frame, spec):
+        """
+        검색 조건 하나 실행 후 소요 시간과 함께 반환 (내부 사용)
+        
+        Args:
+            frame (FrameContext): 검색할 프레임
+            spec (dict): 정규화된 검색 조건
+            
+        Returns:
+            tuple: ((found, position, confidence), elapsed) - elapsed는 초 단위
+        """
+        started = time.perf_counter()
+        result = self._find_spec(frame, spec)
+        return result, time.perf_counter() - started
+    
+    def _match_template(self, frame, entry, method):
+        """
+        원본 이미지와 그레이스케일 이미지로 매칭하여 최고 결과 반환 (내부 사용)
         
-        # 다양한 방법으로 매칭 시도
+        Args:
+            frame (FrameContext): 검색할 프레임
+            entry (TemplateEntry): 템플릿 항목
+            method (int): 매칭 방법 (OpenCV 상수)
+            
+        Returns:
+            tuple: (confidence, top_left) - 매칭 실패 시 top_left는 None
+        """
         best_confidence = 0
-        best_position = (0, 0, 0, 0)
+        best_top_left = None
         
-        # 1. 원본 이미지로 매칭 (기존 방식)
-        h, w = template.shape[:2]
+        image = frame.image
+        template = entry.image
         
+        # 1. 원본 이미지로 매칭 (기존 방식)
         # 이미지와 템플릿이 동일한 색상 채널을 가지고 있는지 확인
         img_to_use = image
         template_to_use = template
         if len(image.shape) != len(template.shape):
             if len(image.shape) == 3:
-                template_to_use = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+                img_to_use = frame.gray
             else:
-                img_to_use = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                template_to_use = entry.gray
         
         # 템플릿 매칭 수행
         try:
             result = cv2.matchTemplate(img_to_use, template_to_use, method)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            # 매칭 방법에 따라 값 조정
-            if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
-                confidence = 1 - min_val
-                top_left = min_loc
-            else:
-                confidence = max_val
-                top_left = max_loc
+            confidence, top_left = self._best_of_result(result, method)
             
             if confidence > best_confidence:
                 best_confidence = confidence
-                best_position = (top_left[0], top_left[1], w, h)
+                best_top_left = top_left
         except:
             pass
         
         # 2. 그레이스케일로 변환하여 매칭 (색상 무시)
         try:
             if len(image.shape) == 3 and len(template.shape) == 3:
-                img_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-                
-                result = cv2.matchTemplate(img_gray, template_gray, method)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                
-                # 매칭 방법에 따라 값 조정
-                if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
-                    confidence = 1 - min_val
-                    top_left = min_loc
-                else:
-                    confidence = max_val
-                    top_left = max_loc
+                result = cv2.matchTemplate(frame.gray, entry.gray, method)
+                confidence, top_left = self._best_of_result(result, method)
                 
                 if confidence > best_confidence:
                     best_confidence = confidence
-                    best_position = (top_left[0], top_left[1], w, h)
+                    best_top_left = top_left
         except:
             pass
         
-        # 임계값과 비교
-        if best_confidence >= threshold:
-            return True, best_position, best_confidence
+        return best_confidence, best_top_left
+    
+    def _best_of_result(self, result, method):
+        """
+        매칭 결과 맵에서 최고 위치와 신뢰도 추출 (내부 사용)
+        
+        Args:
+            result (numpy.ndarray): cv2.matchTemplate 결과
+            method (int): 매칭 방법 (OpenCV 상수)
+            
+        Returns:
+            tuple: (confidence, top_left)
+        """
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        
+        # 매칭 방법에 따라 값 조정
+        if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
+            return 1 - min_val, min_loc
+        return max_val, max_loc
+    
+    def _match_pyramid(self, frame, entry, method, levels, candidates=3):
+        """
+        피라미드(거친 탐색 -> 정밀 탐색) 방식 매칭 (내부 사용)
+        
+        축소된 그레이스케일 이미지에서 상위 후보 위치를 찾은 뒤,
+        각 후보 주변의 작은 영역만 원본 해상도로 다시 매칭합니다.
+        
+        Args:
+            frame (FrameContext): 검색할 프레임
+            entry (TemplateEntry): 템플릿 항목
+            method (int): 매칭 방법 (OpenCV 상수)
+            levels (int): 요청된 피라미드 단계 수
+            candidates (int): 원본 해상도로 재확인할 후보 수
+            
+        Returns:
+            tuple: (confidence, top_left) - 매칭 실패 시 top_left는 None
+        """
+        w, h = entry.size
+        img_h, img_w = frame.shape[:2]
+        
+        # 축소 후에도 템플릿이 최소 크기 이상이 되도록 단계 수 제한
+        levels = min(int(levels), entry.max_level)
+        
+        if levels <= 0 or img_h < h or img_w < w:
+            return self._match_template(frame, entry, method)
+        
+        # 거친 탐색은 그레이스케일로 수행 (프레임 쪽 축소 이미지는 프레임 컨텍스트에,
+        # 템플릿 쪽 축소 이미지는 템플릿 항목에 미리 계산되어 있음)
+        img_small = frame.pyramid(levels)
+        template_small = entry.levels[levels]
+        
+        try:
+            result = cv2.matchTemplate(img_small, template_small, method)
+        except Exception:
+            return self._match_template(frame, entry, method)
+        
+        scale = 1 << levels
+        # 원본 해상도에서 후보 주변 여유 범위 (축소로 인한 위치 오차 보정)
+        margin = scale * 2
+        small_h, small_w = template_small.shape[:2]
+        
+        best_confidence = 0
+        best_top_left = None
+        for cx, cy in self._top_candidates(result, method, candidates, small_w // 2, small_h // 2):
+            # 원본 해상도의 재확인 영역 계산
+            x0 = max(0, cx * scale - margin)
+            y0 = max(0, cy * scale - margin)
+            x1 = min(img_w, cx * scale + w + margin)
+            y1 = min(img_h, cy * scale + h + margin)
+            if x1 - x0 < w or y1 - y0 < h:
+                continue
+            
+            confidence, top_left = self._match_template(frame.crop((x0, y0, x1 - x0, y1 - y0)), entry, method)
+            if top_left is not None and confidence > best_confidence:
+                best_confidence = confidence
+                best_top_left = (x0 + top_left[0], y0 + top_left[1])
+        
+        return best_confidence, best_top_left
+    
+    def _top_candidates(self, result, method, count, suppress_w, suppress_h):
+        """
+        결과 맵에서 서로 겹치지 않는 상위 후보 위치 추출 (내부 사용)
+        
+        Args:
+            result (numpy.ndarray): cv2.matchTemplate 결과
+            method (int): 매칭 방법 (OpenCV 상수)
+            count (int): 최대 후보 수
+            suppress_w (int): 후보 주변 억제 폭
+            suppress_h (int): 후보 주변 억제 높이
+            
+        Returns:
+            list: [(x, y), ...] 후보 위치 목록 (점수 높은 순)
+        """
+        if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
+            scores = -result
         else:
-            return False, (0, 0, 0, 0), best_confidence
+            scores = result.copy()
+        
+        candidates = []
+        for _ in range(count):
+            index = int(np.argmax(scores))
+            y, x = divmod(index, scores.shape[1])
+            if not np.isfinite(scores[y, x]):
+                break
+            candidates.append((x, y))
+            
+            # 이미 선택된 후보 주변은 제외
+            scores[max(0, y - suppress_h):y + suppress_h + 1,
+                   max(0, x - suppress_w):x + suppress_w + 1] = -np.inf
+        
+        return candidates
     
-    def find_all_templates(self, image, template_name, threshold=0.8, method=cv2.TM_CCOEFF_NORMED):
+    def find_all_templates(self, image, template_name, threshold=0.8, method=cv2.TM_CCOEFF_NORMED,
+                           max_results=None, top_k=None):
         """
         이미지에서 모든 템플릿 매칭 찾기
         
         Args:
-            image (numpy.ndarray): 검색할 이미지
+            image (numpy.ndarray | FrameContext): 검색할 이미지
             template_name (str): 찾을 템플릿 이름
             threshold (float): 매칭 임계값 (0.0-1.0)
             method (int): 매칭 방법 (OpenCV 상수)
+            max_results (int, optional): 반환할 최대 매칭 수 (도달하면 중복 제거 조기 종료)
+            top_k (int, optional): 중복 제거 전에 고려할 상위 후보(지역 최대값) 수
             
         Returns:
-            list: [(x, y, w, h, confidence), ...] 형태의 매칭 목록
+            list: [(x, y, w, h, confidence), ...] 형태의 매칭 목록 (신뢰도 높은 순)
         """
         # 템플릿이 존재하는지 확인
-        if template_name not in self.templates:
+        entry = self.templates.entry(template_name)
+        if entry is None:
             return []
         
-        template = self.templates[template_name]
-        
-        # 이미지와 템플릿이 유효한지 확인
-        if image is None or template is None:
+        # 이미지가 유효한지 확인
+        if image is None:
             return []
         
+        frame = FrameContext.wrap(image)
+        image = frame.image
+        template = entry.image
+        
         # 이미지와 템플릿이 동일한 색상 채널을 가지고 있는지 확인
         if len(image.shape) != len(template.shape):
             if len(image.shape) == 3:
-                template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+                image = frame.gray
             else:
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                template = entry.gray
         
         # 템플릿 매칭 수행
         h, w = template.shape[:2]
         result = cv2.matchTemplate(image, template, method)
         
-        # 임계값 이상의 모든 매칭 찾기
-        matches = []
+        # 값이 클수록 유사하도록 결과 맵 통일
         if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
             result = 1 - result
         
-        # 임계값 이상인 위치 찾기
-        locations = np.where(result >= threshold)
-        
-        # 모든 매칭을 목록에 추가
-        for pt in zip(*locations[::-1]):
-            confidence = result[pt[1], pt[0]]
-            matches.append((pt[0], pt[1], w, h, float(confidence)))
+        # 중복 제거 (거리 기준 비최대 억제)
+        xs, ys, scores = self._suppress_non_maxima(result, threshold, w // 2, max_results, top_k)
         
-        # 중복 제거 (거리 기준)
-        filtered_matches = []
-        for match in sorted(matches, key=lambda x: x[4], reverse=True):
-            if not any(self._is_duplicate(match, existing, threshold=w//2) for existing in filtered_matches):
-                filtered_matches.append(match)
-        
-        return filtered_matches
+        return [(int(x), int(y), w, h, float(score)) for x, y, score in zip(xs, ys, scores)]
     
-    def _is_duplicate(self, match1, match2, threshold=10):
+    def _suppress_non_maxima(self, result, threshold, distance, max_results=None, top_k=None):
         """
-        두 매칭이 중복인지 확인 (내부 사용)
+        결과 맵에서 비최대 억제로 중복 없는 매칭 위치 추출 (내부 사용)
+        
+        3x3 지역 최대값만 후보로 남긴 뒤, 신뢰도 높은 순으로 선택하면서
+        선택된 위치와의 거리가 distance 미만인 후보를 배열 연산으로 한꺼번에 제거합니다.
         
         Args:
-            match1 (tuple): (x, y, w, h, confidence) 형태의 매칭1
-            match2 (tuple): (x, y, w, h, confidence) 형태의 매칭2
-            threshold (int): 중복으로 판단할 거리
+            result (numpy.ndarray): 값이 클수록 유사한 매칭 결과 맵
+            threshold (float): 매칭 임계값
+            distance (int): 중복으로 판단할 거리
+            max_results (int, optional): 최대 선택 수
+            top_k (int, optional): 고려할 상위 후보 수
             
         Returns:
-            bool: 중복 여부
+            tuple: (xs, ys, scores) 배열 (신뢰도 높은 순)
         """
-        x1, y1 = match1[0], match1[1]
-        x2, y2 = match2[0], match2[1]
-        distance = np.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
-        return distance < threshold
+        # 임계값 이상이면서 주변 3x3 영역의 최대값인 위치만 후보로 사용
+        local_max = cv2.dilate(result, np.ones((3, 3), np.uint8))
+        ys, xs = np.nonzero((result >= threshold) & (result >= local_max))
+        scores = result[ys, xs]
+        
+        # 상위 후보만 고려 (전체 정렬 대신 부분 정렬)
+        if top_k and len(scores) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            xs, ys, scores = xs[top], ys[top], scores[top]
+        
+        order = np.argsort(-scores, kind='stable')
+        xs, ys, scores = xs[order], ys[order], scores[order]
+        
+        if distance <= 0:
+            keep = np.arange(len(scores))[:max_results] if max_results else np.arange(len(scores))
+            return xs[keep], ys[keep], scores[keep]
+        
+        # 선택된 후보 주변의 나머지 후보를 한 번에 억제
+        suppressed = np.zeros(len(scores), dtype=bool)
+        distance_sq = distance * distance
+        keep = []
+        for i in range(len(scores)):
+            if suppressed[i]:
+                continue
+            keep.append(i)
+            if max_results and len(keep) >= max_results:
+                break
+            dx = xs[i + 1:] - xs[i]
+            dy = ys[i + 1:] - ys[i]
+            suppressed[i + 1:] |= (dx * dx + dy * dy) < distance_sq
+        
+        return xs[keep], ys[keep], scores[keep]
     
-    def find_by_histogram(self, image, template_name, threshold=0.85):
+    def find_by_histogram(self, image, template_name, threshold=0.85, roi=None):
         """
         색상 히스토그램을 사용하여 이미지 영역 찾기
         (회전, 반전에 강인함)
         
         Args:
-            image: 검색할 이미지 (현재 캡처된 화면)
+            image: 검색할 이미지 (현재 캡처된 화면, numpy.ndarray 또는 FrameContext)
             template_name: 찾을 템플릿 이름 (사용자가 지정한 템플릿)
             threshold: 매칭 임계값 (0.0-1.0)
+            roi: 검색 영역 (x, y, w, h) - 결과 위치는 전체 이미지 기준
             
         Returns:
             tuple: (found, position, confidence)
         """
         # 템플릿이 존재하는지 확인
-        if template_name not in self.templates:
+        entry = self.templates.entry(template_name)
+        if entry is None:
             print(f"템플릿을 찾을 수 없음: {template_name}")
             return False, (0, 0, 0, 0), 0.0
         
         # 템플릿 이미지 가져오기
-        template = self.templates[template_name]
+        template = entry.image
         
         # 이미지 유효성 검사
-        if image is None or template is None:
+        if image is None:
             print("이미지 또는 템플릿이 None입니다")
             return False, (0, 0, 0, 0), 0.0
         
+        frame = FrameContext.wrap(image)
+        
+        # 검색 영역이 지정되면 해당 영역만 검색
+        offset_x, offset_y = 0, 0
+        if roi:
+            sub_frame = frame.crop(roi)
+            if sub_frame is None:
+                return False, (0, 0, 0, 0), 0.0
+            if sub_frame is not frame:
+                offset_x, offset_y = sub_frame.offset
+                frame = sub_frame
+        
+        image = frame.image
+        
         # 디버깅 정보
         print(f"템플릿 '{template_name}' 검색: 템플릿 크기={template.shape}, 이미지 크기={image.shape}")
         
         # 템플릿 크기
-        template_h, template_w = template.shape[:2]
+        template_w, template_h = entry.size
         
         # 먼저 일반 템플릿 매칭으로 후보 영역 찾기
         try:
@@ -261,8 +568,8 @@ class ImageRecognition:
             print(f"템플릿 매칭 오류: {e}")
             return False, (0, 0, 0, 0), 0.0
         
-        # 템플릿의 히스토그램 계산
-        template_hist = self._calc_color_histogram(template)
+        # 템플릿의 히스토그램 (로드 시 미리 계산됨)
+        template_hist = entry.hist
         
         # 결과 저장용 변수
         best_match = {
@@ -278,18 +585,18 @@ class ImageRecognition:
             if x + template_w > image.shape[1] or y + template_h > image.shape[0]:
                 continue
             
-            # 후보 영역 추출
-            roi = image[y:y+template_h, x:x+template_w]
-            
-            # 후보 영역의 히스토그램 계산
-            roi_hist = self._calc_color_histogram(roi)
+            # 후보 영역의 히스토그램 계산 (프레임 단위로 한 번 변환된 HSV/그레이 재사용)
+            if len(image.shape) == 3:
+                roi_hist = self._calc_hsv_histogram(frame.hsv[y:y+template_h, x:x+template_w])
+            else:
+                roi_hist = self._calc_color_histogram(image[y:y+template_h, x:x+template_w])
             
             # 히스토그램 비교 (상관관계 방식 - 값이 높을수록 유사)
             hist_match = cv2.compareHist(template_hist, roi_hist, cv2.HISTCMP_CORREL)
             
             # 더 좋은 매칭 결과 저장
             if hist_match > best_match['confidence']:
-                best_match['position'] = (x, y, template_w, template_h)
+                best_match['position'] = (x + offset_x, y + offset_y, template_w, template_h)
                 best_match['confidence'] = hist_match
         
         # 결과 반환
@@ -307,22 +614,16 @@ class ImageRecognition:
         Returns:
             히스토그램
         """
-        # 색상 공간을 HSV로 변환
-        if len(img.shape) == 3:  # 컬러 이미지
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-            
-            # H, S, V 각각 히스토그램 계산
-            h_hist = cv2.calcHist([hsv], [0], None, [30], [0, 180])
-            s_hist = cv2.calcHist([hsv], [1], None, [32], [0, 256])
-            v_hist = cv2.calcHist([hsv], [2], None, [32], [0, 256])
-            
-            # 정규화
-            h_hist = cv2.normalize(h_hist, h_hist, 0, 1, cv2.NORM_MINMAX)
-            s_hist = cv2.normalize(s_hist, s_hist, 0, 1, cv2.NORM_MINMAX)
-            v_hist = cv2.normalize(v_hist, v_hist, 0, 1, cv2.NORM_MINMAX)
+        return calc_color_histogram(img)
+    
+    def _calc_hsv_histogram(self, hsv):
+        """
+        HSV 이미지의 색상 히스토그램 계산
+        
+        Args:
+            hsv: HSV 색상 공간 이미지
             
-            # 히스토그램 연결
-            return np.concatenate((h_hist, s_hist, v_hist))
-        else:  # 그레이스케일
-            hist = cv2.calcHist([img], [0], None, [64], [0, 256])
-            return cv2.normalize(hist, hist, 0, 1, cv2.NORM_MINMAX)
\ No newline at end of file
+        Returns:
+            히스토그램
+        """
+        return calc_hsv_histogram(hsv)
\ No newline at end of file
@@ -0,0 +1,232 @@
+# core/rule_scheduler.py
+
+import math
+import time
+
+class RuleScheduler:
+    """
+    프레임마다 평가할 규칙 선택 (규칙별 평가 주기, 우선순위, 프레임당 시간 예산)
+
+    규칙 설정:
+        period: 최소 평가 간격 (초, 0이면 매 프레임)
+        priority: 우선순위 (클수록 먼저 평가, 기본 0)
+        stop_after_match: 발견되면 이번 프레임의 나머지 규칙 평가 중단
+        exclusive_group: 같은 그룹에서 한 규칙이 발견되면 그룹의 나머지 규칙은 평가하지 않음
+
+    예산을 넘는 규칙은 다음 프레임으로 미뤄지며, 미뤄질 때마다 우선순위가 1씩 올라가므로
+    비싼 규칙도 결국 평가됩니다 (기아 방지). 규칙별 매칭 비용과 발견률은 측정값의
+    지수 이동 평균으로 추정하며, profile_order를 켜면 같은 우선순위 안에서
+    비용 대비 발견률(기대 가치)이 높은 규칙부터 평가합니다.
+    """
+
+    # 아직 평가하지 않은 규칙의 발견률 초기값
+    INITIAL_HIT_RATE = 0.5
+
+    # 규칙 스케줄러가 필요한 규칙 설정 키
+    RULE_KEYS = ('period', 'priority', 'stop_after_match', 'exclusive_group')
+
+    def __init__(self, frame_budget=None, cost_smoothing=0.3, profile_order=False, hit_smoothing=0.1):
+        """
+        규칙 스케줄러 초기화
+
+        Args:
+            frame_budget (float, optional): 프레임당 매칭 시간 예산 (초, None이면 제한 없음)
+            cost_smoothing (float): 매칭 비용 이동 평균 가중치 (0-1, 클수록 최근 측정 반영)
+            profile_order (bool): 측정한 비용과 발견률로 평가 순서를 정할지 여부
+            hit_smoothing (float): 발견률 이동 평균 가중치 (0-1)
+        """
+        self.frame_budget = frame_budget
+        self.cost_smoothing = cost_smoothing
+        self.profile_order = profile_order
+        self.hit_smoothing = hit_smoothing
+
+        self._last_eval = {}     # 규칙 인덱스 -> 마지막 평가 시각
+        self._cost = {}          # 규칙 인덱스 -> 추정 매칭 비용 (초)
+        self._hit_rate = {}      # 규칙 인덱스 -> 추정 발견률 (0-1)
+        self._deferred = {}      # 규칙 인덱스 -> 연속으로 미뤄진 횟수
+
+        # 통계
+        self.deferred_total = 0  # 예산 초과로 미뤄진 규칙 평가 수
+        self.skipped_total = 0   # 평가 주기가 되지 않아 건너뛴 규칙 평가 수
+        self.short_circuited_total = 0  # 다른 규칙 발견으로 생략된 규칙 평가 수
+
+    @staticmethod
+    def from_config(config, rules, profiling=None):
+        """
+        설정 딕셔너리로 규칙 스케줄러 생성
+
+        설정 예:
+            rule_budget: {enabled: true, frame_budget_ms: 30}
+            rule_profiling: {enabled: true, hit_smoothing: 0.1}
+            rules:
+              - {template: hp_warning, priority: 10, stop_after_match: true, actions: [...]}
+              - {template: event_popup, period: 2.0, exclusive_group: popup, actions: [...]}
+
+        Args:
+            config (dict): 프레임 예산 설정
+            rules (list): 규칙 목록 (RULE_KEYS 설정이 있으면 예산 없이도 생성)
+            profiling (dict, optional): 측정 기반 평가 순서 설정
+
+        Returns:
+            RuleScheduler: 규칙 스케줄러 (예산, 측정 기반 순서가 비활성화이고
+                RULE_KEYS를 쓰는 규칙이 없으면 None)
+        """
+        enabled = bool(config) and config.get('enabled', False)
+        profile_order = bool(profiling) and profiling.get('enabled', False)
+        uses_rule_settings = any(key in rule for rule in rules or [] for key in RuleScheduler.RULE_KEYS)
+        if not enabled and not profile_order and not uses_rule_settings:
+            return None
+
+        budget_ms = config.get('frame_budget_ms') if enabled else None
+        return RuleScheduler(
+            frame_budget=budget_ms / 1000.0 if budget_ms else None,
+            cost_smoothing=(config or {}).get('cost_smoothing', 0.3),
+            profile_order=profile_order,
+            hit_smoothing=(profiling or {}).get('hit_smoothing', 0.1)
+        )
+
+    @staticmethod
+    def short_circuits(rule):
+        """
+        발견 시 다른 규칙 평가를 생략하게 하는 규칙인지 확인
+
+        Args:
+            rule (dict): 규칙 설정 정보
+
+        Returns:
+            bool: stop_after_match 또는 exclusive_group 사용 여부
+        """
+        return bool(rule.get('stop_after_match') or rule.get('exclusive_group'))
+
+    def estimated_cost(self, index):
+        """
+        규칙의 추정 매칭 비용
+
+        Args:
+            index (int): 규칙 인덱스
+
+        Returns:
+            float: 추정 비용 (초, 아직 측정하지 않았으면 0)
+        """
+        return self._cost.get(index, 0.0)
+
+    def expected_value(self, index):
+        """
+        규칙의 기대 가치 (매칭 시간 1초당 기대 발견 수)
+
+        Args:
+            index (int): 규칙 인덱스
+
+        Returns:
+            float: 발견률 / 비용 (아직 측정하지 않았으면 무한대 - 먼저 측정)
+        """
+        cost = self._cost.get(index)
+        if cost is None:
+            return math.inf
+        return self._hit_rate.get(index, self.INITIAL_HIT_RATE) / max(cost, 1e-6)
+
+    def _value_key(self, index):
+        """측정 기반 순서를 쓰면 기대 가치가 높은 순 (정렬 키, 내부 사용)"""
+        return -self.expected_value(index) if self.profile_order else 0.0
+
+    def order(self, selected):
+        """
+        선택된 규칙의 평가 순서 (우선순위 높은 순, 측정 기반 순서면 기대 가치 높은 순, 규칙 순서)
+
+        Args:
+            selected (list): [(index, rule), ...]
+
+        Returns:
+            list: 평가 순서로 정렬된 [(index, rule), ...]
+        """
+        return sorted(selected, key=lambda item: (-item[1].get('priority', 0),
+                                                  self._value_key(item[0]), item[0]))
+
+    def select(self, candidates, now=None):
+        """
+        이번 프레임에 평가할 규칙 선택
+
+        Args:
+            candidates (list): [(index, rule), ...] 평가 가능한 규칙 목록
+            now (float, optional): 프레임 시각 (time.monotonic 기준)
+
+        Returns:
+            list: 평가할 [(index, rule), ...] (규칙 인덱스 순서)
+        """
+        if now is None:
+            now = time.monotonic()
+
+        due = []
+        for index, rule in candidates:
+            if now - self._last_eval.get(index, -math.inf) >= rule.get('period', 0):
+                due.append((index, rule))
+            else:
+                self.skipped_total += 1
+
+        if self.frame_budget is None:
+            return due
+
+        # 우선순위 (미뤄진 횟수만큼 가산) 높은 순, 기대 가치 높은 순, 오래 평가하지 않은 순
+        due.sort(key=lambda item: (-(item[1].get('priority', 0) + self._deferred.get(item[0], 0)),
+                                   self._value_key(item[0]),
+                                   self._last_eval.get(item[0], -math.inf)))
+
+        selected = []
+        spent = 0.0
+        for index, rule in due:
+            cost = self.estimated_cost(index)
+            # 최소 한 규칙은 평가하고, 예산을 넘는 규칙은 건너뛰되 뒤의 싼 규칙은 계속 확인
+            if selected and spent + cost > self.frame_budget:
+                self._deferred[index] = self._deferred.get(index, 0) + 1
+                self.deferred_total += 1
+                continue
+            selected.append((index, rule))
+            spent += cost
+
+        selected.sort(key=lambda item: item[0])
+        return selected
+
+    def record(self, index, now=None, elapsed=None, found=None):
+        """
+        규칙 평가 결과 기록
+
+        Args:
+            index (int): 규칙 인덱스
+            now (float, optional): 평가한 프레임 시각
+            elapsed (float, optional): 매칭 소요 시간 (초, 직전 결과를 재사용했으면 None)
+            found (bool, optional): 발견 여부 (발견률 추정용)
+        """
+        self._last_eval[index] = time.monotonic() if now is None else now
+        self._deferred.pop(index, None)
+
+        if found is not None:
+            previous = self._hit_rate.get(index, self.INITIAL_HIT_RATE)
+            self._hit_rate[index] = previous + self.hit_smoothing * (float(found) - previous)
+
+        if elapsed is not None:
+            previous = self._cost.get(index)
+            if previous is None:
+                self._cost[index] = elapsed
+            else:
+                self._cost[index] = previous + self.cost_smoothing * (elapsed - previous)
+
+    def reset(self):
+        """평가 시각과 미뤄진 횟수 초기화 (측정한 비용은 유지)"""
+        self._last_eval = {}
+        self._deferred = {}
+
+    def stats(self):
+        """
+        규칙 스케줄러 통계
+
+        Returns:
+            dict: deferred, skipped, short_circuited, costs (규칙 인덱스 -> 추정 비용 ms),
+                hit_rates (규칙 인덱스 -> 추정 발견률)
+        """
+        return {
+            'deferred': self.deferred_total,
+            'skipped': self.skipped_total,
+            'short_circuited': self.short_circuited_total,
+            'costs': {index: cost * 1000.0 for index, cost in sorted(self._cost.items())},
+            'hit_rates': dict(sorted(self._hit_rate.items())),
+        }
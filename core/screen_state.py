@@ -0,0 +1,255 @@
+# core/screen_state.py
+
+import time
+
+class ScreenStateMachine:
+    """
+    화면 상태 기계 (로그인, 마을, 필드 전투, 상점 등 화면 상태별로 평가할 규칙 제한)
+
+    상태마다 그 화면을 알아보는 검출 규칙(detect)을 두고, 규칙의 states 설정으로
+    규칙이 평가될 상태를 지정합니다 (states가 없는 규칙은 모든 상태에서 평가).
+    매 프레임 현재 상태와 현재 상태에서 전환 가능한 상태의 검출 규칙만 확인하고,
+    현재 상태의 규칙만 평가합니다.
+
+    상태 전환:
+        - 다른 상태의 검출 규칙이 발견되면 그 상태로 전환 (여러 개면 설정 순서상 앞의 상태)
+        - 현재 상태의 검출 규칙이 lost_after 프레임 연속으로 발견되지 않거나, 상태의 timeout초 동안
+          확인되지 않으면 unknown으로 전환 (next에 없는 화면으로 바뀐 경우 모든 상태를 다시 확인)
+        - next_state가 있는 규칙이 발견되면 액션 실행 후 해당 상태로 전환
+        - 규칙 액션 중 {type: set_state, params: {state: ...}}가 있으면 해당 상태로 전환
+    """
+
+    # 상태를 알 수 없을 때의 상태 이름 (모든 상태의 검출 규칙 확인)
+    UNKNOWN = 'unknown'
+
+    def __init__(self, states, initial=None, lost_after=3):
+        """
+        화면 상태 기계 초기화
+
+        Args:
+            states (dict): 상태 이름 -> {detect: 검출 규칙, next: [전환 가능한 상태, ...],
+                timeout: 확인 없이 유지할 최대 시간 (초, None이면 제한 없음)} (설정 순서가 검출 우선순위)
+            initial (str, optional): 시작 상태 (기본: unknown)
+            lost_after (int): 현재 상태 검출 규칙이 연속으로 발견되지 않으면 unknown으로 전환할 프레임 수
+                (0이면 검출 실패로는 전환하지 않음)
+        """
+        if initial is not None and initial != self.UNKNOWN and initial not in states:
+            raise ValueError(f"정의되지 않은 시작 화면 상태: {initial}")
+
+        self.states = states
+        self.initial = initial or self.UNKNOWN
+        self.lost_after = lost_after
+        self.current = self.initial
+        self.entered_at = None   # 현재 상태로 전환된 시각
+        self.confirmed_at = None # 현재 상태가 마지막으로 확인된 시각 (전환 포함)
+        self._misses = 0         # 현재 상태 검출 규칙이 연속으로 발견되지 않은 프레임 수
+
+        # 통계
+        self.transitions = 0     # 상태 전환 횟수
+        self.detections = 0      # 확인한 검출 규칙 수
+        self.lost = 0            # 현재 상태를 잃고 unknown으로 전환한 횟수
+
+    @staticmethod
+    def from_config(config):
+        """
+        설정 딕셔너리로 화면 상태 기계 생성
+
+        설정 예:
+            screen_states:
+              initial: login
+              lost_after: 3
+              states:
+                login: {detect: {template: login_title, search_region: [300, 80, 200, 60]}, next: [town]}
+                town: {detect: {template: town_minimap, search_region: [640, 0, 160, 160]}}
+                shop: {detect: {template: shop_title, threshold: 0.9}, next: [town], timeout: 60}
+            rules:
+              - {template: shop_buy, states: [shop], actions: [...]}
+              - {template: login_ok, states: login, next_state: town, actions: [...]}
+
+        Args:
+            config (dict): 화면 상태 설정
+
+        Returns:
+            ScreenStateMachine: 화면 상태 기계 (설정이 없거나 비활성화면 None)
+        """
+        if not config or not config.get('enabled', True) or not config.get('states'):
+            return None
+
+        states = {}
+        for name, state in config['states'].items():
+            state = state or {}
+            detect = state.get('detect')
+            if detect and not detect.get('template'):
+                print(f"화면 상태 검출 규칙에 템플릿 없음: {name}")
+                detect = None
+            states[name] = {'detect': detect, 'next': state.get('next'), 'timeout': state.get('timeout')}
+
+        try:
+            return ScreenStateMachine(states, config.get('initial'), config.get('lost_after', 3))
+        except ValueError as e:
+            print(f"화면 상태 설정 오류: {e}")
+            return None
+
+    @staticmethod
+    def rule_states(rule):
+        """
+        규칙이 평가될 상태 목록
+
+        Args:
+            rule (dict): 규칙 설정 정보
+
+        Returns:
+            list: 상태 이름 목록 (모든 상태에서 평가하면 None)
+        """
+        states = rule.get('states')
+        if states is None:
+            return None
+        return [states] if isinstance(states, str) else list(states)
+
+    def rule_applies(self, rule):
+        """
+        현재 상태에서 평가할 규칙인지 확인
+
+        Args:
+            rule (dict): 규칙 설정 정보
+
+        Returns:
+            bool: 평가 여부
+        """
+        states = self.rule_states(rule)
+        return states is None or self.current in states
+
+    def detection_candidates(self):
+        """
+        이번 프레임에 검출 규칙을 확인할 상태 (현재 상태와 현재 상태에서 전환 가능한 상태, 설정 순서)
+
+        Returns:
+            list: [(상태 이름, 검출 규칙), ...]
+        """
+        state = self.states.get(self.current)
+        allowed = state.get('next') if state else None
+        candidates = []
+        for name, definition in self.states.items():
+            if not definition['detect']:
+                continue
+            if allowed is not None and name not in allowed and name != self.current:
+                continue
+            candidates.append((name, definition['detect']))
+        self.detections += len(candidates)
+        return candidates
+
+    def detect_rules(self):
+        """
+        모든 상태의 검출 규칙 (캡처 영역 계산용)
+
+        Returns:
+            list: 검출 규칙 목록
+        """
+        return [definition['detect'] for definition in self.states.values() if definition['detect']]
+
+    def update(self, found, now=None):
+        """
+        검출 결과로 현재 상태 갱신
+
+        Args:
+            found (list): 이번 프레임에 검출 규칙이 발견된 상태 이름 목록 (detection_candidates 순서)
+            now (float, optional): 프레임 시각 (time.monotonic 기준)
+
+        Returns:
+            bool: 상태가 바뀌었는지 여부
+        """
+        if now is None:
+            now = time.monotonic()
+        if self.confirmed_at is None:
+            # 시작 상태의 timeout은 첫 프레임부터 계산
+            self.confirmed_at = now
+
+        # 다른 상태가 발견되면 설정 순서상 앞의 상태로 전환
+        for name in found:
+            if name != self.current:
+                return self.transition(name, now)
+
+        if self.current == self.UNKNOWN:
+            return False
+
+        if self.current in found:
+            self._misses = 0
+            self.confirmed_at = now
+            return False
+
+        # 현재 상태를 확인하지 못함: 연속 실패 또는 시간 초과면 모든 상태를 다시 확인
+        state = self.states[self.current]
+        if state['detect']:
+            self._misses += 1
+        timeout = state.get('timeout')
+        if ((self.lost_after and self._misses >= self.lost_after)
+                or (timeout and now - self.confirmed_at > timeout)):
+            self.lost += 1
+            return self.transition(self.UNKNOWN, now)
+        return False
+
+    def transition(self, name, now=None):
+        """
+        상태 전환
+
+        Args:
+            name (str): 전환할 상태 이름
+            now (float, optional): 전환 시각 (time.monotonic 기준)
+
+        Returns:
+            bool: 상태가 바뀌었는지 여부
+        """
+        if name != self.UNKNOWN and name not in self.states:
+            print(f"정의되지 않은 화면 상태: {name}")
+            return False
+        if name == self.current:
+            return False
+
+        print(f"화면 상태 전환: {self.current} -> {name}")
+        self.current = name
+        self.entered_at = time.monotonic() if now is None else now
+        self.confirmed_at = self.entered_at
+        self._misses = 0
+        self.transitions += 1
+        return True
+
+    def apply_rule_hit(self, rule, now=None):
+        """
+        발견된 규칙에 따른 상태 전환 (next_state 설정 또는 set_state 액션)
+
+        Args:
+            rule (dict): 발견된 규칙 설정 정보
+            now (float, optional): 프레임 시각
+
+        Returns:
+            bool: 상태가 바뀌었는지 여부
+        """
+        target = rule.get('next_state')
+        for action in rule.get('actions', []):
+            if action.get('type') == 'set_state':
+                target = action.get('params', {}).get('state', target)
+
+        if target is None:
+            return False
+        return self.transition(target, now)
+
+    def reset(self):
+        """시작 상태로 되돌림"""
+        self.current = self.initial
+        self.entered_at = None
+        self.confirmed_at = None
+        self._misses = 0
+
+    def stats(self):
+        """
+        화면 상태 통계
+
+        Returns:
+            dict: current, transitions, detections, lost
+        """
+        return {
+            'current': self.current,
+            'transitions': self.transitions,
+            'detections': self.detections,
+            'lost': self.lost,
+        }
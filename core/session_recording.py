@@ -0,0 +1,253 @@
+# core/session_recording.py
+
+import json
+import os
+import time
+import cv2
+import numpy as np
+
+class SessionRecorder:
+    """
+    모니터링 세션 기록기
+
+    디렉토리 구조:
+        session.json   - 프로그램 설정, 시작 시각 등 메타데이터
+        frames.raw     - 프레임 데이터 (원시 BGR 배열 또는 PNG 압축 조각을 이어 붙임)
+        frames.jsonl   - 프레임별 위치, 크기, 시각, 윈도우 위치 (한 줄에 한 프레임)
+        actions.jsonl  - 실행된 액션 기록
+    """
+
+    META_FILE = 'session.json'
+    FRAMES_FILE = 'frames.raw'
+    INDEX_FILE = 'frames.jsonl'
+    ACTIONS_FILE = 'actions.jsonl'
+
+    def __init__(self, path, program_config=None, compression=None, max_frames=0):
+        """
+        세션 기록기 초기화 (디렉토리 생성)
+
+        Args:
+            path (str): 기록 디렉토리 경로
+            program_config (dict, optional): 재생 시 사용할 프로그램 설정
+            compression (str, optional): 프레임 압축 방식 (None: 원시 배열, 'png': PNG 압축)
+            max_frames (int): 최대 기록 프레임 수 (0이면 제한 없음)
+        """
+        if compression not in (None, 'raw', 'png'):
+            raise ValueError(f"지원하지 않는 프레임 압축 방식: {compression}")
+
+        self.path = path
+        self.compression = None if compression == 'raw' else compression
+        self.max_frames = max_frames
+        self.frame_count = 0
+        self.action_count = 0
+        self._frame_skipped = False  # 마지막 프레임을 기록하지 않았는지 (해당 프레임의 액션도 제외)
+
+        os.makedirs(path, exist_ok=True)
+
+        self._start = time.monotonic()
+        self._offset = 0
+        self._frames = open(os.path.join(path, self.FRAMES_FILE), 'wb')
+        self._index = open(os.path.join(path, self.INDEX_FILE), 'w', encoding='utf-8')
+        self._actions = open(os.path.join(path, self.ACTIONS_FILE), 'w', encoding='utf-8')
+
+        with open(os.path.join(path, self.META_FILE), 'w', encoding='utf-8') as file:
+            json.dump({
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'compression': self.compression or 'raw',
+                'program_config': program_config,
+            }, file, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def from_config(config, program_config=None):
+        """
+        설정 딕셔너리로 기록기 생성 (기록 디렉토리 아래에 프로그램 이름과 시각으로 하위 디렉토리 생성)
+
+        설정 예:
+            recording: {enabled: true, directory: recordings, compression: png, max_frames: 0}
+
+        Args:
+            config (dict): 기록 설정
+            program_config (dict, optional): 프로그램 설정
+
+        Returns:
+            SessionRecorder: 기록기 (설정이 없거나 비활성화면 None)
+        """
+        if not config or not config.get('enabled', False):
+            return None
+
+        name = (program_config or {}).get('name', 'session')
+        path = os.path.join(config.get('directory', 'recordings'),
+                            f"{name}_{time.strftime('%Y%m%d_%H%M%S')}")
+
+        try:
+            return SessionRecorder(path, program_config,
+                                   compression=config.get('compression'),
+                                   max_frames=config.get('max_frames', 0))
+        except (OSError, ValueError) as e:
+            print(f"세션 기록 시작 오류: {e}")
+            return None
+
+    @property
+    def full(self):
+        """최대 기록 프레임 수에 도달했는지 여부"""
+        return bool(self.max_frames) and self.frame_count >= self.max_frames
+
+    def record_frame(self, image, origin=(0, 0), frame_size=None, window_rect=None, timestamp=None):
+        """
+        프레임 한 장 기록
+
+        Args:
+            image (numpy.ndarray): 캡처된 이미지
+            origin (tuple): 부분 캡처 시 이미지 좌상단의 프레임 내 (x, y) 위치
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기
+            window_rect (tuple, optional): 캡처 당시 윈도우 (left, top, right, bottom)
+            timestamp (float, optional): 캡처 시각 (time.monotonic 기준, 기본: 현재)
+
+        Returns:
+            int: 기록된 프레임 번호 (기록하지 않았으면 None)
+        """
+        if self._frames is None or self.full:
+            self._frame_skipped = True
+            return None
+
+        if self.compression == 'png':
+            ok, encoded = cv2.imencode('.png', image)
+            if not ok:
+                print("프레임 PNG 압축 실패")
+                self._frame_skipped = True
+                return None
+            data = encoded.tobytes()
+        else:
+            data = np.ascontiguousarray(image).tobytes()
+
+        self._frames.write(data)
+
+        seq = self.frame_count
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        entry = {
+            'seq': seq,
+            't': round(timestamp - self._start, 6),
+            'offset': self._offset,
+            'size': len(data),
+            'shape': list(image.shape),
+            'encoding': self.compression or 'raw',
+            'origin': list(origin),
+            'frame_size': list(frame_size) if frame_size else None,
+            'window_rect': list(window_rect) if window_rect else None,
+        }
+        self._index.write(json.dumps(entry) + '\n')
+
+        self._offset += len(data)
+        self.frame_count += 1
+        self._frame_skipped = False
+        return seq
+
+    def record_actions(self, template_name, position, actions, timestamp=None):
+        """
+        발견된 템플릿에 대해 실행된 액션 기록
+
+        Args:
+            template_name (str): 발견된 템플릿 이름
+            position (tuple): 발견된 위치 (x, y, w, h)
+            actions (list): 실행된 액션 목록
+            timestamp (float, optional): 실행 시각 (time.monotonic 기준, 기본: 현재)
+        """
+        if self._actions is None or self._frame_skipped:
+            return
+
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self._actions.write(json.dumps({
+            'frame': self.frame_count - 1,
+            't': round(timestamp - self._start, 6),
+            'template': template_name,
+            'position': [int(v) for v in position],
+            'actions': actions,
+        }, ensure_ascii=False) + '\n')
+        self.action_count += 1
+
+    def close(self):
+        """기록 파일 닫기"""
+        for name in ('_frames', '_index', '_actions'):
+            file = getattr(self, name)
+            if file is not None:
+                file.close()
+                setattr(self, name, None)
+
+class SessionRecording:
+    """SessionRecorder로 기록한 세션 읽기 (원시 프레임은 메모리 매핑으로 복사 없이 참조)"""
+
+    def __init__(self, path):
+        """
+        기록된 세션 열기
+
+        Args:
+            path (str): 기록 디렉토리 경로
+        """
+        self.path = path
+
+        with open(os.path.join(path, SessionRecorder.META_FILE), 'r', encoding='utf-8') as file:
+            self.meta = json.load(file)
+
+        self.actions = self._read_jsonl(SessionRecorder.ACTIONS_FILE)
+
+        # 기록 도중 종료되어 데이터가 끝까지 쓰이지 않은 프레임은 제외
+        frames_path = os.path.join(path, SessionRecorder.FRAMES_FILE)
+        data_size = os.path.getsize(frames_path) if os.path.exists(frames_path) else 0
+        self.entries = [entry for entry in self._read_jsonl(SessionRecorder.INDEX_FILE)
+                        if entry['offset'] + entry['size'] <= data_size]
+
+        if self.entries:
+            self._data = np.memmap(frames_path, dtype=np.uint8, mode='r')
+        else:
+            self._data = None
+
+    @property
+    def program_config(self):
+        """기록 당시 프로그램 설정"""
+        return self.meta.get('program_config') or {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def frame(self, index):
+        """
+        프레임 이미지 가져오기
+
+        Args:
+            index (int): 프레임 번호
+
+        Returns:
+            tuple: (image, entry) - 이미지 (원시 프레임은 읽기 전용 뷰)와 프레임 정보
+        """
+        entry = self.entries[index]
+        data = self._data[entry['offset']:entry['offset'] + entry['size']]
+
+        if entry['encoding'] == 'png':
+            image = cv2.imdecode(np.asarray(data), cv2.IMREAD_UNCHANGED)
+        else:
+            image = data.reshape(entry['shape'])
+        return image, entry
+
+    def _read_jsonl(self, filename):
+        """
+        한 줄에 JSON 객체 하나인 파일 읽기 (내부 사용)
+
+        Args:
+            filename (str): 기록 디렉토리 내 파일 이름
+
+        Returns:
+            list: 객체 목록 (파일이 없으면 빈 목록, 마지막 줄이 잘렸으면 제외)
+        """
+        path = os.path.join(self.path, filename)
+        if not os.path.exists(path):
+            return []
+
+        items = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    # 기록 도중 종료되어 잘린 줄
+                    break
+        return items
@@ -0,0 +1,390 @@
+# core/shared_frame_pool.py
+
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedFrame:
+    """공유 메모리 칸에 게시된 프레임 (이미지는 복사 없는 NumPy 뷰)"""
+
+    __slots__ = ('pool', 'index', 'image', 'seq', 'timestamp', 'hwnd', 'origin', 'frame_size')
+
+    def __init__(self, pool, index, image, seq, timestamp, hwnd, origin, frame_size):
+        self.pool = pool
+        self.index = index
+        self.image = image            # 공유 메모리를 직접 가리키는 BGR 이미지 (읽기 전용으로 사용)
+        self.seq = seq                # 프레임 일련번호 (1부터 증가)
+        self.timestamp = timestamp    # 캡처 시각 (time.time 기준, 프로세스 간 공통)
+        self.hwnd = hwnd              # 캡처한 윈도우 핸들
+        self.origin = origin          # 부분 캡처 시 이미지 좌상단의 프레임 내 위치
+        self.frame_size = frame_size  # 전체 프레임 (w, h) 크기
+
+    def valid(self):
+        """
+        읽는 동안 생산자가 이 칸을 덮어쓰지 않았는지 확인 (처리를 마친 뒤 호출)
+
+        Returns:
+            bool: 이미지가 여전히 seq 프레임의 내용인지 여부
+        """
+        return int(self.pool._slots[self.index]['seq']) == self.seq
+
+class SharedFramePool:
+    """
+    프로세스 간 프레임 전달용 공유 메모리 칸 묶음
+
+    메모리 구조 (multiprocessing.shared_memory 블록 하나):
+        제어 헤더 | 칸별 헤더 (seq, timestamp, hwnd, shape, origin, frame_size) | 칸별 이미지 데이터
+
+    생산자(캡처 프로세스)는 acquire()로 받은 칸 뷰에 바로 캡처하고 publish()로 게시하며,
+    소비자(인식 프로세스)는 latest()로 가장 최근 프레임을 복사 없이 참조합니다.
+    생산자 하나, 소비자 하나를 기준으로 하며, 생산자는 게시된 칸과 소비자가 읽는 칸을
+    피해 기록합니다. 기록 중인 칸은 seq가 0이므로 소비자는 끝난 프레임만 보게 됩니다.
+
+    사용 예 (캡처 프로세스):
+        pool = SharedFramePool.create(max_width=1024, max_height=768)
+        index, view = pool.acquire()
+        image = WindowUtils.capture_window(hwnd, out=view)
+        pool.publish(index, image, hwnd=hwnd)
+    """
+
+    MAGIC = 0x4753465250303031  # 'GSFRP001'
+    ALIGNMENT = 64
+
+    CONTROL_DTYPE = np.dtype([
+        ('magic', '<u8'),
+        ('slots', '<u8'),
+        ('slot_bytes', '<u8'),
+        ('latest', '<i8'),     # 가장 최근에 게시된 칸 번호 (-1: 없음)
+        ('reading', '<i8'),    # 소비자가 읽고 있는 칸 번호 (-1: 없음)
+        ('seq', '<u8'),        # 마지막으로 게시한 프레임 일련번호
+        ('closed', '<u8'),     # 생산자 종료 여부
+    ])
+
+    SLOT_DTYPE = np.dtype([
+        ('seq', '<u8'),        # 0이면 기록 중이거나 비어 있음
+        ('timestamp', '<f8'),
+        ('hwnd', '<u8'),
+        ('shape', '<u4', (3,)),
+        ('origin', '<i4', (2,)),
+        ('frame_size', '<i4', (2,)),
+    ])
+
+    def __init__(self, shm, owner):
+        """
+        공유 메모리 블록 위에 풀 구성 (create() 또는 attach() 사용)
+
+        Args:
+            shm (shared_memory.SharedMemory): 공유 메모리 블록
+            owner (bool): 블록을 만든 쪽인지 여부 (close 시 해제 담당)
+        """
+        self.shm = shm
+        self.owner = owner
+        self._control = np.ndarray((), dtype=self.CONTROL_DTYPE, buffer=shm.buf)
+
+        if int(self._control['magic']) != self.MAGIC:
+            raise ValueError(f"공유 프레임 풀 형식이 아님: {shm.name}")
+
+        slots = int(self._control['slots'])
+        self.slot_bytes = int(self._control['slot_bytes'])
+        self._slots = np.ndarray((slots,), dtype=self.SLOT_DTYPE, buffer=shm.buf,
+                                 offset=self.CONTROL_DTYPE.itemsize)
+        self._data_offset = self._data_start(slots)
+        self._next = 0
+
+    @staticmethod
+    def _data_start(slots):
+        """이미지 데이터 영역 시작 위치 (정렬 단위에 맞춤) (내부 사용)"""
+        size = SharedFramePool.CONTROL_DTYPE.itemsize + SharedFramePool.SLOT_DTYPE.itemsize * slots
+        return size + (-size) % SharedFramePool.ALIGNMENT
+
+    @staticmethod
+    def create(max_width, max_height, channels=3, slots=3, name=None):
+        """
+        새 공유 프레임 풀 생성 (생산자 쪽)
+
+        Args:
+            max_width (int): 최대 프레임 너비
+            max_height (int): 최대 프레임 높이
+            channels (int): 채널 수
+            slots (int): 칸 수 (기록 중, 게시됨, 읽는 중 칸이 겹치지 않도록 최소 3)
+            name (str, optional): 공유 메모리 이름 (기본: 자동 생성)
+
+        Returns:
+            SharedFramePool: 생성된 풀
+        """
+        if slots < 3:
+            raise ValueError(f"공유 프레임 풀 칸 수는 3 이상이어야 함: {slots}")
+
+        slot_bytes = max_width * max_height * channels
+        slot_bytes += (-slot_bytes) % SharedFramePool.ALIGNMENT
+        size = SharedFramePool._data_start(slots) + slot_bytes * slots
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        control = np.ndarray((), dtype=SharedFramePool.CONTROL_DTYPE, buffer=shm.buf)
+        control['magic'] = SharedFramePool.MAGIC
+        control['slots'] = slots
+        control['slot_bytes'] = slot_bytes
+        control['latest'] = -1
+        control['reading'] = -1
+        control['seq'] = 0
+        control['closed'] = 0
+        del control
+
+        try:
+            return SharedFramePool(shm, owner=True)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @staticmethod
+    def from_config(config):
+        """
+        설정 딕셔너리로 공유 프레임 풀 생성 (캡처하는 모니터가 생산자)
+
+        설정 예:
+            capture: {publish: {name: gersang_frames, max_width: 1024, max_height: 768, slots: 3}}
+
+        Args:
+            config (dict): 게시 설정
+
+        Returns:
+            SharedFramePool: 생성된 풀 (설정이 없거나 비활성화, 생성 실패면 None)
+        """
+        if not config or not config.get('enabled', True):
+            return None
+
+        try:
+            return SharedFramePool.create(
+                config.get('max_width', 1920), config.get('max_height', 1080),
+                slots=config.get('slots', 3), name=config.get('name')
+            )
+        except (OSError, ValueError) as e:
+            print(f"공유 프레임 풀 생성 오류: {e}")
+            return None
+
+    @staticmethod
+    def attach(name):
+        """
+        이름으로 기존 공유 프레임 풀 연결 (소비자 쪽)
+
+        Args:
+            name (str): 공유 메모리 이름 (생산자 쪽 pool.name)
+
+        Returns:
+            SharedFramePool: 연결된 풀
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            return SharedFramePool(shm, owner=False)
+        except Exception:
+            shm.close()
+            raise
+
+    @property
+    def name(self):
+        """공유 메모리 이름 (다른 프로세스에서 attach할 때 사용)"""
+        return self.shm.name
+
+    @property
+    def capacity(self):
+        """칸 수"""
+        return len(self._slots)
+
+    @property
+    def closed(self):
+        """생산자가 풀을 닫았는지 여부"""
+        return bool(self._control['closed'])
+
+    def _view(self, index, shape):
+        """
+        칸의 이미지 데이터 뷰 (내부 사용)
+
+        Args:
+            index (int): 칸 번호
+            shape (tuple): (h, w, channels)
+
+        Returns:
+            numpy.ndarray: 공유 메모리를 직접 가리키는 uint8 배열
+        """
+        nbytes = int(np.prod(shape))
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"프레임 크기가 풀 칸 크기를 초과: {tuple(shape)}")
+
+        offset = self._data_offset + index * self.slot_bytes
+        return np.ndarray(tuple(shape), dtype=np.uint8, buffer=self.shm.buf, offset=offset)
+
+    def acquire(self, height=None, width=None, channels=3):
+        """
+        생산자가 기록할 칸 가져오기 (게시된 칸, 소비자가 읽는 칸은 제외)
+
+        Args:
+            height (int, optional): 프레임 높이 (기본: 직전 게시 프레임 크기)
+            width (int, optional): 프레임 너비
+            channels (int): 채널 수
+
+        Returns:
+            tuple: (index, view) - 칸 번호와 캡처 out으로 사용할 뷰
+                (크기를 알 수 없으면 view는 None)
+        """
+        latest = int(self._control['latest'])
+        reading = int(self._control['reading'])
+
+        for _ in range(self.capacity):
+            index = self._next
+            self._next = (self._next + 1) % self.capacity
+            if index != latest and index != reading:
+                break
+        else:
+            # capacity >= 3이므로 도달하지 않음
+            raise RuntimeError("기록 가능한 공유 프레임 칸 없음")
+
+        # 기록 중 표시 (소비자가 이 칸의 이전 프레임을 쓰고 있었다면 valid()가 False가 됨)
+        self._slots[index]['seq'] = 0
+
+        if height is None or width is None:
+            if latest < 0:
+                return index, None
+            shape = tuple(int(v) for v in self._slots[latest]['shape'])
+        else:
+            shape = (height, width, channels)
+        return index, self._view(index, shape)
+
+    def publish(self, index, image, hwnd=0, origin=(0, 0), frame_size=None, timestamp=None):
+        """
+        기록을 마친 칸을 최신 프레임으로 게시
+
+        image가 칸 뷰가 아니면 (캡처 크기가 바뀌어 새로 할당된 경우 등) 칸에 복사합니다.
+
+        Args:
+            index (int): acquire()로 받은 칸 번호
+            image (numpy.ndarray): 캡처된 (h, w, channels) uint8 이미지
+            hwnd (int): 캡처한 윈도우 핸들
+            origin (tuple): 부분 캡처 시 이미지 좌상단의 프레임 내 (x, y) 위치
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기 (기본: 이미지 크기)
+            timestamp (float, optional): 캡처 시각 (기본: 현재 time.time)
+
+        Returns:
+            int: 게시된 프레임 일련번호
+        """
+        shape = image.shape if image.ndim == 3 else image.shape + (1,)
+        view = self._view(index, shape)
+        if not np.shares_memory(view, image):
+            np.copyto(view, image.reshape(shape))
+
+        seq = int(self._control['seq']) + 1
+        slot = self._slots[index]
+        slot['timestamp'] = time.time() if timestamp is None else timestamp
+        slot['hwnd'] = hwnd or 0
+        slot['shape'] = shape
+        slot['origin'] = origin
+        slot['frame_size'] = frame_size if frame_size else (shape[1], shape[0])
+
+        # 헤더를 모두 기록한 뒤 seq와 최신 칸 번호를 갱신
+        slot['seq'] = seq
+        self._control['seq'] = seq
+        self._control['latest'] = index
+        return seq
+
+    def write(self, image, hwnd=0, origin=(0, 0), frame_size=None, timestamp=None):
+        """
+        이미지를 칸에 복사해 게시 (캡처 결과가 이미 다른 버퍼에 있는 경우)
+
+        Args:
+            image (numpy.ndarray): 캡처된 이미지
+            hwnd (int): 캡처한 윈도우 핸들
+            origin (tuple): 부분 캡처 시 이미지 좌상단의 프레임 내 (x, y) 위치
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기
+            timestamp (float, optional): 캡처 시각
+
+        Returns:
+            int: 게시된 프레임 일련번호
+        """
+        index, _ = self.acquire()
+        return self.publish(index, image, hwnd, origin, frame_size, timestamp)
+
+    def latest(self, last_seq=0):
+        """
+        가장 최근 프레임 가져오기 (복사 없음)
+
+        반환된 칸은 다음 latest() 호출 전까지 생산자가 새로 기록하지 않습니다.
+
+        Args:
+            last_seq (int): 이미 처리한 마지막 프레임 일련번호 (이보다 새 프레임만 반환)
+
+        Returns:
+            SharedFrame: 최신 프레임 (새 프레임이 없으면 None)
+        """
+        for _ in range(self.capacity):
+            index = int(self._control['latest'])
+            if index < 0 or int(self._control['seq']) <= last_seq:
+                return None
+
+            self._control['reading'] = index
+            slot = self._slots[index]
+            seq = int(slot['seq'])
+
+            # 읽기 표시 전에 생산자가 이 칸을 다시 고른 경우 다음 최신 칸으로 재시도
+            if seq == 0 or int(self._control['latest']) != index:
+                continue
+            if seq <= last_seq:
+                return None
+
+            shape = tuple(int(v) for v in slot['shape'])
+            return SharedFrame(
+                self, index, self._view(index, shape), seq,
+                float(slot['timestamp']), int(slot['hwnd']),
+                tuple(int(v) for v in slot['origin']),
+                tuple(int(v) for v in slot['frame_size'])
+            )
+        return None
+
+    def wait(self, last_seq=0, timeout=None, poll_interval=0.002):
+        """
+        새 프레임이 게시될 때까지 대기
+
+        Args:
+            last_seq (int): 이미 처리한 마지막 프레임 일련번호
+            timeout (float, optional): 최대 대기 시간 (초, None이면 무한 대기)
+            poll_interval (float): 확인 간격 (초)
+
+        Returns:
+            SharedFrame: 최신 프레임 (시간 초과 또는 생산자가 닫으면 None)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame = self.latest(last_seq)
+            if frame is not None or self.closed:
+                return frame
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def close(self):
+        """
+        풀 연결 해제 (생산자 쪽은 공유 메모리도 해제)
+
+        이 풀에서 받은 뷰는 close 이후 사용하면 안 됩니다.
+        """
+        if self.shm is None:
+            return
+
+        if self.owner:
+            self._control['closed'] = 1
+
+        # 공유 메모리 버퍼를 참조하는 배열을 먼저 놓아야 닫을 수 있음
+        self._control = None
+        self._slots = None
+        shm, self.shm = self.shm, None
+        try:
+            shm.close()
+        except BufferError as e:
+            print(f"공유 프레임 풀 닫기 오류 (사용 중인 뷰 있음): {e}")
+        if self.owner:
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,201 @@
+# core/template_pack.py
+
+import json
+import os
+import struct
+import cv2
+import numpy as np
+from .template_store import TemplateEntry
+
+class TemplatePack:
+    """
+    템플릿 이미지와 미리 계산된 파생 데이터를 한 파일에 담은 컴파일된 템플릿 팩
+
+    파일 구조:
+        MAGIC (8바이트) | 헤더 길이 (uint64) | JSON 헤더 | 정렬된 원시 배열 데이터
+
+    데이터 영역은 numpy.memmap으로 읽기 전용 매핑되므로 여러 모니터와 프로세스가
+    같은 메모리 페이지를 공유합니다. 원본 이미지 파일의 수정 시각이나 크기가 바뀌면
+    자동으로 다시 빌드됩니다.
+    """
+
+    MAGIC = b'GSTPACK1'
+    VERSION = 1
+    FILENAME = '_templates.pack'
+    ALIGNMENT = 64
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+    @staticmethod
+    def pack_path(directory):
+        """
+        템플릿 디렉토리의 팩 파일 경로
+
+        Args:
+            directory (str): 템플릿 이미지 디렉토리 경로
+
+        Returns:
+            str: 팩 파일 경로
+        """
+        return os.path.join(directory, TemplatePack.FILENAME)
+
+    @staticmethod
+    def list_sources(directory):
+        """
+        팩에 포함될 원본 이미지 파일 목록과 변경 확인용 정보
+
+        Args:
+            directory (str): 템플릿 이미지 디렉토리 경로
+
+        Returns:
+            dict: 파일 이름 -> [수정 시각(ns), 크기]
+        """
+        sources = {}
+        for filename in os.listdir(directory):
+            if filename.lower().endswith(TemplatePack.IMAGE_EXTENSIONS):
+                stat = os.stat(os.path.join(directory, filename))
+                sources[filename] = [stat.st_mtime_ns, stat.st_size]
+        return sources
+
+    @staticmethod
+    def build(directory, pack_path=None):
+        """
+        디렉토리의 템플릿 이미지로 팩 파일 생성
+
+        Args:
+            directory (str): 템플릿 이미지 디렉토리 경로
+            pack_path (str, optional): 팩 파일 경로 (기본: 디렉토리 내 FILENAME)
+
+        Returns:
+            str: 생성된 팩 파일 경로
+        """
+        pack_path = pack_path or TemplatePack.pack_path(directory)
+        sources = TemplatePack.list_sources(directory)
+
+        templates = []
+        blobs = []
+        offset = 0
+
+        def add_array(array):
+            nonlocal offset
+            array = np.ascontiguousarray(array)
+            info = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+            padding = (-array.nbytes) % TemplatePack.ALIGNMENT
+            blobs.append(array.tobytes() + b'\0' * padding)
+            offset += array.nbytes + padding
+            return info
+
+        for filename in sources:
+            image = cv2.imread(os.path.join(directory, filename))
+            if image is None:
+                continue
+
+            entry = TemplateEntry(os.path.splitext(filename)[0], image)
+            templates.append({
+                'name': entry.name,
+                'image': add_array(entry.image),
+                'hist': add_array(entry.hist),
+                'levels': [add_array(level) for level in entry.levels],
+                'mean': entry.mean,
+                'stddev': entry.stddev,
+            })
+
+        header = json.dumps({
+            'version': TemplatePack.VERSION,
+            'sources': sources,
+            'templates': templates,
+        }).encode('utf-8')
+
+        # 데이터 영역 시작 위치를 정렬 단위에 맞춤
+        prefix_size = len(TemplatePack.MAGIC) + 8 + len(header)
+        header += b' ' * ((-prefix_size) % TemplatePack.ALIGNMENT)
+
+        # 다른 프로세스가 읽는 도중 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{pack_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(TemplatePack.MAGIC)
+            file.write(struct.pack('<Q', len(header)))
+            file.write(header)
+            for blob in blobs:
+                file.write(blob)
+
+        try:
+            os.replace(temp_path, pack_path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+        return pack_path
+
+    @staticmethod
+    def load(pack_path):
+        """
+        팩 파일을 메모리 매핑하여 템플릿 항목 생성
+
+        Args:
+            pack_path (str): 팩 파일 경로
+
+        Returns:
+            tuple: (sources, entries) - 원본 파일 정보와 TemplateEntry 목록
+                (파일이 없거나 형식이 맞지 않으면 None)
+        """
+        if not os.path.isfile(pack_path):
+            return None
+
+        with open(pack_path, 'rb') as file:
+            if file.read(len(TemplatePack.MAGIC)) != TemplatePack.MAGIC:
+                return None
+            header_size = struct.unpack('<Q', file.read(8))[0]
+            header = json.loads(file.read(header_size).decode('utf-8'))
+
+        if header.get('version') != TemplatePack.VERSION:
+            return None
+
+        data_start = len(TemplatePack.MAGIC) + 8 + header_size
+        if os.path.getsize(pack_path) <= data_start:
+            return header.get('sources', {}), []
+
+        data = np.memmap(pack_path, dtype=np.uint8, mode='r', offset=data_start)
+
+        def view(info):
+            dtype = np.dtype(info['dtype'])
+            count = int(np.prod(info['shape'])) * dtype.itemsize
+            start = info['offset']
+            return data[start:start + count].view(dtype).reshape(info['shape'])
+
+        entries = []
+        for item in header.get('templates', []):
+            levels = [view(level) for level in item['levels']]
+            entries.append(TemplateEntry(
+                item['name'], view(item['image']),
+                gray=levels[0], hist=view(item['hist']), levels=levels,
+                mean=item['mean'], stddev=item['stddev']
+            ))
+
+        return header.get('sources', {}), entries
+
+    @staticmethod
+    def load_or_build(directory):
+        """
+        최신 팩 파일을 로드하고, 없거나 원본 이미지가 바뀌었으면 다시 빌드
+
+        Args:
+            directory (str): 템플릿 이미지 디렉토리 경로
+
+        Returns:
+            list: TemplateEntry 목록 (팩을 사용할 수 없으면 None)
+        """
+        pack_path = TemplatePack.pack_path(directory)
+
+        try:
+            loaded = TemplatePack.load(pack_path)
+            if loaded is not None and loaded[0] == TemplatePack.list_sources(directory):
+                return loaded[1]
+
+            # 팩이 없거나 오래됨: 다시 빌드 후 로드
+            TemplatePack.build(directory, pack_path)
+            loaded = TemplatePack.load(pack_path)
+            return loaded[1] if loaded is not None else None
+        except (OSError, ValueError, KeyError) as e:
+            # 읽기 전용 디렉토리, 다른 프로세스가 매핑 중인 파일 교체 실패 등
+            print(f"템플릿 팩 사용 불가, 개별 이미지 로드로 대체: {e}")
+            return None
@@ -0,0 +1,132 @@
+# core/template_registry.py
+
+import os
+import threading
+import cv2
+from .template_store import TemplateStore, TemplateEntry
+from .template_pack import TemplatePack
+
+class TemplateRegistry:
+    """
+    프로세스 전체에서 공유하는 복사-후-교체(copy-on-write) 방식 템플릿 저장소
+
+    읽기 쪽은 잠금 없이 snapshot을 가져가 사용하고, 쓰기 쪽(GUI의 템플릿 저장 등)은
+    잠금 안에서 새 TemplateStore를 만든 뒤 참조를 한 번에 교체합니다.
+    이미 가져간 snapshot은 이후 변경에 영향을 받지 않습니다.
+    """
+
+    _shared = {}                    # 절대 경로 -> TemplateRegistry
+    _shared_lock = threading.Lock()
+
+    def __init__(self, templates_dir=None, use_pack=True):
+        """
+        템플릿 저장소 초기화
+
+        Args:
+            templates_dir (str, optional): 템플릿 이미지 디렉토리 경로
+            use_pack (bool): 컴파일된 템플릿 팩(메모리 매핑) 사용 여부
+        """
+        self.templates_dir = templates_dir
+        self._lock = threading.Lock()
+        self._snapshot = TemplateStore()
+        self.version = 0
+
+        if templates_dir and os.path.isdir(templates_dir):
+            self.load_directory(templates_dir, use_pack=use_pack)
+
+    @classmethod
+    def shared(cls, templates_dir, use_pack=True):
+        """
+        템플릿 디렉토리별 공유 저장소 가져오기 (처음 호출 시 한 번만 로드)
+
+        Args:
+            templates_dir (str): 템플릿 이미지 디렉토리 경로
+            use_pack (bool): 컴파일된 템플릿 팩 사용 여부
+
+        Returns:
+            TemplateRegistry: 공유 템플릿 저장소
+        """
+        key = os.path.abspath(templates_dir)
+        with cls._shared_lock:
+            registry = cls._shared.get(key)
+            if registry is None:
+                registry = cls(templates_dir, use_pack=use_pack)
+                cls._shared[key] = registry
+            return registry
+
+    @property
+    def snapshot(self):
+        """현재 템플릿 저장소 (읽기 전용으로 사용)"""
+        return self._snapshot
+
+    def load_directory(self, directory, use_pack=True):
+        """
+        디렉토리의 모든 템플릿 이미지를 로드하여 추가
+
+        Args:
+            directory (str): 템플릿 이미지 디렉토리 경로
+            use_pack (bool): 컴파일된 템플릿 팩 사용 여부 (원본 이미지가 바뀌면 자동 재빌드)
+
+        Returns:
+            int: 로드된 템플릿 수
+        """
+        entries = TemplatePack.load_or_build(directory) if use_pack else None
+
+        if entries is None:
+            entries = []
+            for filename in os.listdir(directory):
+                if filename.lower().endswith(TemplatePack.IMAGE_EXTENSIONS):
+                    template = cv2.imread(os.path.join(directory, filename))
+                    if template is not None:
+                        entries.append(TemplateEntry(os.path.splitext(filename)[0], template))
+
+        def add_entries(store):
+            for entry in entries:
+                store.add_entry(entry)
+
+        self._update(add_entries)
+        return len(entries)
+
+    def add(self, name, image):
+        """
+        템플릿 추가 또는 교체 (파생 데이터 계산은 잠금 밖에서 수행)
+
+        Args:
+            name (str): 템플릿 이름
+            image (numpy.ndarray): 템플릿 이미지
+
+        Returns:
+            TemplateEntry: 추가된 템플릿 항목
+        """
+        entry = TemplateEntry(name, image)
+        self._update(lambda store: store.add_entry(entry))
+        return entry
+
+    def remove(self, name):
+        """
+        템플릿 제거
+
+        Args:
+            name (str): 템플릿 이름
+
+        Returns:
+            bool: 제거 여부
+        """
+        return self._update(lambda store: store.remove(name))
+
+    def _update(self, modify):
+        """
+        현재 저장소를 복사해 변경한 뒤 참조 교체 (내부 사용)
+
+        Args:
+            modify (callable): 복사된 TemplateStore를 받아 변경하는 함수
+
+        Returns:
+            object: modify의 반환값
+        """
+        with self._lock:
+            store = self._snapshot.copy()
+            result = modify(store)
+            self._snapshot = store
+            self.version += 1
+            return result
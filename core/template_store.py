@@ -0,0 +1,181 @@
+# core/template_store.py
+
+from collections.abc import Mapping
+import cv2
+import numpy as np
+
+def calc_hsv_histogram(hsv):
+    """
+    HSV 이미지의 색상 히스토그램 계산
+
+    Args:
+        hsv: HSV 색상 공간 이미지
+
+    Returns:
+        히스토그램
+    """
+    # H, S, V 각각 히스토그램 계산
+    h_hist = cv2.calcHist([hsv], [0], None, [30], [0, 180])
+    s_hist = cv2.calcHist([hsv], [1], None, [32], [0, 256])
+    v_hist = cv2.calcHist([hsv], [2], None, [32], [0, 256])
+
+    # 정규화
+    h_hist = cv2.normalize(h_hist, h_hist, 0, 1, cv2.NORM_MINMAX)
+    s_hist = cv2.normalize(s_hist, s_hist, 0, 1, cv2.NORM_MINMAX)
+    v_hist = cv2.normalize(v_hist, v_hist, 0, 1, cv2.NORM_MINMAX)
+
+    # 히스토그램 연결
+    return np.concatenate((h_hist, s_hist, v_hist))
+
+def calc_color_histogram(img):
+    """
+    이미지의 색상 히스토그램 계산
+
+    Args:
+        img: 이미지 (BGR 또는 그레이스케일)
+
+    Returns:
+        히스토그램
+    """
+    if len(img.shape) == 3:  # 컬러 이미지
+        return calc_hsv_histogram(cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+    else:  # 그레이스케일
+        hist = cv2.calcHist([img], [0], None, [64], [0, 256])
+        return cv2.normalize(hist, hist, 0, 1, cv2.NORM_MINMAX)
+
+class TemplateEntry:
+    """로드 시점에 파생 이미지와 메타데이터를 미리 계산해 둔 템플릿"""
+
+    __slots__ = ('name', 'image', 'gray', 'hist', 'levels',
+                 'mean', 'stddev', 'width', 'height', 'channels')
+
+    # 피라미드 단계에서 템플릿의 최소 변 길이 (픽셀)
+    MIN_PYRAMID_SIZE = 8
+
+    def __init__(self, name, image, gray=None, hist=None, levels=None, mean=None, stddev=None):
+        """
+        템플릿 항목 초기화 (주어지지 않은 파생 데이터는 여기서 계산)
+
+        Args:
+            name (str): 템플릿 이름
+            image (numpy.ndarray): 원본 템플릿 이미지 (BGR 또는 그레이스케일)
+            gray (numpy.ndarray, optional): 그레이스케일 이미지
+            hist (numpy.ndarray, optional): 색상 히스토그램
+            levels (list, optional): 피라미드 단계별 그레이스케일 이미지 (0단계 = gray)
+            mean (float, optional): 그레이스케일 평균 밝기
+            stddev (float, optional): 그레이스케일 표준편차
+        """
+        self.name = name
+        self.image = image
+        self.height, self.width = image.shape[:2]
+        self.channels = image.shape[2] if len(image.shape) == 3 else 1
+
+        if gray is None:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if self.channels == 3 else image
+        self.gray = gray
+
+        self.hist = hist if hist is not None else calc_color_histogram(image)
+
+        if levels is None:
+            levels = [gray]
+            while (min(self.width, self.height) >> len(levels)) >= self.MIN_PYRAMID_SIZE:
+                levels.append(cv2.pyrDown(levels[-1]))
+        self.levels = tuple(levels)
+
+        if mean is None or stddev is None:
+            m, sd = cv2.meanStdDev(gray)
+            mean, stddev = float(m[0][0]), float(sd[0][0])
+        self.mean = mean
+        self.stddev = stddev
+
+    @property
+    def max_level(self):
+        """사용 가능한 최대 피라미드 단계"""
+        return len(self.levels) - 1
+
+    @property
+    def size(self):
+        """(w, h) 템플릿 크기"""
+        return (self.width, self.height)
+
+class TemplateStore(Mapping):
+    """
+    템플릿 저장소
+
+    이름 -> 원본 이미지 매핑처럼 동작하며 (기존 templates 딕셔너리 호환),
+    entry()로 미리 계산된 TemplateEntry에 접근합니다.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def add(self, name, image):
+        """
+        템플릿 추가 (파생 데이터는 이 시점에 한 번만 계산)
+
+        Args:
+            name (str): 템플릿 이름
+            image (numpy.ndarray): 템플릿 이미지
+
+        Returns:
+            TemplateEntry: 추가된 템플릿 항목
+        """
+        entry = TemplateEntry(name, image)
+        self._entries[name] = entry
+        return entry
+
+    def add_entry(self, entry):
+        """
+        미리 만들어진 템플릿 항목 추가
+
+        Args:
+            entry (TemplateEntry): 템플릿 항목
+        """
+        self._entries[entry.name] = entry
+
+    def remove(self, name):
+        """
+        템플릿 제거
+
+        Args:
+            name (str): 템플릿 이름
+
+        Returns:
+            bool: 제거 여부
+        """
+        return self._entries.pop(name, None) is not None
+
+    def copy(self):
+        """
+        항목을 공유하는 얕은 복사본 생성
+
+        Returns:
+            TemplateStore: 복사된 저장소
+        """
+        store = TemplateStore()
+        store._entries = dict(self._entries)
+        return store
+
+    def entry(self, name):
+        """
+        템플릿 항목 가져오기
+
+        Args:
+            name (str): 템플릿 이름
+
+        Returns:
+            TemplateEntry: 템플릿 항목 (없으면 None)
+        """
+        return self._entries.get(name)
+
+    def __getitem__(self, name):
+        return self._entries[name].image
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,19 +1,28 @@
 # core/window_utils.py
 
 import cv2
-import win32gui
-import win32con
-import win32api
-import win32ui
-import win32process  # 이 라인 추가
-from ctypes import windll
-from PIL import Image
+try:
+    import win32gui
+    import win32con
+    import win32api
+    import win32ui
+    import win32process  # 이 라인 추가
+    from ctypes import windll
+except ImportError:
+    # 윈도우가 아닌 환경 (리플레이/합성 캡처 백엔드로 파이프라인만 실행)
+    win32gui = win32con = win32api = win32ui = win32process = windll = None
 import numpy as np
+import threading
 import time
+from .capture_session import CaptureSession, clip_rect, prepare_buffer
 
 class WindowUtils:
     """윈도우 API를 활용한 유틸리티 클래스"""
     
+    # 윈도우 핸들 -> 캡처 세션 (DC 방식 캡처용 GDI 리소스 재사용)
+    _capture_sessions = {}
+    _capture_sessions_lock = threading.Lock()
+    
     @staticmethod
     def find_window(window_name=None, window_class=None):
         """
@@ -110,19 +119,29 @@ class WindowUtils:
         return win32gui.GetForegroundWindow() == hwnd
     
     @staticmethod
-    def capture_window(hwnd, method="auto"):
+    def capture_window(hwnd, method="auto", out=None, rect=None, client_only=True, session=None):
         """
         윈도우 화면 캡처하기 (다양한 방식 지원)
         
         Args:
             hwnd (int): 윈도우 핸들
             method (str): 캡처 방식 ("dc", "pyautogui", "auto" 중 선택)
+            out (numpy.ndarray, optional): 결과를 기록할 (h, w, 3) uint8 버퍼
+                (크기가 맞으면 재사용, 다르면 새로 할당)
+            rect (tuple, optional): 캡처할 (x, y, w, h) 부분 영역 (캡처 영역 기준, None이면 전체)
+            client_only (bool): 클라이언트 영역만 캡처할지 여부 (False면 제목 표시줄, 테두리 포함)
+            session (CaptureSession, optional): DC 방식에 사용할 캡처 세션
+                (None이면 윈도우별 공유 세션 사용)
             
         Returns:
-            numpy.ndarray: 캡처된 이미지 (OpenCV 형식)
+            numpy.ndarray: 캡처된 이미지 (OpenCV BGR 형식)
         """
         if not hwnd or not win32gui.IsWindow(hwnd):
             print(f"캡처 실패: 유효하지 않은 윈도우 핸들 {hwnd}")
+            if session is not None:
+                session.close()
+            else:
+                WindowUtils.close_capture_session(hwnd)
             return None
 
         # 윈도우 정보 출력
@@ -132,8 +151,11 @@ class WindowUtils:
         print(f"캡처 시도: '{window_title}' (핸들: {hwnd}, 크기: {width}x{height})")
       
         try:
-            # 윈도우 위치와 크기
-            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+            # 캡처 영역 위치와 크기 (화면 기준)
+            if client_only:
+                left, top, right, bottom = WindowUtils.get_client_rect(hwnd)
+            else:
+                left, top, right, bottom = win32gui.GetWindowRect(hwnd)
             width, height = right - left, bottom - top
             
             if width <= 0 or height <= 0:
@@ -141,51 +163,71 @@ class WindowUtils:
             
             # 방식에 따라 다른 캡처 방식 사용
             if method == "pyautogui" or (method == "auto" and WindowUtils._is_pyautogui_available()):
-                # PyAutoGUI 방식
+                # PyAutoGUI 방식 (부분 영역만 화면에서 가져옴)
+                region = clip_rect(rect, width, height)
+                if region is None:
+                    return None
+                x, y, w, h = region
+                
                 import pyautogui
-                screenshot = pyautogui.screenshot(region=(left, top, width, height))
-                screenshot = np.array(screenshot)
-                screenshot = cv2.cvtColor(screenshot, cv2.COLOR_RGB2BGR)
-                return screenshot
+                screenshot = pyautogui.screenshot(region=(left + x, top + y, w, h))
+                screenshot = np.asarray(screenshot)
+                out = prepare_buffer(out, screenshot.shape[0], screenshot.shape[1])
+                return cv2.cvtColor(screenshot, cv2.COLOR_RGB2BGR, dst=out)
             else:
-                # DC 방식 (원래 구현)
-                hwnd_dc = win32gui.GetWindowDC(hwnd)
-                mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
-                save_dc = mfc_dc.CreateCompatibleDC()
-                
-                save_bitmap = win32ui.CreateBitmap()
-                save_bitmap.CreateCompatibleBitmap(mfc_dc, width, height)
-                save_dc.SelectObject(save_bitmap)
-                
-                # 화면 복사 (더 안정적인 방식)
-                result = windll.user32.PrintWindow(hwnd, save_dc.GetSafeHdc(), 2)
-                if not result:
-                    # 실패 시 대체 방식 시도
-                    windll.user32.PrintWindow(hwnd, save_dc.GetSafeHdc(), 0)
-                
-                # 비트맵 정보
-                bmpinfo = save_bitmap.GetInfo()
-                bmpstr = save_bitmap.GetBitmapBits(True)
-                
-                # PIL 이미지로 변환
-                img = Image.frombuffer(
-                    'RGB',
-                    (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                    bmpstr, 'raw', 'BGRX', 0, 1)
-                
-                # 리소스 해제
-                win32gui.DeleteObject(save_bitmap.GetHandle())
-                save_dc.DeleteDC()
-                mfc_dc.DeleteDC()
-                win32gui.ReleaseDC(hwnd, hwnd_dc)
-                
-                # OpenCV 형식으로 변환
-                return np.array(img)
+                # DC 방식 (윈도우별 캡처 세션에서 GDI 리소스 재사용)
+                if session is None:
+                    session = WindowUtils.get_capture_session(hwnd)
+                return session.capture(out, rect=rect, client_only=client_only)
         
         except Exception as e:
             print(f"캡처 오류: {e}")
             return None
 
+    @staticmethod
+    def get_capture_session(hwnd):
+        """
+        윈도우별 캡처 세션 가져오기 (없으면 생성)
+        
+        Args:
+            hwnd (int): 윈도우 핸들
+            
+        Returns:
+            CaptureSession: 캡처 세션
+        """
+        with WindowUtils._capture_sessions_lock:
+            session = WindowUtils._capture_sessions.get(hwnd)
+            if session is None or session.closed:
+                session = CaptureSession(hwnd)
+                WindowUtils._capture_sessions[hwnd] = session
+            return session
+    
+    @staticmethod
+    def close_capture_session(hwnd=None):
+        """
+        캡처 세션의 GDI 리소스 해제
+        
+        Args:
+            hwnd (int, optional): 윈도우 핸들 (None이면 모든 세션)
+            
+        Returns:
+            int: 닫은 세션 수
+        """
+        with WindowUtils._capture_sessions_lock:
+            if hwnd is None:
+                sessions = list(WindowUtils._capture_sessions.values())
+                WindowUtils._capture_sessions.clear()
+            else:
+                session = WindowUtils._capture_sessions.pop(hwnd, None)
+                sessions = [session] if session else []
+        
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                print(f"캡처 세션 해제 오류: {e}")
+        return len(sessions)
+    
     @staticmethod
     def _is_pyautogui_available():
         """PyAutoGUI 라이브러리 사용 가능 여부 확인"""
@@ -18,6 +18,7 @@ from PIL import Image, ImageTk
 
 from core.window_utils import WindowUtils
 from core.image_recognition import ImageRecognition
+from core.template_registry import TemplateRegistry
 from core.action_executor import ActionExecutor
 from monitoring.program_monitor import ProgramMonitor
 from monitoring.monitor_manager import MonitorManager
@@ -50,7 +51,8 @@ class AutomationGUI(tk.Tk):
         # 컴포넌트 초기화
         self.config_manager = ConfigManager(self.config_dir)
         self.monitor_manager = MonitorManager(self.config_dir, self.resources_dir)
-        self.image_recognition = ImageRecognition(self.templates_dir)
+        self.image_recognition = ImageRecognition(
+            self.templates_dir, registry=TemplateRegistry.shared(self.templates_dir))
         
         # 데이터
         self.active_programs = {}  # 프로그램 이름 -> ProgramMonitor 객체
@@ -252,7 +254,9 @@ class AutomationGUI(tk.Tk):
                 
                 # 모니터 생성 및 시작
                 self.auto_click_monitor = AutoClickMonitor(
-                    self, self.screenshot_hwnd, template_name, interval, threshold
+                    self, self.screenshot_hwnd, template_name, interval, threshold,
+                    change_detection=self.auto_click_change_detection(),
+                    adaptive_interval=self.auto_click_adaptive_interval()
                 )
                 success = self.auto_click_monitor.start()
                 
@@ -265,6 +269,24 @@ class AutomationGUI(tk.Tk):
                 messagebox.showerror("오류", f"자동 검색 시작 오류: {str(e)}")
                 self.status_var.set(f"오류: {str(e)}")
                 
+    def auto_click_change_detection(self):
+        """
+        자동 클릭 화면 변화 검출 설정 (시스템 설정 auto_click_change_detection)
+        
+        Returns:
+            dict: 화면 변화 검출 설정 (없으면 None - 매 주기 검색)
+        """
+        return self.config_manager.load_system_config().get('auto_click_change_detection')
+    
+    def auto_click_adaptive_interval(self):
+        """
+        자동 클릭 적응형 검색 간격 설정 (시스템 설정 auto_click_adaptive_interval)
+        
+        Returns:
+            dict: 적응형 간격 설정 (없으면 None - 고정 간격)
+        """
+        return self.config_manager.load_system_config().get('auto_click_adaptive_interval')
+    
     def test_histogram_template(self):
         """히스토그램 기반 템플릿 테스트 (회전/반전에 강인)"""
         selection = self.template_listbox.curselection()
@@ -726,6 +748,9 @@ class AutomationGUI(tk.Tk):
             template_path = os.path.join(self.templates_dir, f"{template_name}.png")
             cv2.imwrite(template_path, template)
             
+            # 실행 중인 모니터도 바로 사용할 수 있도록 공유 템플릿 저장소에 반영
+            self.image_recognition.add_template(template_name, template.copy())
+            
             # 템플릿 목록 업데이트
             self.update_template_list()
             
@@ -752,6 +777,7 @@ class AutomationGUI(tk.Tk):
         template_path = os.path.join(self.templates_dir, f"{template_name}.png")
         if os.path.exists(template_path):
             os.remove(template_path)
+            self.image_recognition.remove_template(template_name)
             
             # 템플릿 목록 업데이트
             self.update_template_list()
@@ -818,12 +844,8 @@ class AutomationGUI(tk.Tk):
             # 인식된 위치 클릭 (선택 사항)
             if messagebox.askyesno("클릭", "인식된 위치를 클릭하시겠습니까?"):
                 try:
-                    # 윈도우 위치
-                    left, top, right, bottom = win32gui.GetWindowRect(self.screenshot_hwnd)
-                    
-                    # 화면 좌표 계산
-                    screen_x = left + center_x
-                    screen_y = top + center_y
+                    # 화면 좌표 계산 (캡처 이미지는 클라이언트 영역 기준)
+                    screen_x, screen_y = WindowUtils.client_to_screen(self.screenshot_hwnd, center_x, center_y)
                     
                     # 윈도우 활성화
                     win32gui.SetForegroundWindow(self.screenshot_hwnd)
@@ -1061,17 +1083,13 @@ class AutomationGUI(tk.Tk):
         
         try:
             if action_type == "클릭":
-                # 윈도우 정보 얻기
-                left, top, right, bottom = win32gui.GetWindowRect(self.screenshot_hwnd)
-                
                 # 좌표 계산
                 try:
                     x = int(float(self.click_x_var.get()))
                     y = int(float(self.click_y_var.get()))
                     
-                    # 화면 좌표로 변환
-                    screen_x = left + x
-                    screen_y = top + y
+                    # 화면 좌표로 변환 (클라이언트 영역 기준, 모니터링 시 클릭과 동일)
+                    screen_x, screen_y = WindowUtils.client_to_screen(self.screenshot_hwnd, x, y)
                 except ValueError:
                     messagebox.showerror("오류", "유효한 좌표 값을 입력하세요.")
                     return
@@ -1237,9 +1255,9 @@ class AutomationGUI(tk.Tk):
             window_title = win32gui.GetWindowText(self.screenshot_hwnd)
             print(f"타겟 윈도우: '{window_title}' (핸들: {self.screenshot_hwnd})")
             
-            # 윈도우 위치 가져오기
-            left, top, right, bottom = win32gui.GetWindowRect(self.screenshot_hwnd)
-            print(f"윈도우 위치: ({left}, {top}, {right}, {bottom}), 크기: {right-left}x{bottom-top}")
+            # 클라이언트 영역 위치 가져오기 (캡처 이미지 좌표 기준)
+            left, top, right, bottom = WindowUtils.get_client_rect(self.screenshot_hwnd)
+            print(f"클라이언트 영역: ({left}, {top}, {right}, {bottom}), 크기: {right-left}x{bottom-top}")
             
             # 스크린샷 캡처 (윈도우 활성화 없이)
             screenshot = WindowUtils.capture_window(self.screenshot_hwnd)
@@ -1504,7 +1522,9 @@ class AutomationGUI(tk.Tk):
                 
                 # 모니터 생성 및 시작
                 self.auto_click_monitor = AutoClickMonitor(
-                    self, self.screenshot_hwnd, template_name, interval, threshold
+                    self, self.screenshot_hwnd, template_name, interval, threshold,
+                    change_detection=self.auto_click_change_detection(),
+                    adaptive_interval=self.auto_click_adaptive_interval()
                 )
                 success = self.auto_click_monitor.start()
                 
@@ -28,6 +28,18 @@ def parse_arguments():
     parser.add_argument('--add-program', dest='new_program',
                         help='새 프로그램 설정 추가')
     
+    parser.add_argument('--record', dest='record_dir',
+                        help='모니터링 세션을 기록할 디렉토리 (프레임, 윈도우 위치, 실행된 액션)')
+    
+    parser.add_argument('--replay', dest='replay_path',
+                        help='기록된 세션을 최대 속도로 재생하여 성능 측정 (액션은 실행하지 않음)')
+    
+    parser.add_argument('--program', dest='program_name',
+                        help='재생 시 기록 당시 설정 대신 사용할 프로그램 설정 이름')
+    
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='재생 반복 횟수 (기본: 1)')
+    
     return parser.parse_args()
 
 def initialize_config(config_dir):
@@ -81,6 +93,39 @@ def add_program_config(config_dir, program_name):
         print(f"프로그램 설정 추가 중 오류가 발생했습니다: {program_name}")
         return False
 
+def replay_session(config_dir, resources_dir, replay_path, program_name=None, repeat=1):
+    """
+    기록된 세션 재생 및 성능 보고
+    
+    Args:
+        config_dir (str): 설정 디렉토리 경로
+        resources_dir (str): 리소스 디렉토리 경로
+        replay_path (str): 기록 디렉토리 경로
+        program_name (str, optional): 사용할 프로그램 설정 이름 (기본: 기록 당시 설정)
+        repeat (int): 반복 횟수
+        
+    Returns:
+        bool: 성공 여부
+    """
+    from monitoring.replay_runner import ReplayRunner
+    
+    program_config = None
+    if program_name:
+        program_config = ConfigManager(config_dir).load_program_config(program_name)
+        if not program_config:
+            print(f"프로그램 설정을 찾을 수 없습니다: {program_name}")
+            return False
+    
+    try:
+        runner = ReplayRunner(replay_path, resources_dir, program_config, repeat)
+    except (OSError, ValueError) as e:
+        print(f"기록을 열 수 없습니다: {e}")
+        return False
+    
+    print(f"세션 재생: {replay_path} (프레임 {len(runner.recording)}개, {runner.repeat}회)")
+    ReplayRunner.print_report(runner.run())
+    return True
+
 def main():
     """메인 함수"""
     args = parse_arguments()
@@ -99,6 +144,12 @@ def main():
         add_program_config(config_dir, args.new_program)
         return
     
+    # 기록 재생 (벤치마크) 모드
+    if args.replay_path:
+        replay_session(config_dir, resources_dir, os.path.abspath(args.replay_path),
+                       args.program_name, args.repeat)
+        return
+    
     print("윈도우 멀티 프로그램 자동화 시스템 시작...")
     print(f"설정 디렉토리: {config_dir}")
     print(f"리소스 디렉토리: {resources_dir}")
@@ -118,7 +169,8 @@ def main():
         time.sleep(startup_delay)
     
     # 모니터 관리자 초기화
-    monitor_manager = MonitorManager(config_dir, resources_dir)
+    record_dir = os.path.abspath(args.record_dir) if args.record_dir else None
+    monitor_manager = MonitorManager(config_dir, resources_dir, record_dir)
     
     # 모니터 생성 및 시작
     num_monitors = monitor_manager.create_monitors()
@@ -11,6 +11,9 @@ import ctypes.wintypes as wintypes
 import pyautogui
 import pydirectinput
 from core.window_utils import WindowUtils
+from core.frame_change import FrameChangeDetector
+from core.adaptive_interval import AdaptiveInterval
+from core.capture_backends import WindowCaptureBackend
 import subprocess
 import shutil
 import logging
@@ -71,7 +74,8 @@ _classdd = ClassDD(DD_DLL_PATH)
 class AutoClickMonitor:
     """주기적으로 이미지를 찾아 클릭하는 모니터링 클래스"""
     
-    def __init__(self, gui, hwnd, template_name, interval=5.0, threshold=0.7):
+    def __init__(self, gui, hwnd, template_name, interval=5.0, threshold=0.7, change_detection=None,
+                 capture_backend=None, adaptive_interval=None):
         """
         Args:
             gui: GUI 객체 참조
@@ -79,6 +83,9 @@ class AutoClickMonitor:
             template_name: 찾을 템플릿 이미지 이름
             interval: 검색 간격 (초)
             threshold: 매칭 임계값
+            change_detection: 화면 변화 검출 설정 (예: {'enabled': True, 'max_skip_age': 30.0})
+            capture_backend: 캡처 백엔드 (기본: 실제 윈도우 캡처)
+            adaptive_interval: 적응형 검색 간격 설정 (예: {'enabled': True, 'min': 0.2, 'max': 10.0})
         """
         self.gui = gui
         self.hwnd = hwnd
@@ -87,6 +94,18 @@ class AutoClickMonitor:
         self.threshold = threshold
         self.running = False
         self.thread = None
+        
+        # 대기 중인 루프를 즉시 깨우기 위한 중지 이벤트
+        self._stop_event = threading.Event()
+        
+        # 화면 변화가 없으면 이전 인식 결과 재사용
+        self.change_detector = FrameChangeDetector.from_config(change_detection)
+        self.last_result = (False, (0, 0, 0, 0), 0.0)
+        
+        self.capture_backend = capture_backend or WindowCaptureBackend()
+        
+        # 이미지 발견, 화면 변화가 있으면 짧게, 없으면 점점 길게 검색 (설정 시)
+        self.adaptive_interval = AdaptiveInterval.from_config(adaptive_interval, interval)
     
     def start(self):
         """모니터링 시작"""
@@ -94,43 +113,68 @@ class AutoClickMonitor:
             return False  # 이미 실행 중
         
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._monitoring_loop)
         self.thread.daemon = True  # 메인 프로그램 종료 시 함께 종료
         self.thread.start()
         return True
     
     def stop(self):
-        """모니터링 중지"""
+        """모니터링 중지 (대기 중인 루프를 즉시 깨움)"""
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(2.0)  # 최대 2초 대기
+        self.capture_backend.close()
+    
+    def _next_interval(self, active):
+        """
+        다음 검사까지 대기할 간격
+        
+        Args:
+            active: 이번 검사에서 이미지를 발견했거나 화면이 바뀌었는지 여부
+        """
+        if self.adaptive_interval is None:
+            return self.interval
+        return self.adaptive_interval.update(active)
     
     def _monitoring_loop(self):
         """모니터링 메인 루프"""
         while self.running:
+            active = False
             try:
-                # 윈도우가 유효한지 확인
-                if not win32gui.IsWindow(self.hwnd):
-                    print(f"윈도우가 더 이상 존재하지 않음: {self.hwnd}")
-                    self.running = False
-                    break
-                
-                # 윈도우 제목 확인 (디버깅)
-                window_title = win32gui.GetWindowText(self.hwnd)
-                print(f"모니터링: '{window_title}' (핸들: {self.hwnd})")
+                if self.capture_backend.requires_window:
+                    # 윈도우가 유효한지 확인
+                    if not win32gui.IsWindow(self.hwnd):
+                        print(f"윈도우가 더 이상 존재하지 않음: {self.hwnd}")
+                        self.running = False
+                        break
+                    
+                    # 윈도우 제목 확인 (디버깅)
+                    window_title = win32gui.GetWindowText(self.hwnd)
+                    print(f"모니터링: '{window_title}' (핸들: {self.hwnd})")
                 
                 # 스크린샷 캡처 (윈도우 활성화 없이)
-                screenshot = WindowUtils.capture_window(self.hwnd)
+                screenshot = self.capture_backend.capture(self.hwnd)
                 if screenshot is None:
+                    if self.capture_backend.finished:
+                        self.running = False
+                        break
                     print("스크린샷 캡처 실패")
-                    time.sleep(self.interval)
+                    self._stop_event.wait(self.interval)
                     continue
                 
-                # 이미지 인식
-                image_recognition = self.gui.image_recognition
-                found, position, confidence = image_recognition.find_template(
-                    screenshot, self.template_name, self.threshold
-                )
+                # 이미지 인식 (화면 변화가 없으면 이전 결과 재사용)
+                if self.change_detector and not self.change_detector.should_evaluate(screenshot):
+                    found, position, confidence = self.last_result
+                else:
+                    image_recognition = self.gui.image_recognition
+                    found, position, confidence = image_recognition.find_template(
+                        screenshot, self.template_name, self.threshold
+                    )
+                    self.last_result = (found, position, confidence)
+                    if self.change_detector:
+                        active = self.change_detector.last_difference > self.change_detector.threshold
                 
                 if found:
                     # 이미지 발견 정보
@@ -139,18 +183,18 @@ class AutoClickMonitor:
                     center_y = y + h // 2
                     print(f"[자동] 이미지 발견: {self.template_name}, 위치=({x},{y}), 신뢰도={confidence:.4f}")
                     
-                    # 윈도우 위치 가져오기
-                    left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
-                    
-                    # 화면 절대 좌표 계산
-                    screen_x = left + center_x
-                    screen_y = top + center_y
+                    # 화면 절대 좌표 계산 (캡처 영역 기준 좌표 - 기본은 클라이언트 영역 원점)
+                    screen_x, screen_y = self.capture_backend.to_screen(self.hwnd, center_x, center_y)
                     
                     # 클릭 시도 (여러 방법)
                     self._try_click_methods(center_x, center_y, screen_x, screen_y)
+                    active = True
                     
-                    # 클릭 후 더 긴 간격으로 대기 (옵션)
-                    time.sleep(self.interval)
+                    # 클릭 후 더 긴 간격으로 대기 (옵션, 적응형 간격이면 최소 간격)
+                    if self.adaptive_interval is None:
+                        self._stop_event.wait(self.interval)
+                    else:
+                        self._stop_event.wait(self.adaptive_interval.min_interval)
                 else:
                     print(f"[자동] 이미지를 찾을 수 없음: {self.template_name}")
             
@@ -160,7 +204,7 @@ class AutoClickMonitor:
                 print(f"[자동] 모니터링 오류: {str(e)}")
             
             # 다음 검사까지 대기
-            time.sleep(self.interval)
+            self._stop_event.wait(self._next_interval(active))
     
 
     def _try_click_methods(self, center_x, center_y, screen_x, screen_y):
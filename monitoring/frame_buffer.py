@@ -0,0 +1,238 @@
+# monitoring/frame_buffer.py
+
+import threading
+import time
+
+class FrameSlot:
+    """링 버퍼의 프레임 칸 (이미지 버퍼는 다음 캡처에 재사용)"""
+
+    __slots__ = ('image', 'seq', 'timestamp', 'origin', 'frame_size')
+
+    def __init__(self):
+        self.image = None          # 캡처된 BGR 이미지
+        self.seq = 0               # 프레임 일련번호 (1부터 증가)
+        self.timestamp = 0.0       # 캡처 시각 (time.monotonic 기준)
+        self.origin = (0, 0)       # 부분 캡처 시 이미지 좌상단의 프레임 내 위치
+        self.frame_size = None     # 전체 프레임 (w, h) 크기
+
+    @property
+    def age(self):
+        """캡처 후 경과 시간 (초)"""
+        return time.monotonic() - self.timestamp
+
+class FrameRingBuffer:
+    """
+    최신 프레임 우선 링 버퍼
+
+    생산자(캡처 스레드)는 소비자가 읽고 있지 않은 칸에 기록하고, 소비자(인식 루프)는
+    항상 가장 최근에 게시된 프레임을 가져갑니다. 소비되기 전에 새 프레임으로 대체된
+    프레임은 버려진 프레임으로 집계됩니다.
+    """
+
+    def __init__(self, capacity=3):
+        """
+        링 버퍼 초기화
+
+        Args:
+            capacity (int): 칸 수 (기록 중, 게시됨, 읽는 중 칸이 겹치지 않도록 최소 3)
+        """
+        if capacity < 3:
+            raise ValueError(f"프레임 링 버퍼 크기는 3 이상이어야 함: {capacity}")
+
+        self._slots = [FrameSlot() for _ in range(capacity)]
+        self._cond = threading.Condition()
+        self._latest = None     # 게시되었지만 아직 소비되지 않은 칸 번호
+        self._reading = None    # 소비자가 사용 중인 칸 번호
+        self._next = 0          # 다음 기록 후보 칸 번호
+        self._seq = 0
+        self.closed = False
+
+        # 통계
+        self.produced = 0       # 게시된 프레임 수
+        self.consumed = 0       # 소비자가 가져간 프레임 수
+        self.dropped = 0        # 소비되기 전에 새 프레임으로 대체된 프레임 수
+
+    @property
+    def capacity(self):
+        """칸 수"""
+        return len(self._slots)
+
+    def writable_slot(self):
+        """
+        생산자가 기록할 칸 가져오기 (게시된 칸, 읽는 중인 칸은 제외)
+
+        Returns:
+            FrameSlot: 기록할 칸 (이전 image 버퍼를 캡처 out으로 재사용 가능)
+        """
+        with self._cond:
+            for _ in range(len(self._slots)):
+                index = self._next
+                self._next = (self._next + 1) % len(self._slots)
+                if index != self._latest and index != self._reading:
+                    return self._slots[index]
+        # capacity >= 3이므로 도달하지 않음
+        raise RuntimeError("기록 가능한 프레임 칸 없음")
+
+    def publish(self, slot, image, origin=(0, 0), frame_size=None, timestamp=None):
+        """
+        기록을 마친 칸을 최신 프레임으로 게시
+
+        Args:
+            slot (FrameSlot): writable_slot()으로 받은 칸
+            image (numpy.ndarray): 캡처된 이미지
+            origin (tuple): 부분 캡처 시 이미지 좌상단의 프레임 내 (x, y) 위치
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기
+            timestamp (float, optional): 캡처 시각 (기본: 현재 time.monotonic)
+        """
+        with self._cond:
+            if self._latest is not None:
+                # 소비자가 가져가기 전에 더 새로운 프레임이 도착
+                self.dropped += 1
+
+            self._seq += 1
+            slot.image = image
+            slot.seq = self._seq
+            slot.timestamp = time.monotonic() if timestamp is None else timestamp
+            slot.origin = tuple(origin)
+            slot.frame_size = frame_size
+
+            self._latest = self._slots.index(slot)
+            self.produced += 1
+            self._cond.notify_all()
+
+    def latest(self, timeout=None):
+        """
+        가장 최근 프레임 가져오기 (새 프레임이 없으면 대기)
+
+        반환된 칸은 다음 latest() 호출 전까지 생산자가 덮어쓰지 않습니다.
+
+        Args:
+            timeout (float, optional): 최대 대기 시간 (초, None이면 무한 대기)
+
+        Returns:
+            FrameSlot: 최신 프레임 칸 (시간 초과 또는 버퍼가 닫히면 None)
+        """
+        with self._cond:
+            self._reading = None
+            if not self._cond.wait_for(lambda: self._latest is not None or self.closed, timeout):
+                return None
+            if self._latest is None:
+                return None
+
+            self._reading, self._latest = self._latest, None
+            self.consumed += 1
+            return self._slots[self._reading]
+
+    def close(self):
+        """버퍼 닫기 (대기 중인 소비자를 깨움)"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        버퍼 통계
+
+        Returns:
+            dict: produced, consumed, dropped 프레임 수
+        """
+        with self._cond:
+            return {'produced': self.produced, 'consumed': self.consumed, 'dropped': self.dropped}
+
+class CaptureThread(threading.Thread):
+    """캡처 함수를 주기적으로 호출해 링 버퍼를 채우는 생산자 스레드"""
+
+    def __init__(self, capture_func, buffer, interval=0.0, finished_func=None, name=None):
+        """
+        캡처 스레드 초기화
+
+        Args:
+            capture_func (callable): capture_func(out) -> (image, origin, frame_size) 또는 None
+                (out은 재사용할 이미지 버퍼, None 반환은 캡처 실패)
+            buffer (FrameRingBuffer): 프레임을 게시할 링 버퍼
+            interval (float): 캡처 간격 (초, 0이면 가능한 빠르게)
+            finished_func (callable, optional): 캡처 실패 시 소스가 끝났는지 확인하는 함수
+            name (str, optional): 스레드 이름
+        """
+        super(CaptureThread, self).__init__(name=name)
+        self.daemon = True
+
+        self.capture_func = capture_func
+        self.buffer = buffer
+        self.interval = interval
+        self.finished_func = finished_func
+
+        self.running = False
+        self.finished = False   # 캡처 소스가 끝남 (반복하지 않는 리플레이 등)
+        self.failures = 0       # 캡처 실패 횟수
+        
+        # 대기 중인 루프를 즉시 깨우기 위한 이벤트 (중지 / 일시 정지 해제)
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+    @property
+    def paused(self):
+        """일시 정지 여부"""
+        return not self._resume_event.is_set()
+
+    @paused.setter
+    def paused(self, value):
+        if value:
+            self.pause()
+        else:
+            self.resume()
+
+    def run(self):
+        """캡처 루프"""
+        # 시작 전에 stop()이 호출되었으면 바로 종료
+        self.running = not self._stop_event.is_set()
+
+        while self.running:
+            if self.paused:
+                # 재개 또는 중지될 때까지 대기
+                self._resume_event.wait()
+                continue
+
+            started = time.monotonic()
+            slot = self.buffer.writable_slot()
+
+            try:
+                captured = self.capture_func(slot.image)
+            except Exception as e:
+                print(f"캡처 스레드 오류: {e}")
+                captured = None
+
+            if captured is None:
+                if self.finished_func and self.finished_func():
+                    # 더 이상 캡처할 프레임 없음
+                    self.finished = True
+                    break
+                self.failures += 1
+            else:
+                image, origin, frame_size = captured
+                self.buffer.publish(slot, image, origin, frame_size, timestamp=started)
+
+            # 남은 캡처 간격만큼 대기 (캡처에 걸린 시간 제외)
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._stop_event.wait(remaining)
+            elif captured is None:
+                self._stop_event.wait(0.01)  # 실패가 반복될 때 바쁜 대기 방지
+
+        self.running = False
+        self.buffer.close()
+
+    def pause(self):
+        """캡처 일시 정지"""
+        self._resume_event.clear()
+
+    def resume(self):
+        """캡처 재개"""
+        self._resume_event.set()
+
+    def stop(self):
+        """캡처 중지 (대기 중인 루프를 즉시 깨움)"""
+        self.running = False
+        self._stop_event.set()
+        self._resume_event.set()
@@ -4,25 +4,44 @@ import os
 import yaml
 import time
 from .program_monitor import ProgramMonitor
+from .monitor_scheduler import MonitorScheduler
+from .monitor_process import MonitorProcess, ProcessMonitorHandle
+from core.template_pack import TemplatePack
 
 class MonitorManager:
     """여러 프로그램 모니터 생성 및 관리"""
     
-    def __init__(self, config_dir, resources_dir=None):
+    # 모든 모니터 중지 시 종료를 기다리는 최대 시간 (초, 모니터 전체 합계)
+    STOP_TIMEOUT = 5.0
+    
+    def __init__(self, config_dir, resources_dir=None, record_dir=None):
         """
         모니터 관리자 초기화
         
         Args:
             config_dir (str): 설정 파일 디렉토리
             resources_dir (str, optional): 리소스 디렉토리
+            record_dir (str, optional): 지정하면 모든 모니터의 세션을 이 디렉토리에 기록
         """
         self.config_dir = config_dir
         self.resources_dir = resources_dir
+        self.record_dir = record_dir
         self.monitors = {}  # 이름 -> 모니터 객체
         self.system_config = None
         
         # 시스템 설정 로드
         self.load_system_config()
+        
+        # 실행 방식 (thread: 모니터별 스레드, scheduler: 공용 스케줄러와 작업 스레드 풀,
+        # process: 모니터 그룹별 작업 프로세스)
+        self.execution_mode = self.system_config.get('execution_mode', 'thread')
+        self.scheduler = None
+        self.processes = []  # 실행 중인 작업 프로세스 (process 실행 방식)
+        if self.execution_mode == 'scheduler':
+            self.scheduler = MonitorScheduler(self._scheduler_workers())
+        elif self.execution_mode not in ('thread', 'process'):
+            print(f"알 수 없는 실행 방식: {self.execution_mode}, 모니터별 스레드 사용")
+            self.execution_mode = 'thread'
     
     def load_system_config(self):
         """시스템 설정 파일 로드"""
@@ -38,6 +57,36 @@ class MonitorManager:
         else:
             print("시스템 설정 파일을 찾을 수 없습니다.")
             self.system_config = {}
+        
+        if not isinstance(self.system_config, dict):
+            self.system_config = {}
+    
+    def _scheduler_workers(self):
+        """
+        스케줄러 작업 스레드 수 (scheduler_workers 설정, 없으면 최대 모니터 수와 CPU 코어 수 중 작은 값)
+        
+        Returns:
+            int: 작업 스레드 수
+        """
+        workers = self.system_config.get('scheduler_workers')
+        if workers:
+            return max(1, int(workers))
+        
+        max_monitors = self.system_config.get('max_monitors', 10)
+        return max(1, min(max_monitors, os.cpu_count() or 1))
+    
+    def _process_count(self, monitor_count):
+        """
+        작업 프로세스 수 (process_count 설정, 없으면 CPU 코어 수, 모니터 수를 넘지 않음)
+        
+        Args:
+            monitor_count (int): 실행할 모니터 수
+        
+        Returns:
+            int: 작업 프로세스 수
+        """
+        processes = self.system_config.get('process_count') or os.cpu_count() or 1
+        return max(1, min(int(processes), monitor_count))
     
     def load_program_configs(self):
         """
@@ -83,12 +132,26 @@ class MonitorManager:
             
             try:
                 # 이미 존재하는 모니터인지 확인
-                if name in self.monitors and self.monitors[name].is_alive():
+                if name in self.monitors and self.monitors[name].is_active():
                     print(f"모니터가 이미 실행 중입니다: {name}")
                     continue
                 
+                # 세션 기록 디렉토리가 지정되면 프로그램 설정보다 우선
+                if self.record_dir:
+                    recording = dict(config.get('recording') or {}, enabled=True, directory=self.record_dir)
+                    config = dict(config, recording=recording)
+                
+                # 작업 프로세스에서 실행할 모니터는 시작할 때 프로세스 안에서 생성
+                if self.execution_mode == 'process':
+                    self.monitors[name] = ProcessMonitorHandle(config)
+                    count += 1
+                    continue
+                
                 # 새 모니터 생성
                 monitor = ProgramMonitor(config, self.resources_dir)
+                if self.scheduler:
+                    # 스케줄러 작업 스레드 안에서 다시 병렬 매칭 스레드를 만들지 않음
+                    monitor.image_recognition.max_workers = 1
                 self.monitors[name] = monitor
                 count += 1
             except Exception as e:
@@ -103,6 +166,11 @@ class MonitorManager:
         Returns:
             int: 시작된 모니터 수
         """
+        if self.scheduler:
+            return self._start_scheduled_monitors()
+        if self.execution_mode == 'process':
+            return self._start_process_monitors()
+        
         count = 0
         
         for name, monitor in self.monitors.items():
@@ -116,6 +184,75 @@ class MonitorManager:
         
         return count
     
+    def _start_scheduled_monitors(self):
+        """
+        스케줄러에 모니터 등록 (첫 실행 시각을 모니터링 간격 안에서 고르게 분산)
+        
+        Returns:
+            int: 시작된 모니터 수
+        """
+        pending = [(name, monitor) for name, monitor in self.monitors.items()
+                   if not monitor.is_active()]
+        count = 0
+        
+        self.scheduler.start()
+        for index, (name, monitor) in enumerate(pending):
+            try:
+                delay = monitor.monitoring_interval * index / len(pending)
+                self.scheduler.add(monitor, delay)
+                count += 1
+                print(f"모니터 시작: {name}")
+            except Exception as e:
+                print(f"모니터 시작 오류 {name}: {e}")
+        
+        if count:
+            print(f"스케줄러 실행: 모니터 {self.scheduler.monitor_count}개, 작업 스레드 {self.scheduler.max_workers}개")
+        return count
+    
+    def _start_process_monitors(self):
+        """
+        모니터를 작업 프로세스 그룹으로 나누어 시작
+        
+        템플릿 팩을 미리 빌드해 두어 모든 작업 프로세스가 같은 파일을
+        읽기 전용으로 메모리 매핑하도록 합니다.
+        
+        Returns:
+            int: 시작된 모니터 수
+        """
+        pending = [monitor for monitor in self.monitors.values() if not monitor.is_active()]
+        if not pending:
+            return 0
+        
+        templates_dir = os.path.join(self.resources_dir, 'images') if self.resources_dir else None
+        if templates_dir and os.path.isdir(templates_dir):
+            TemplatePack.load_or_build(templates_dir)
+        
+        # 끝난 작업 프로세스 정리
+        self.processes = [process for process in self.processes if process.is_alive()]
+        
+        # 모니터를 프로세스 수만큼 번갈아 나눔
+        groups = [[] for _ in range(self._process_count(len(pending)))]
+        for index, monitor in enumerate(pending):
+            groups[index % len(groups)].append(monitor)
+        
+        count = 0
+        for index, group in enumerate(groups):
+            process = MonitorProcess([monitor.program_config for monitor in group], self.resources_dir,
+                                     name=f"monitor-process-{len(self.processes) + 1}")
+            try:
+                process.start()
+            except Exception as e:
+                print(f"작업 프로세스 시작 오류 {process.name}: {e}")
+                continue
+            
+            self.processes.append(process)
+            for monitor in group:
+                monitor.attach(process)
+                count += 1
+                print(f"모니터 시작: {monitor.program_name} ({process.name})")
+        
+        return count
+    
     def stop_all_monitors(self):
         """
         모든 모니터 중지
@@ -124,18 +261,47 @@ class MonitorManager:
             int: 중지된 모니터 수
         """
         count = 0
+        stopping = []
+        
+        # 모든 모니터에 먼저 중지를 알림 (대기 중인 루프는 즉시 깨어남)
+        # 작업 프로세스는 모니터마다 명령을 주고받지 않고 프로세스마다 종료 명령 하나만 보냄
+        for process in self.processes:
+            process.request_shutdown()
         
         for name, monitor in self.monitors.items():
-            if monitor.is_alive():
+            if monitor.is_active():
                 try:
-                    monitor.stop()
-                    # 스레드 종료 대기 (옵션, 필요시)
-                    monitor.join(1.0)
+                    if isinstance(monitor, ProcessMonitorHandle):
+                        monitor.stop(notify=False)
+                    else:
+                        monitor.stop()
+                    stopping.append((name, monitor))
                     count += 1
                     print(f"모니터 중지: {name}")
                 except Exception as e:
                     print(f"모니터 중지 오류 {name}: {e}")
         
+        # 스레드, 작업 프로세스 종료 대기 (모두 같은 제한 시간을 나누어 사용)
+        deadline = time.monotonic() + self.STOP_TIMEOUT
+        for name, monitor in stopping:
+            if isinstance(monitor, ProgramMonitor) and monitor.is_alive():
+                monitor.join(max(0.0, deadline - time.monotonic()))
+                if monitor.is_alive():
+                    print(f"모니터가 제한 시간 안에 종료되지 않음: {name}")
+        
+        if self.scheduler:
+            self.scheduler.stop()
+        
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()), terminate=False)
+        
+        # 제한 시간 안에 끝나지 않은 프로세스는 한꺼번에 강제 종료한 뒤 정리
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(1.0, terminate=False)
+        self.processes = []
+        
         return count
     
     def pause_all_monitors(self):
@@ -148,7 +314,7 @@ class MonitorManager:
         count = 0
         
         for name, monitor in self.monitors.items():
-            if monitor.is_alive() and not monitor.paused:
+            if monitor.is_active() and not monitor.paused:
                 try:
                     monitor.pause()
                     count += 1
@@ -168,9 +334,12 @@ class MonitorManager:
         count = 0
         
         for name, monitor in self.monitors.items():
-            if monitor.is_alive() and monitor.paused:
+            if monitor.is_active() and monitor.paused:
                 try:
                     monitor.resume()
+                    if self.scheduler:
+                        # 다음 예약 시각을 기다리지 않고 바로 재개
+                        self.scheduler.wake(monitor)
                     count += 1
                     print(f"모니터 재개: {name}")
                 except Exception as e:
@@ -187,11 +356,21 @@ class MonitorManager:
         """
         status = {}
         
+        # 작업 프로세스에서 실행 중인 모니터 상태 갱신 (프로세스마다 한 번 질의)
+        if self.execution_mode == 'process':
+            reported = {}
+            for process in self.processes:
+                reported.update(process.status())
+            for name, monitor in self.monitors.items():
+                if monitor.process is not None:
+                    monitor.update(reported.get(name))
+        
         for name, monitor in self.monitors.items():
+            alive = monitor.is_active()
             status[name] = {
-                'alive': monitor.is_alive(),
-                'paused': monitor.paused if monitor.is_alive() else None,
-                'hwnd': monitor.hwnd if monitor.is_alive() else None,
+                'alive': alive,
+                'paused': monitor.paused if alive else None,
+                'hwnd': monitor.hwnd if alive else None,
                 'window_title': monitor.window_title
             }
         
@@ -0,0 +1,311 @@
+# monitoring/monitor_process.py
+
+import itertools
+import multiprocessing
+import threading
+import time
+
+def run_monitor_worker(program_configs, resources_dir, conn):
+    """
+    작업 프로세스 진입점: 프로그램 모니터 그룹을 실행하고 부모 프로세스의 명령 처리
+
+    프로세스 안에서는 모니터들을 MonitorScheduler(작업 스레드 1개)로 실행하므로
+    프로세스마다 인식 작업은 코어 하나를 사용합니다.
+
+    명령 형식: (요청 번호, 명령, 모니터 이름) - 명령: pause, resume, stop, status, shutdown
+    응답 형식: (요청 번호, 결과)
+
+    Args:
+        program_configs (list): 이 프로세스가 실행할 프로그램 설정 목록
+        resources_dir (str): 리소스 디렉토리 (템플릿 팩은 모든 프로세스가 읽기 전용으로 매핑)
+        conn (multiprocessing.connection.Connection): 부모 프로세스와의 연결
+    """
+    from .program_monitor import ProgramMonitor
+    from .monitor_scheduler import MonitorScheduler
+
+    monitors = {}
+    for config in program_configs:
+        name = config.get('name')
+        try:
+            monitor = ProgramMonitor(config, resources_dir)
+            monitor.image_recognition.max_workers = 1
+            monitors[name] = monitor
+        except Exception as e:
+            print(f"모니터 생성 오류 {name}: {e}")
+
+    scheduler = MonitorScheduler(max_workers=1)
+    scheduler.start()
+    for index, monitor in enumerate(monitors.values()):
+        scheduler.add(monitor, monitor.monitoring_interval * index / len(monitors))
+
+    def status():
+        return {name: {
+            'alive': monitor.is_active(),
+            'paused': monitor.paused,
+            'hwnd': monitor.hwnd,
+            'window_title': monitor.window_title,
+        } for name, monitor in monitors.items()}
+
+    try:
+        while scheduler.monitor_count > 0:
+            try:
+                if not conn.poll(0.2):
+                    continue
+                request_id, command, name = conn.recv()
+            except (EOFError, OSError):
+                # 부모 프로세스 종료
+                break
+
+            # 이름이 없으면 모든 모니터, 이 프로세스에 없는 이름(생성 실패 등)이면 대상 없음
+            if name is None:
+                targets = list(monitors.values())
+            else:
+                targets = [monitors[name]] if name in monitors else []
+            result = True
+            if not targets and command in ('pause', 'resume', 'stop'):
+                result = False
+            elif command == 'pause':
+                for monitor in targets:
+                    monitor.pause()
+            elif command == 'resume':
+                for monitor in targets:
+                    monitor.resume()
+                    scheduler.wake(monitor)
+            elif command == 'stop':
+                for monitor in targets:
+                    scheduler.remove(monitor)
+            elif command == 'status':
+                result = status()
+            elif command == 'shutdown':
+                conn.send((request_id, True))
+                break
+            else:
+                result = None
+
+            try:
+                conn.send((request_id, result))
+            except (EOFError, OSError):
+                break
+    finally:
+        scheduler.stop()
+        conn.close()
+
+class MonitorProcess:
+    """
+    프로그램 모니터 그룹을 실행하는 작업 프로세스 (부모 프로세스 쪽 제어 객체)
+
+    Python 코드로 처리하는 규칙 평가, 액션 실행은 GIL 때문에 스레드로는 코어 하나를
+    넘지 못하므로 모니터 그룹을 별도 프로세스에서 실행합니다. 제어 명령과 상태는
+    파이프로 주고받습니다.
+    """
+
+    # 명령 응답 대기 시간 (초)
+    REPLY_TIMEOUT = 2.0
+
+    def __init__(self, program_configs, resources_dir=None, name=None):
+        """
+        작업 프로세스 초기화 (start() 호출 전까지 프로세스는 만들어지지 않음)
+
+        Args:
+            program_configs (list): 실행할 프로그램 설정 목록
+            resources_dir (str, optional): 리소스 디렉토리
+            name (str, optional): 프로세스 이름
+        """
+        self.program_configs = list(program_configs)
+        self.resources_dir = resources_dir
+        self.name = name or "monitor-process"
+
+        # 윈도우와 같은 방식(spawn)으로 실행해 플랫폼별 동작 차이를 없앰
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=run_monitor_worker,
+            args=(self.program_configs, resources_dir, child_conn),
+            name=self.name, daemon=True
+        )
+        self._child_conn = child_conn
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+
+    @property
+    def program_names(self):
+        """이 프로세스가 실행하는 프로그램 이름 목록"""
+        return [config.get('name') for config in self.program_configs]
+
+    def start(self):
+        """작업 프로세스 시작"""
+        self.process.start()
+        # 자식 쪽 연결은 자식 프로세스만 사용
+        self._child_conn.close()
+
+    def is_alive(self):
+        """작업 프로세스 실행 여부"""
+        return self.process.is_alive()
+
+    def join(self, timeout=None, terminate=True):
+        """
+        작업 프로세스 종료 대기
+
+        Args:
+            timeout (float, optional): 최대 대기 시간 (초)
+            terminate (bool): 시간 안에 끝나지 않으면 강제 종료할지 여부
+        """
+        self.process.join(timeout)
+        if terminate and self.process.is_alive():
+            self.terminate()
+            self.process.join(1.0)
+
+    def terminate(self):
+        """작업 프로세스 강제 종료 (종료 대기는 join으로)"""
+        if self.process.is_alive():
+            print(f"작업 프로세스 강제 종료: {self.name}")
+            self.process.terminate()
+
+    def request_shutdown(self):
+        """
+        작업 프로세스에 종료 명령 전송 (응답을 기다리지 않음 - 종료는 join으로 확인)
+
+        프로세스의 모든 모니터가 중지되고 프로세스가 끝납니다.
+        """
+        with self._lock:
+            if not self.process.is_alive():
+                return
+            try:
+                self._conn.send((next(self._request_ids), 'shutdown', None))
+            except (EOFError, OSError) as e:
+                print(f"작업 프로세스 통신 오류 {self.name}: {e}")
+
+    def pause(self, name=None):
+        """모니터 일시 정지 (name이 None이면 프로세스의 모든 모니터)"""
+        return self.send_command('pause', name)
+
+    def resume(self, name=None):
+        """모니터 재개 (name이 None이면 프로세스의 모든 모니터)"""
+        return self.send_command('resume', name)
+
+    def stop(self, name=None):
+        """모니터 중지 (name이 None이면 프로세스의 모든 모니터)"""
+        return self.send_command('stop', name)
+
+    def status(self):
+        """
+        프로세스 안 모니터 상태
+
+        Returns:
+            dict: 모니터 이름 -> {alive, paused, hwnd, window_title} (응답이 없으면 빈 딕셔너리)
+        """
+        return self.send_command('status') or {}
+
+    def send_command(self, command, name=None):
+        """
+        작업 프로세스에 명령을 보내고 응답 대기
+
+        Args:
+            command (str): pause, resume, stop, status, shutdown
+            name (str, optional): 대상 모니터 이름 (None이면 모든 모니터)
+
+        Returns:
+            object: 명령 결과 (프로세스가 종료되었거나 응답이 없으면 None)
+        """
+        with self._lock:
+            if not self.process.is_alive():
+                return None
+
+            request_id = next(self._request_ids)
+            try:
+                self._conn.send((request_id, command, name))
+
+                deadline = time.monotonic() + self.REPLY_TIMEOUT
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._conn.poll(remaining):
+                        print(f"작업 프로세스 응답 없음: {self.name} ({command})")
+                        return None
+
+                    reply_id, result = self._conn.recv()
+                    # 이전에 시간 초과된 요청의 늦은 응답은 버림
+                    if reply_id == request_id:
+                        return result
+            except (EOFError, OSError) as e:
+                print(f"작업 프로세스 통신 오류 {self.name}: {e}")
+                return None
+
+class ProcessMonitorHandle:
+    """
+    작업 프로세스에서 실행되는 프로그램 모니터의 대리 객체
+
+    MonitorManager가 ProgramMonitor와 같은 방식(is_active, pause, resume, stop)으로
+    다룰 수 있도록 명령을 해당 작업 프로세스로 전달합니다.
+    """
+
+    def __init__(self, program_config):
+        """
+        대리 객체 초기화
+
+        Args:
+            program_config (dict): 프로그램 설정 정보
+        """
+        self.program_config = program_config
+        self.program_name = program_config.get('name', 'Unknown Program')
+        self.window_title = program_config.get('window_title', '')
+        self.monitoring_interval = program_config.get('monitoring_interval', 1.0)
+        self.process = None
+        self.running = False
+        self.paused = False
+        self.hwnd = 0
+
+    def attach(self, process):
+        """
+        모니터를 실행하는 작업 프로세스 연결
+
+        Args:
+            process (MonitorProcess): 작업 프로세스
+        """
+        self.process = process
+        self.running = True
+        self.paused = False
+
+    def is_alive(self):
+        """작업 프로세스 실행 여부"""
+        return self.process is not None and self.process.is_alive()
+
+    def is_active(self):
+        """모니터링 실행 여부 (중지 명령을 보냈거나 프로세스가 끝났으면 False)"""
+        return self.running and self.is_alive()
+
+    def pause(self):
+        """모니터링 일시 정지"""
+        if self.process and self.process.pause(self.program_name):
+            self.paused = True
+
+    def resume(self):
+        """모니터링 재개"""
+        if self.process and self.process.resume(self.program_name):
+            self.paused = False
+
+    def stop(self, notify=True):
+        """
+        모니터링 중지
+
+        Args:
+            notify (bool): 작업 프로세스에 중지 명령을 보낼지 여부
+                (프로세스 전체를 종료할 때는 프로세스마다 종료 명령 하나로 대신함)
+        """
+        self.running = False
+        if self.process and notify:
+            self.process.stop(self.program_name)
+
+    def update(self, status):
+        """
+        작업 프로세스가 보고한 상태 반영
+
+        Args:
+            status (dict): {alive, paused, hwnd, window_title} (없으면 None)
+        """
+        if not status:
+            self.running = False
+            return
+
+        self.running = self.running and status['alive']
+        self.paused = status['paused']
+        self.hwnd = status['hwnd']
@@ -0,0 +1,252 @@
+# monitoring/monitor_scheduler.py
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class MonitorScheduler:
+    """
+    여러 ProgramMonitor를 하나의 타이머 힙으로 실행하는 스케줄러
+
+    모니터마다 스레드를 두는 대신, 스케줄러 스레드 하나가 다음 실행 시각이 된 모니터의
+    tick()을 크기가 제한된 작업 스레드 풀에 넘깁니다. 모니터 수가 늘어나도 스레드 수는
+    작업 스레드 수로 고정됩니다. 한 모니터의 tick()은 동시에 두 번 실행되지 않습니다.
+    다음 실행 시각은 직전 실행 예정 시각 기준으로 계산하므로 처리 시간만큼 밀리지 않습니다.
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        스케줄러 초기화
+
+        Args:
+            max_workers (int, optional): 작업 스레드 수 (기본: CPU 코어 수)
+        """
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+
+        self._heap = []                  # (실행 시각, 순번, 모니터)
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._monitors = set()           # 등록된 모니터
+        self._expedite = set()           # 예정 시각과 관계없이 바로 실행할 모니터 (중지, 재개)
+        self._executor = None
+        self._thread = None
+        self.running = False
+
+        # 통계
+        self.ticks = 0                   # 실행된 tick 수
+        self.late = 0                    # 예정 시각보다 늦게 시작된 tick 수
+        self.max_lag = 0.0               # 가장 늦게 시작된 tick의 지연 시간 (초)
+        self.missed = 0                  # 처리가 늦어져 건너뛴 주기 수 (모든 모니터 합계)
+
+    def add(self, monitor, delay=0.0):
+        """
+        모니터 등록 및 실행 예약 (모니터 시작 준비 포함)
+
+        Args:
+            monitor (ProgramMonitor): 실행할 모니터
+            delay (float): 첫 실행까지 대기할 시간 (초)
+        """
+        with self._cond:
+            if monitor in self._monitors:
+                return
+
+        monitor.begin_monitoring()
+        monitor.scheduled = True
+
+        with self._cond:
+            self._monitors.add(monitor)
+            self._push(monitor, time.monotonic() + delay)
+
+    def remove(self, monitor):
+        """
+        모니터 실행 중지 요청 (다음 tick에서 정리되고 등록 해제됨)
+
+        Args:
+            monitor (ProgramMonitor): 중지할 모니터
+        """
+        monitor.stop()
+        self.wake(monitor)
+
+    def wake(self, monitor):
+        """
+        예정 시각을 기다리지 않고 모니터를 바로 실행 (중지, 일시 정지 해제를 즉시 반영)
+
+        Args:
+            monitor (ProgramMonitor): 모니터
+        """
+        with self._cond:
+            if monitor in self._monitors:
+                self._expedite.add(monitor)
+                self._cond.notify()
+
+    def start(self):
+        """스케줄러 스레드와 작업 스레드 풀 시작"""
+        if self.running:
+            return
+
+        self.running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="monitor-worker")
+        self._thread = threading.Thread(target=self._run, name="monitor-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """
+        스케줄러 중지 (모든 모니터 중지 후 정리)
+
+        Args:
+            timeout (float): 스케줄러 스레드 종료 대기 시간 (초)
+        """
+        with self._cond:
+            monitors = list(self._monitors)
+            self.running = False
+            self._cond.notify_all()
+
+        # 모든 모니터에 먼저 중지를 알린 뒤 종료 대기
+        for monitor in monitors:
+            monitor.stop()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+        # 실행 중인 tick이 끝날 때까지 대기한 뒤 남은 모니터 정리
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        with self._cond:
+            monitors = list(self._monitors)
+            self._monitors.clear()
+            self._expedite.clear()
+            self._heap = []
+
+        for monitor in monitors:
+            self._finish(monitor)
+
+    @property
+    def monitor_count(self):
+        """등록된 모니터 수"""
+        with self._cond:
+            return len(self._monitors)
+
+    def stats(self):
+        """
+        스케줄러 통계
+
+        Returns:
+            dict: monitors, workers, ticks, late, max_lag, missed
+        """
+        with self._cond:
+            return {
+                'monitors': len(self._monitors),
+                'workers': self.max_workers,
+                'ticks': self.ticks,
+                'late': self.late,
+                'max_lag': self.max_lag,
+                'missed': self.missed,
+            }
+
+    def _push(self, monitor, due):
+        """
+        실행 예약 추가 (_cond 잠금 상태에서 호출) (내부 사용)
+
+        Args:
+            monitor (ProgramMonitor): 모니터
+            due (float): 실행 시각 (time.monotonic 기준)
+        """
+        heapq.heappush(self._heap, (due, next(self._counter), monitor))
+        self._cond.notify()
+
+    def _run(self):
+        """스케줄러 루프: 실행 시각이 된 모니터를 작업 스레드 풀에 넘김 (내부 사용)"""
+        with self._cond:
+            while self.running:
+                if self._expedite:
+                    self._expedite_entries()
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                due, _, monitor = self._heap[0]
+                now = time.monotonic()
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+
+                heapq.heappop(self._heap)
+                lag = max(0.0, now - due)
+                if lag > 0.05:
+                    self.late += 1
+                self.max_lag = max(self.max_lag, lag)
+
+                try:
+                    self._executor.submit(self._execute, monitor)
+                except RuntimeError:
+                    # 작업 스레드 풀이 이미 종료됨
+                    break
+
+    def _expedite_entries(self):
+        """바로 실행할 모니터의 예약을 현재 시각으로 당김 (_cond 잠금 상태에서 호출) (내부 사용)"""
+        now = time.monotonic()
+        heap = []
+        for due, seq, monitor in self._heap:
+            if monitor in self._expedite:
+                # 지연 통계에 포함되지 않도록 예정 시각도 현재로 변경
+                due = min(due, now)
+                self._expedite.discard(monitor)
+            heap.append((due, seq, monitor))
+        heapq.heapify(heap)
+        self._heap = heap
+        # 남은 모니터는 실행 중이며 tick이 끝나면 _execute에서 바로 다시 예약됨
+
+    def _execute(self, monitor):
+        """
+        작업 스레드에서 모니터 tick 한 번 실행 후 다시 예약 (내부 사용)
+
+        Args:
+            monitor (ProgramMonitor): 모니터
+        """
+        try:
+            delay = monitor.tick(block=False)
+        except Exception as e:
+            print(f"모니터 실행 오류 {monitor.program_name}: {e}")
+            delay = monitor.monitoring_interval if monitor.running else None
+
+        if delay is not None:
+            missed = monitor.missed_ticks
+            due = monitor.advance_deadline(delay)
+
+        with self._cond:
+            self.ticks += 1
+            if delay is not None and self.running:
+                self.missed += monitor.missed_ticks - missed
+                if monitor in self._expedite or not monitor.running:
+                    # 실행 중에 중지/재개 요청을 받은 경우 바로 다시 실행
+                    self._expedite.discard(monitor)
+                    due = time.monotonic()
+                self._push(monitor, due)
+                return
+            if delay is not None:
+                # 스케줄러 중지 중: stop()에서 정리
+                return
+            self._monitors.discard(monitor)
+
+        self._finish(monitor)
+
+    def _finish(self, monitor):
+        """
+        모니터 정리 (캡처, 기록 리소스 해제) (내부 사용)
+
+        Args:
+            monitor (ProgramMonitor): 모니터
+        """
+        try:
+            monitor.end_monitoring()
+        except Exception as e:
+            print(f"모니터 정리 오류 {monitor.program_name}: {e}")
+        monitor.scheduled = False
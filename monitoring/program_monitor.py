@@ -5,27 +5,51 @@ import time
 import cv2
 import os
 import yaml
-import win32gui  # 윈도우 핸들, 윈도우 관리 기능
-import win32api  # 마우스, 키보드 이벤트, 커서 제어 등
-import win32con  # Windows 상수 정의
-import win32ui   # UI 관련 기능
+try:
+    import win32gui  # 윈도우 핸들, 윈도우 관리 기능
+    import win32api  # 마우스, 키보드 이벤트, 커서 제어 등
+    import win32con  # Windows 상수 정의
+    import win32ui   # UI 관련 기능
+except ImportError:
+    # 윈도우가 아닌 환경 (리플레이/합성 캡처 백엔드로 파이프라인만 실행)
+    win32gui = win32api = win32con = win32ui = None
 from core.window_utils import WindowUtils
 from core.image_recognition import ImageRecognition
+from core.template_registry import TemplateRegistry
+from core.frame_context import FrameContext
+from core.frame_change import FrameChangeDetector, DirtyTileMap
+from core.fingerprint_cache import FingerprintCache
+from core.adaptive_interval import AdaptiveInterval
+from core.rule_scheduler import RuleScheduler
+from core.screen_state import ScreenStateMachine
+from core.capture_backends import create_capture_backend
+from core.shared_frame_pool import SharedFramePool
+from core.session_recording import SessionRecorder
 from core.action_executor import ActionExecutor
+from monitoring.frame_buffer import FrameRingBuffer, CaptureThread
 
 class ProgramMonitor(threading.Thread):
     """개별 프로그램 모니터링 및 자동화 클래스"""
     
-    def __init__(self, program_config, resources_dir=None):
+    # 직전 발견 위치 주변 검색 시 기본 여유 범위 (픽셀)
+    NEAR_LAST_HIT_MARGIN = 16
+    
+    # 백그라운드 캡처 사용 시 새 프레임을 기다리는 최대 시간 (초)
+    FRAME_WAIT_TIMEOUT = 1.0
+    
+    def __init__(self, program_config, resources_dir=None, action_handler=None):
         """
         프로그램 모니터 초기화
         
         Args:
             program_config (dict): 프로그램 설정 정보
             resources_dir (str, optional): 리소스 디렉토리 경로
+            action_handler (callable, optional): 템플릿 발견 시 실제 액션 대신 호출할 함수
+                handler(template_name, position, actions, rule) (리플레이 벤치마크용)
         """
         super(ProgramMonitor, self).__init__()
         
+        self.program_config = program_config
         self.program_name = program_config.get('name', 'Unknown Program')
         self.window_title = program_config.get('window_title', '')
         self.window_class = program_config.get('window_class', None)
@@ -35,8 +59,50 @@ class ProgramMonitor(threading.Thread):
         # 상태 플래그
         self.running = False
         self.paused = False
+        self.scheduled = False  # MonitorScheduler가 실행 중인지 여부 (모니터별 스레드 대신)
         self.hwnd = 0
         
+        # 대기 중인 루프를 즉시 깨우기 위한 이벤트 (중지 / 일시 정지 해제)
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        
+        # 절대 시각 기준 주기 실행 (처리 시간이 간격에 더해져 밀리지 않도록)
+        self.next_due = None    # 다음 주기 실행 시각 (time.monotonic 기준)
+        self.missed_ticks = 0   # 처리가 늦어져 건너뛴 주기 수
+        
+        # 규칙 인덱스 -> 마지막 발견 위치 (x, y, w, h) - 주변 우선 검색용
+        self.last_hits = {}
+        
+        # 화면 변화 검출 (변화 없는 프레임은 인식을 건너뛰고 이전 결과 재사용)
+        self.change_detector = FrameChangeDetector.from_config(program_config.get('change_detection'))
+        self.last_rule_hits = []
+        
+        # 적응형 모니터링 간격 (활동이 있으면 짧게, 유휴 상태가 이어지면 점점 길게)
+        self.adaptive_interval = AdaptiveInterval.from_config(
+            program_config.get('adaptive_interval'), self.monitoring_interval
+        )
+        
+        # 변경 타일 추적 (검색 영역이 바뀌지 않은 규칙은 직전 결과 재사용)
+        self.dirty_tiles = DirtyTileMap.from_config(program_config.get('dirty_tiles'))
+        self.rule_results = {}  # 규칙 인덱스 -> 마지막 (found, position, confidence)
+        self.rule_timings = {}  # 규칙 인덱스 -> 직전 프레임 매칭 소요 시간 (초, 매칭한 규칙만)
+        
+        # 화면 지문 캐시 (검색 영역이 전에 본 화면과 거의 같으면 그때의 결과 재사용)
+        self.fingerprint_cache = FingerprintCache.from_config(program_config.get('fingerprint_cache'))
+        
+        # 화면 상태 기계 (현재 화면 상태의 규칙과 상태 검출 규칙만 평가)
+        self.screen_states = ScreenStateMachine.from_config(program_config.get('screen_states'))
+        
+        # 규칙별 평가 주기/우선순위와 프레임당 매칭 시간 예산 (예산을 넘는 규칙은 다음 프레임으로)
+        # (측정한 비용/발견률 기반 평가 순서, stop_after_match / exclusive_group 평가 생략 포함)
+        self.rule_scheduler = RuleScheduler.from_config(
+            program_config.get('rule_budget'), self.rules, program_config.get('rule_profiling')
+        )
+        
+        # 캡처 결과 버퍼 (프레임마다 다시 할당하지 않도록 재사용)
+        self._capture_buffer = None
+        
         # 리소스 디렉토리
         self.resources_dir = resources_dir
         if resources_dir and os.path.isdir(resources_dir):
@@ -44,9 +110,39 @@ class ProgramMonitor(threading.Thread):
         else:
             self.templates_dir = None
         
-        # 핵심 모듈 초기화
-        self.image_recognition = ImageRecognition(self.templates_dir)
+        # 핵심 모듈 초기화 (템플릿은 같은 디렉토리를 쓰는 모든 모니터/GUI가 공유)
+        registry = TemplateRegistry.shared(self.templates_dir) if self.templates_dir else None
+        self.image_recognition = ImageRecognition(self.templates_dir, registry=registry)
         self.action_executor = ActionExecutor()
+        
+        # 캡처 백엔드 (기본: 실제 윈도우 클라이언트 영역 캡처, 리플레이/합성 백엔드는 윈도우 불필요)
+        capture_config = program_config.get('capture') or {}
+        self.capture_backend = create_capture_backend(
+            capture_config, templates=self.image_recognition.templates
+        )
+        
+        # 모든 규칙에 검색 영역이 있으면 그 합집합만 캡처
+        self.capture_sub_region = capture_config.get('sub_region', True)
+        
+        # 백그라운드 캡처 (캡처 스레드가 링 버퍼를 채우고 인식 루프는 최신 프레임만 처리)
+        self.capture_threaded = capture_config.get('threaded', False)
+        self.capture_interval = capture_config.get('interval', 0.05)
+        self.frame_buffer = None
+        if self.capture_threaded:
+            self.frame_buffer = FrameRingBuffer(capture_config.get('buffer_size', 3))
+            # 링 버퍼의 프레임은 다음 캡처 이후에도 인식에 쓰이므로 백엔드 버퍼를 빌려 쓰지 않음
+            self.capture_backend.retain_frames()
+        self.capture_thread = None
+        
+        # 캡처한 프레임을 공유 메모리에 게시 (다른 프로세스가 backend: shared로 복사 없이 읽음)
+        self.publish_config = capture_config.get('publish')
+        self.frame_pool = None
+        
+        # 세션 기록 (프레임, 윈도우 위치, 실행된 액션) - 모니터 시작 시 기록 디렉토리 생성
+        self.recording_config = program_config.get('recording')
+        self.recorder = None
+        
+        self.action_handler = action_handler
     
     def find_window(self):
         """
@@ -72,73 +168,765 @@ class ProgramMonitor(threading.Thread):
         return False
     
     def run(self):
-        """모니터링 메인 루프"""
-        self.running = True
+        """모니터링 메인 루프 (모니터별 스레드 실행 방식)"""
+        self.begin_monitoring()
         
         while self.running:
             if self.paused:
-                time.sleep(0.5)
+                # 재개 또는 중지될 때까지 대기 (재개 후 주기는 새로 시작)
+                self._resume_event.wait()
+                self.next_due = None
                 continue
             
-            # 윈도우 찾기 또는 유효성 확인
-            if not self.hwnd or not win32gui.IsWindow(self.hwnd):
-                if not self.find_window():
-                    # 윈도우를 찾을 수 없음, 재시도
-                    time.sleep(self.monitoring_interval)
-                    continue
+            delay = self.tick()
+            if delay is None:
+                break
             
-            # 윈도우 캡처
-            screenshot = WindowUtils.capture_window(self.hwnd)
+            # 다음 주기 실행 시각까지 대기 (중지되면 즉시 깨어남)
+            self._stop_event.wait(max(0.0, self.advance_deadline(delay) - time.monotonic()))
+        
+        self.end_monitoring()
+    
+    def advance_deadline(self, delay, now=None):
+        """
+        다음 주기 실행 시각 계산 (직전 실행 예정 시각 + 간격)
+        
+        처리가 늦어져 이미 지난 주기는 몰아서 실행하지 않고 건너뛰며 missed_ticks에 집계합니다.
+        
+        Args:
+            delay (float): 모니터링 간격 (초)
+            now (float, optional): 현재 시각 (time.monotonic 기준)
             
-            if screenshot is not None:
-                # 모든 규칙 확인
-                self.check_rules(screenshot)
+        Returns:
+            float: 다음 주기 실행 시각
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        due = (now if self.next_due is None else self.next_due) + delay
+        if due < now:
+            if delay > 0:
+                missed = int((now - due) // delay) + 1
+                self.missed_ticks += missed
+                due += missed * delay
+            else:
+                due = now
+        
+        self.next_due = due
+        return due
+    
+    def begin_monitoring(self):
+        """모니터링 시작 준비 (세션 기록, 백그라운드 캡처 시작)"""
+        self.running = True
+        self.next_due = None
+        self.missed_ticks = 0
+        self._stop_event.clear()
+        self.recorder = SessionRecorder.from_config(self.recording_config, self.program_config)
+        self.frame_pool = SharedFramePool.from_config(self.publish_config)
+        if self.frame_pool:
+            print(f"공유 프레임 게시: {self.frame_pool.name}")
+        
+        if self.frame_buffer is not None:
+            self.capture_thread = CaptureThread(
+                self._capture_frame, self.frame_buffer, self.capture_interval,
+                finished_func=lambda: self.capture_backend.finished,
+                name=f"capture-{self.program_name}"
+            )
+            self.capture_thread.start()
+    
+    def tick(self, block=True):
+        """
+        모니터링 한 주기 실행 (윈도우 확인, 캡처, 인식, 액션)
+        
+        모니터별 스레드의 run() 루프와 MonitorScheduler가 같은 함수를 사용합니다.
+        
+        Args:
+            block (bool): 백그라운드 캡처 사용 시 새 프레임을 기다릴지 여부
+                (스케줄러 작업 스레드는 기다리지 않음)
+            
+        Returns:
+            float: 다음 주기까지 대기할 시간 (초, 모니터링이 끝났으면 None)
+        """
+        if not self.running:
+            return None
+        
+        if self.paused:
+            # 재개 후에는 주기를 새로 시작
+            self.next_due = None
+            return 0.5
+        
+        # 윈도우 찾기 또는 유효성 확인 (윈도우가 필요한 캡처 백엔드만)
+        if self.capture_backend.requires_window and (not self.hwnd or not win32gui.IsWindow(self.hwnd)):
+            if not self.find_window():
+                # 윈도우를 찾을 수 없음, 재시도
+                return self.monitoring_interval
+        
+        # 최신 프레임 가져오기
+        captured = self._next_frame(self.FRAME_WAIT_TIMEOUT if block else 0)
+        active = False
+        if captured is not None:
+            screenshot, origin, frame_size = captured
+            if self.recorder:
+                self.recorder.record_frame(screenshot, origin, frame_size, self._window_rect())
+            evaluated = self.process_frame(screenshot, origin, frame_size)
+            active = bool(self.last_rule_hits) or (evaluated and self._frame_changed())
+        elif self.capture_backend.finished:
+            # 리플레이 종료
+            print(f"캡처 종료: {self.program_name}")
+            return None
+        
+        return self._next_interval(active)
+    
+    def _next_interval(self, active):
+        """
+        다음 주기까지 대기할 간격 (적응형 간격을 쓰지 않으면 monitoring_interval)
+        
+        Args:
+            active (bool): 이번 주기에 규칙 발견 또는 화면 변화가 있었는지 여부
             
-            # 모니터링 간격 대기
-            time.sleep(self.monitoring_interval)
+        Returns:
+            float: 대기 간격 (초)
+        """
+        if self.adaptive_interval is None:
+            return self.monitoring_interval
+        return self.adaptive_interval.update(active)
+    
+    def _frame_changed(self):
+        """
+        직전 인식 프레임에서 화면 변화가 검출되었는지 여부 (변화 검출을 쓰지 않으면 False)
+        
+        Returns:
+            bool: 화면 변화 여부
+        """
+        if self.change_detector is None:
+            return False
+        return self.change_detector.last_difference > self.change_detector.threshold
+    
+    def end_monitoring(self):
+        """캡처 스레드, 병렬 매칭 스레드와 캡처 리소스 정리"""
+        self.running = False
+        if self.capture_thread:
+            self.capture_thread.stop()
+            self.capture_thread.join(2.0)
+        self.image_recognition.shutdown()
+        self.capture_backend.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.frame_pool:
+            # 풀 칸을 가리키는 캡처 버퍼를 먼저 놓아야 공유 메모리를 닫을 수 있음
+            self._capture_buffer = None
+            self.frame_pool.close()
+            self.frame_pool = None
     
-    def check_rules(self, screenshot):
+    def is_active(self):
+        """
+        모니터링 실행 여부 (모니터별 스레드 또는 스케줄러 실행)
+        
+        Returns:
+            bool: 실행 중 여부
+        """
+        return self.is_alive() or (self.scheduled and self.running)
+    
+    def process_frame(self, screenshot, origin=(0, 0), frame_size=None, now=None):
+        """
+        캡처된 프레임 한 장 처리 (화면 변화가 없으면 이전 인식 결과 재사용)
+        
+        Args:
+            screenshot (numpy.ndarray | FrameContext): 캡처된 윈도우 이미지
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치 (부분 캡처 시)
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기 (기본: 캡처 이미지 크기)
+            now (float, optional): 프레임 시각 (변화 검출용, 기본: 현재 time.monotonic)
+            
+        Returns:
+            bool: 이미지 인식을 수행했는지 여부 (False면 이전 결과 재사용)
+        """
+        if self.change_detector and not self.change_detector.should_evaluate(screenshot, now):
+            # 화면 변화 없음: 이전 인식 결과 재사용
+            self.rule_timings = {}
+            self.apply_rule_hits(self.last_rule_hits)
+            return False
+        
+        # 모든 규칙 확인 (부분 캡처면 캡처 영역 시작 위치 기준으로 좌표 변환)
+        self.check_rules(screenshot, origin, frame_size, now)
+        return True
+    
+    def reset_recognition_state(self):
+        """이전 프레임에서 이어지는 인식 상태 초기화 (직전 발견 위치, 재사용 결과, 변화 검출 기준)"""
+        self.last_hits = {}
+        self.last_rule_hits = []
+        self.rule_results = {}
+        self.rule_timings = {}
+        if self.change_detector:
+            self.change_detector.reset()
+        if self.dirty_tiles:
+            self.dirty_tiles.reset()
+        if self.fingerprint_cache:
+            self.fingerprint_cache.reset()
+        if self.rule_scheduler:
+            self.rule_scheduler.reset()
+        if self.screen_states:
+            self.screen_states.reset()
+    
+    def _window_rect(self):
+        """
+        기록용 현재 윈도우 위치
+        
+        Returns:
+            tuple: (left, top, right, bottom) (윈도우가 없으면 None)
+        """
+        if not self.capture_backend.requires_window or not self.hwnd:
+            return None
+        try:
+            return tuple(WindowUtils.get_window_rect(self.hwnd))
+        except Exception:
+            return None
+    
+    def _capture_frame(self, out=None):
+        """
+        화면 한 장 캡처 (규칙 검색 영역의 합집합만 캡처 가능)
+        
+        Args:
+            out (numpy.ndarray, optional): 결과를 기록할 이미지 버퍼
+            
+        Returns:
+            tuple: (image, origin, frame_size) - 캡처 이미지, 이미지 좌상단의 프레임 내 위치,
+                전체 프레임 (w, h) 크기 (실패 시 None)
+        """
+        if self.capture_backend.requires_window and not self.hwnd:
+            return None
+        
+        frame_size = self.capture_backend.frame_size(self.hwnd)
+        region = self._capture_region(frame_size)
+        origin = region[:2] if region else (0, 0)
+        if self.frame_pool is not None:
+            return self._capture_to_pool(region, origin, frame_size, out)
+        
+        image = self.capture_backend.capture(self.hwnd, out=out, rect=region)
+        if image is None:
+            return None
+        return image, origin, frame_size
+    
+    def _capture_to_pool(self, region, origin, frame_size, out=None):
+        """
+        캡처 후 공유 프레임 풀에 게시
+        
+        모니터 스레드에서 바로 캡처하면 풀 칸에 직접 캡처해 복사 없이 게시합니다.
+        백그라운드 캡처는 링 버퍼 프레임을 인식이 계속 사용하므로 풀 칸에 복사해 게시합니다.
+        
+        Args:
+            region (tuple): 캡처할 (x, y, w, h) 영역 (None이면 전체)
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치
+            frame_size (tuple): 전체 프레임 (w, h) 크기
+            out (numpy.ndarray, optional): 링 버퍼의 재사용 이미지 버퍼
+            
+        Returns:
+            tuple: (image, origin, frame_size) (실패 시 None)
+        """
+        try:
+            index = None
+            if self.frame_buffer is None:
+                size = region[2:] if region else frame_size
+                index, out = self.frame_pool.acquire(size[1], size[0]) if size else self.frame_pool.acquire()
+            
+            image = self.capture_backend.capture(self.hwnd, out=out, rect=region)
+            if image is None:
+                return None
+            
+            if index is None:
+                self.frame_pool.write(image, self.hwnd, origin, frame_size)
+            else:
+                self.frame_pool.publish(index, image, self.hwnd, origin, frame_size)
+            return image, origin, frame_size
+        except ValueError as e:
+            # 프레임이 풀 칸보다 큼: 게시 중단하고 일반 캡처로 계속
+            print(f"공유 프레임 게시 오류, 게시 중단: {e}")
+            self._capture_buffer = None
+            self.frame_pool.close()
+            self.frame_pool = None
+            return None
+    
+    def _next_frame(self, timeout=None):
+        """
+        인식할 다음 프레임 가져오기
+        
+        백그라운드 캡처를 사용하면 링 버퍼의 최신 프레임을 (새 프레임이 없으면 잠시 대기),
+        아니면 이 스레드에서 바로 캡처합니다 (크기가 같으면 직전 캡처 버퍼 재사용).
+        
+        Args:
+            timeout (float, optional): 새 프레임을 기다릴 최대 시간 (초, 기본: FRAME_WAIT_TIMEOUT)
+        
+        Returns:
+            tuple: (image, origin, frame_size) (프레임이 없으면 None)
+        """
+        if self.frame_buffer is None:
+            captured = self._capture_frame(self._capture_buffer)
+            if captured is not None:
+                self._capture_buffer = captured[0]
+            return captured
+        
+        if timeout is None:
+            timeout = self.FRAME_WAIT_TIMEOUT
+        slot = self.frame_buffer.latest(timeout=timeout)
+        if slot is None:
+            return None
+        return slot.image, slot.origin, slot.frame_size
+    
+    def capture_stats(self):
+        """
+        백그라운드 캡처 통계
+        
+        Returns:
+            dict: produced, consumed, dropped, failures 프레임 수 (백그라운드 캡처 미사용 시 None)
+        """
+        if self.frame_buffer is None:
+            return None
+        
+        stats = self.frame_buffer.stats()
+        stats['failures'] = self.capture_thread.failures if self.capture_thread else 0
+        return stats
+    
+    def check_rules(self, screenshot, origin=(0, 0), frame_size=None, now=None):
         """
         규칙 확인 및 액션 실행
         
         Args:
-            screenshot (numpy.ndarray): 캡처된 윈도우 이미지
+            screenshot (numpy.ndarray | FrameContext): 캡처된 윈도우 이미지
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치 (부분 캡처 시)
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기 (기본: 캡처 이미지 크기)
+            now (float, optional): 프레임 시각 (규칙 평가 주기용, 기본: 현재 time.monotonic)
+        """
+        self.last_rule_hits = self.evaluate_rules(screenshot, origin, frame_size, now)
+        self.apply_rule_hits(self.last_rule_hits)
+    
+    def evaluate_rules(self, screenshot, origin=(0, 0), frame_size=None, now=None):
         """
-        for rule in self.rules:
-            # 규칙 구성 요소 확인
-            template_name = rule.get('template')
-            actions = rule.get('actions', [])
+        모든 규칙의 이미지 인식 수행 (액션은 실행하지 않음)
+        
+        화면 상태 기계를 사용하면 먼저 상태 검출 규칙으로 현재 상태를 갱신한 뒤
+        현재 상태에서 평가할 규칙만 평가합니다.
+        규칙 스케줄러를 사용하면 평가 주기가 된 규칙 중 프레임 시간 예산 안에 드는 규칙만
+        평가하며, 평가하지 않은 규칙은 이번 프레임에서 발견되지 않은 것으로 처리합니다.
+        stop_after_match / exclusive_group 규칙이 있으면 평가 순서대로 매칭 스레드 수만큼씩
+        나누어 매칭하고, 발견된 규칙에 따라 남은 규칙 평가를 생략합니다.
+        
+        Args:
+            screenshot (numpy.ndarray | FrameContext): 캡처된 윈도우 이미지
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치 (부분 캡처 시)
+            frame_size (tuple, optional): 전체 프레임 (w, h) 크기 (기본: 캡처 이미지 크기)
+            now (float, optional): 프레임 시각 (규칙 평가 주기용, 기본: 현재 time.monotonic)
             
-            if not template_name or not actions:
+        Returns:
+            list: 발견된 규칙 목록 [(rule, spec, position, confidence), ...] (규칙 순서)
+                (position은 전체 프레임 기준 좌표)
+        """
+        # 모든 규칙이 같은 그레이스케일/HSV 변환 결과를 공유하도록 프레임 컨텍스트 생성
+        frame = FrameContext.wrap(screenshot)
+        frame_shape = (frame_size[1], frame_size[0]) if frame_size else frame.shape
+        if now is None:
+            now = time.monotonic()
+        
+        # 화면 상태 갱신 (전환 가능한 상태의 검출 규칙만 확인)
+        if self.screen_states:
+            self._update_screen_state(frame, frame_shape, origin, now)
+        
+        # 규칙 구성 요소 확인 (규칙 스케줄러가 있으면 이번 프레임에 평가할 규칙만 평가 순서대로 선택)
+        active_rules = [(index, rule) for index, rule in enumerate(self.rules)
+                        if self._is_active_rule(rule)
+                        and (self.screen_states is None or self.screen_states.rule_applies(rule))]
+        if self.rule_scheduler:
+            active_rules = self.rule_scheduler.order(self.rule_scheduler.select(active_rules, now))
+        
+        # 검색 조건 목록 생성 (검색 영역은 캡처 이미지 기준으로 변환)
+        specs = [self._rule_spec(rule, frame_shape, origin) for index, rule in active_rules]
+        
+        # 검색 영역에 변경된 타일이 없는 규칙은 직전 결과 재사용
+        if self.dirty_tiles:
+            self.dirty_tiles.update(frame)
+            self._discard_dirty_results(frame_shape, origin)
+        
+        # 매칭 소요 시간은 이번 프레임 기준 (평가할 규칙이 없는 프레임 포함)
+        self.rule_timings = {}
+        
+        if not specs:
+            return []
+        
+        # 평가 생략 규칙이 없으면 한 번에 모두 매칭, 있으면 평가 순서대로 나누어 매칭
+        short_circuit = any(RuleScheduler.short_circuits(rule) for index, rule in active_rules)
+        batch_size = max(1, self.image_recognition.max_workers) if short_circuit else len(active_rules)
+        
+        results = [None] * len(specs)
+        claimed_groups = set()  # 이번 프레임에 이미 발견된 규칙이 있는 exclusive_group
+        stopped = False
+        remaining = list(range(len(specs)))
+        while remaining and not stopped:
+            batch = []
+            while remaining and len(batch) < batch_size:
+                i = remaining.pop(0)
+                if active_rules[i][1].get('exclusive_group') in claimed_groups:
+                    continue
+                batch.append(i)
+            
+            self._evaluate_batch(frame, active_rules, specs, results, batch, origin, now)
+            
+            # 평가 순서대로 발견 결과 확인 (중단 규칙 뒤의 결과와 이미 발견된 그룹의 결과는 버림)
+            for i in batch:
+                index, rule = active_rules[i]
+                if stopped or rule.get('exclusive_group') in claimed_groups:
+                    results[i] = None
+                    continue
+                if self.rule_scheduler:
+                    self.rule_scheduler.record(index, now, self.rule_timings.get(index), results[i][0])
+                if results[i][0]:
+                    if rule.get('exclusive_group'):
+                        claimed_groups.add(rule['exclusive_group'])
+                    if rule.get('stop_after_match'):
+                        stopped = True
+        
+        if self.rule_scheduler:
+            self.rule_scheduler.short_circuited_total += sum(1 for result in results if result is None)
+        
+        # 발견 결과는 규칙 순서대로 반환 (평가하지 않은 규칙은 직전 발견 위치 유지)
+        hits = []
+        for i in sorted(range(len(specs)), key=lambda i: active_rules[i][0]):
+            if results[i] is None:
+                continue
+            (index, rule), spec, (found, position, confidence) = active_rules[i], specs[i], results[i]
+            if found:
+                self.last_hits[index] = position
+                hits.append((rule, spec, position, confidence))
+            else:
+                self.last_hits.pop(index, None)
+        
+        return hits
+    
+    def _rule_spec(self, rule, frame_shape, origin=(0, 0)):
+        """
+        규칙의 검색 조건 (검색 영역은 캡처 이미지 기준으로 변환)
+        
+        Args:
+            rule (dict): 규칙 설정 정보
+            frame_shape (tuple): 전체 프레임 (h, w) 크기
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치
+            
+        Returns:
+            dict: find_templates 검색 조건
+        """
+        return {
+            'template': rule.get('template'),
+            'threshold': rule.get('threshold', 0.8),
+            'match_method': rule.get('match_method', 'template'),  # 기본값은 일반 템플릿 매칭
+            'pyramid_levels': rule.get('pyramid_levels', 0),  # 0이면 원본 해상도 전체 검색
+            'roi': self._shift_rect(self._resolve_search_region(rule, frame_shape), origin, -1),  # None이면 전체 화면
+        }
+    
+    def _discard_dirty_results(self, frame_shape, origin=(0, 0)):
+        """
+        검색 영역이 바뀐 규칙의 직전 결과 제거 (이번 프레임에 평가하지 않는 규칙 포함)
+        
+        변경 타일은 직전 인식 프레임과만 비교하므로, 주기/예산/화면 상태/평가 생략으로
+        건너뛴 규칙의 결과를 지우지 않으면 나중에 바뀐 화면에서도 옛 결과가 재사용됩니다.
+        
+        Args:
+            frame_shape (tuple): 전체 프레임 (h, w) 크기
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치
+        """
+        for index in list(self.rule_results):
+            roi = self._rule_spec(self.rules[index], frame_shape, origin)['roi']
+            if self.dirty_tiles.is_dirty(roi):
+                del self.rule_results[index]
+    
+    def _update_screen_state(self, frame, frame_shape, origin=(0, 0), now=None):
+        """
+        상태 검출 규칙으로 현재 화면 상태 갱신
+        
+        Args:
+            frame (FrameContext): 검색할 프레임
+            frame_shape (tuple): 전체 프레임 (h, w) 크기
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치
+            now (float, optional): 프레임 시각
+        """
+        candidates = self.screen_states.detection_candidates()
+        if not candidates:
+            # 검출 규칙이 없어도 상태 timeout은 확인
+            self.screen_states.update([], now)
+            return
+        
+        specs = [self._rule_spec(detect, frame_shape, origin) for name, detect in candidates]
+        
+        # 지문 캐시에 있는 검출 결과는 재사용하고 나머지만 매칭
+        results = [None] * len(specs)
+        fingerprints = {}
+        if self.fingerprint_cache:
+            for i, ((name, detect), spec) in enumerate(zip(candidates, specs)):
+                fingerprints[i] = self._spec_fingerprint(frame, spec)
+                results[i] = self.fingerprint_cache.lookup((name, spec['roi'], origin), fingerprints[i], now)
+        
+        pending = [i for i, result in enumerate(results) if result is None]
+        matched = self.image_recognition.find_templates(frame, [specs[i] for i in pending]) if pending else []
+        for i, result in zip(pending, matched):
+            results[i] = result
+            if self.fingerprint_cache:
+                self.fingerprint_cache.store((candidates[i][0], specs[i]['roi'], origin), fingerprints[i], result, now)
+        
+        # 다른 상태가 발견되면 전환, 현재 상태를 계속 찾지 못하면 unknown으로 전환
+        found = [name for (name, detect), result in zip(candidates, results) if result[0]]
+        self.screen_states.update(found, now)
+    
+    def _spec_fingerprint(self, frame, spec):
+        """
+        검색 조건의 화면 지문 (격자 칸이 템플릿 크기의 절반 이하가 되도록 계산)
+        
+        Args:
+            frame (FrameContext): 검색할 프레임
+            spec (dict): 검색 조건
+            
+        Returns:
+            tuple: 지문 (템플릿이 없거나 검색 영역에 비해 템플릿이 너무 작으면 None - 캐시 사용 안 함)
+        """
+        entry = self.image_recognition.templates.entry(spec['template'])
+        if entry is None:
+            return None
+        return self.fingerprint_cache.fingerprint(frame, spec['roi'], entry.size)
+    
+    def _evaluate_batch(self, frame, active_rules, specs, results, batch, origin=(0, 0), now=None):
+        """
+        규칙 묶음 매칭 (검색 영역에 변경된 타일이 없거나 지문 캐시에 있는 규칙은 이전 결과 재사용)
+        
+        Args:
+            frame (FrameContext): 검색할 프레임
+            active_rules (list): [(index, rule), ...] 평가할 규칙 목록
+            specs (list): 규칙별 검색 조건 목록
+            results (list): 결과를 기록할 목록 (active_rules와 같은 순서)
+            batch (list): 이번에 매칭할 active_rules 위치 목록
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치
+            now (float, optional): 프레임 시각 (지문 캐시 유효 시간용)
+        """
+        pending = []
+        fingerprints = {}
+        for i in batch:
+            index = active_rules[i][0]
+            if (self.dirty_tiles and index in self.rule_results
+                    and not self.dirty_tiles.is_dirty(specs[i]['roi'])):
+                results[i] = self.rule_results[index]
                 continue
             
-            # 매칭 방법 확인
-            match_method = rule.get('match_method', 'template')  # 기본값은 일반 템플릿 매칭
-            threshold = rule.get('threshold', 0.8)
+            if self.fingerprint_cache:
+                # 캐시 키에 검색 영역과 캡처 위치 포함 (저장된 발견 위치는 전체 프레임 기준)
+                fingerprints[i] = self._spec_fingerprint(frame, specs[i])
+                cached = self.fingerprint_cache.lookup((index, specs[i]['roi'], origin), fingerprints[i], now)
+                if cached is not None:
+                    results[i] = self.rule_results[index] = cached
+                    continue
             
-            found = False
-            position = None
+            pending.append(i)
+        
+        matched = self._match_rules(frame, [active_rules[i] for i in pending], [specs[i] for i in pending], origin)
+        for i, (found, position, confidence) in zip(pending, matched):
+            # 발견 위치는 전체 프레임 기준으로 보관 (클릭 좌표, 주변 우선 검색에 사용)
+            result = (found, self._shift_rect(position, origin) if found else position, confidence)
+            results[i] = result
+            self.rule_results[active_rules[i][0]] = result
+            if self.fingerprint_cache:
+                self.fingerprint_cache.store((active_rules[i][0], specs[i]['roi'], origin), fingerprints[i], result, now)
+    
+    def _match_rules(self, frame, rules, specs, origin=(0, 0)):
+        """
+        규칙 검색 조건을 한 번에 병렬로 매칭 (직전 발견 위치 주변 우선 검색 포함)
+        
+        Args:
+            frame (FrameContext): 검색할 프레임
+            rules (list): [(index, rule), ...] 규칙 목록
+            specs (list): 규칙별 검색 조건 목록
+            origin (tuple): 캡처 이미지 좌상단의 프레임 내 (x, y) 위치
             
-            # 매칭 방법에 따른 처리
-            if match_method == 'histogram':
+        Returns:
+            list: specs 순서대로 (found, position, confidence) 목록 (캡처 이미지 기준 좌표)
+        """
+        if not specs:
+            return []
+        
+        # 1차: 직전 발견 위치 주변을 우선 검색하는 규칙은 좁은 영역으로 먼저 시도
+        first_specs = []
+        for (index, rule), spec in zip(rules, specs):
+            near_roi = self._shift_rect(self._near_last_hit_region(index, rule), origin, -1)
+            first_specs.append(dict(spec, roi=near_roi) if near_roi else spec)
+        
+        # 모든 규칙의 매칭을 한 번에 병렬로 수행
+        timings = []
+        results = self.image_recognition.find_templates(frame, first_specs, timings)
+        
+        # 2차: 주변 검색에 실패한 규칙만 원래 검색 영역(또는 전체 화면)으로 다시 검색
+        retry = [i for i, (spec, first) in enumerate(zip(specs, first_specs))
+                 if first is not spec and not results[i][0]]
+        if retry:
+            retry_timings = []
+            retry_results = self.image_recognition.find_templates(frame, [specs[i] for i in retry], retry_timings)
+            for i, result, elapsed in zip(retry, retry_results, retry_timings):
+                results[i] = result
+                timings[i] += elapsed
+        
+        # 규칙별 매칭 소요 시간 기록
+        for (index, rule), elapsed in zip(rules, timings):
+            self.rule_timings[index] = elapsed
+        
+        return results
+    
+    def apply_rule_hits(self, hits):
+        """
+        발견된 규칙의 액션 실행 (규칙 순서대로)
+        
+        Args:
+            hits (list): evaluate_rules 결과
+        """
+        for rule, spec, position, confidence in hits:
+            template_name = spec['template']
+            if spec['match_method'] == 'histogram':
                 # 색상 히스토그램 매칭 (회전/반전에 강인함)
-                found, position, confidence = self.image_recognition.find_by_histogram(
-                    screenshot, template_name, threshold)
-                if found:
-                    print(f"히스토그램 매칭 성공: {template_name}, 신뢰도={confidence:.3f}")
+                print(f"히스토그램 매칭 성공: {template_name}, 신뢰도={confidence:.3f}")
             else:
-                # 기본 템플릿 매칭
-                found, position, confidence = self.image_recognition.find_template(
-                    screenshot, template_name, threshold)
-                if found:
-                    print(f"템플릿 매칭 성공: {template_name}, 신뢰도={confidence:.3f}")
+                print(f"템플릿 매칭 성공: {template_name}, 신뢰도={confidence:.3f}")
             
-            # 이미지 발견 시 액션 실행
-            if found:
-                # 윈도우 활성화 및 액션 실행
-                self._process_found_template(template_name, position, actions, rule)
+            if self.recorder:
+                self.recorder.record_actions(template_name, position, rule.get('actions', []))
+            
+            # 윈도우 활성화 및 액션 실행 (리플레이 등에서는 대체 처리 함수 호출)
+            handler = self.action_handler or self._process_found_template
+            handler(template_name, position, rule.get('actions', []), rule)
+            
+            # 규칙에 따른 화면 상태 전환 (next_state, set_state 액션)
+            if self.screen_states:
+                self.screen_states.apply_rule_hit(rule)
+    
+    def _is_active_rule(self, rule):
+        """
+        템플릿과 액션이 모두 있는 규칙인지 확인
+        
+        Args:
+            rule (dict): 규칙 설정 정보
+            
+        Returns:
+            bool: 인식 대상 규칙 여부
+        """
+        return bool(rule.get('template') and rule.get('actions', []))
+    
+    def _capture_region(self, frame_size):
+        """
+        이번 프레임에서 캡처할 부분 영역 (모든 규칙 검색 영역의 합집합)
+        
+        Args:
+            frame_size (tuple): 전체 프레임 (w, h) 크기 (알 수 없으면 None)
+            
+        Returns:
+            tuple: (x, y, w, h) 캡처 영역 (전체 화면을 검색하는 규칙이 있으면 None)
+        """
+        if not self.capture_sub_region or not frame_size:
+            return None
+        
+        # 화면 상태가 바뀌면 같은 프레임에서 새 상태의 규칙도 평가하므로 모든 규칙과 상태 검출 규칙 포함
+        rules = [rule for rule in self.rules if self._is_active_rule(rule)]
+        if self.screen_states:
+            rules += self.screen_states.detect_rules()
+        
+        frame_w, frame_h = frame_size
+        x0, y0, x1, y1 = frame_w, frame_h, 0, 0
+        for rule in rules:
+            roi = self._resolve_search_region(rule, (frame_h, frame_w))
+            if roi is None:
+                return None
+            
+            x, y, w, h = roi
+            x0, y0 = min(x0, max(0, x)), min(y0, max(0, y))
+            x1, y1 = max(x1, min(frame_w, x + w)), max(y1, min(frame_h, y + h))
+        
+        if x1 <= x0 or y1 <= y0 or (x1 - x0, y1 - y0) == (frame_w, frame_h):
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+    
+    @staticmethod
+    def _shift_rect(rect, origin, sign=1):
+        """
+        영역 좌표를 origin만큼 이동 (캡처 이미지 좌표 <-> 전체 프레임 좌표)
+        
+        Args:
+            rect (tuple): (x, y, w, h) 영역 (None 가능)
+            origin (tuple): (x, y) 이동량
+            sign (int): 1이면 더하고 -1이면 뺌
+            
+        Returns:
+            tuple: 이동된 (x, y, w, h) 영역 (rect가 None이면 None)
+        """
+        if rect is None or origin == (0, 0):
+            return rect
+        x, y, w, h = rect
+        return (x + sign * origin[0], y + sign * origin[1], w, h)
+    
+    def _resolve_search_region(self, rule, frame_shape):
+        """
+        규칙의 검색 영역을 이미지 픽셀 좌표로 변환
+        
+        규칙 설정 예:
+            search_region: {x: 0.5, y: 0.0, w: 0.5, h: 0.3, relative: true}  # 화면 비율
+            search_region: [600, 20, 200, 120]                               # 픽셀 좌표
+        
+        Args:
+            rule (dict): 규칙 설정 정보
+            frame_shape (tuple): 캡처 이미지 형태
+            
+        Returns:
+            tuple: (x, y, w, h) 검색 영역 (지정되지 않았으면 None)
+        """
+        region = rule.get('search_region')
+        if not region:
+            return None
+        
+        try:
+            if isinstance(region, dict):
+                x, y = region.get('x', 0), region.get('y', 0)
+                w, h = region.get('w', region.get('width')), region.get('h', region.get('height'))
+                relative = region.get('relative', False)
+            else:
+                x, y, w, h = region
+                relative = False
+            
+            img_h, img_w = frame_shape[:2]
+            if w is None:
+                w = 1.0 if relative else img_w - x
+            if h is None:
+                h = 1.0 if relative else img_h - y
+            
+            if relative:
+                x, w = x * img_w, w * img_w
+                y, h = y * img_h, h * img_h
+            
+            return (int(x), int(y), int(w), int(h))
+        except (TypeError, ValueError) as e:
+            print(f"검색 영역 설정 오류 {rule.get('template')}: {e}")
+            return None
+    
+    def _near_last_hit_region(self, index, rule):
+        """
+        직전 발견 위치 주변 검색 영역 계산
+        
+        규칙 설정 예:
+            search_near_last: true   # 기본 여유 범위 사용
+            search_near_last: 32     # 여유 범위 (픽셀)
+        
+        Args:
+            index (int): 규칙 인덱스
+            rule (dict): 규칙 설정 정보
+            
+        Returns:
+            tuple: (x, y, w, h) 검색 영역 (사용하지 않거나 직전 발견 기록이 없으면 None)
+        """
+        near_last = rule.get('search_near_last', False)
+        last_hit = self.last_hits.get(index)
+        if not near_last or last_hit is None:
+            return None
+        
+        margin = self.NEAR_LAST_HIT_MARGIN if near_last is True else int(near_last)
+        x, y, w, h = last_hit
+        return (x - margin, y - margin, w + margin * 2, h + margin * 2)
     
-
     def execute_actions(self, actions, position=None):
         """
         액션 목록 실행
@@ -152,9 +940,6 @@ class ProgramMonitor(threading.Thread):
             params = action.get('params', {})
             
             try:
-                # 윈도우 위치 가져오기
-                left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
-                
                 # 윈도우 활성화
                 win32gui.SetForegroundWindow(self.hwnd)
                 time.sleep(0.5)
@@ -177,9 +962,8 @@ class ProgramMonitor(threading.Thread):
                         x = params.get('x', 0)
                         y = params.get('y', 0)
                     
-                    # 화면 좌표로 변환
-                    screen_x = left + int(x)
-                    screen_y = top + int(y)
+                    # 화면 좌표로 변환 (캡처 영역 기준 좌표 - 기본은 클라이언트 영역 원점)
+                    screen_x, screen_y = self.capture_backend.to_screen(self.hwnd, x, y)
                     
                     # 마우스 이동 및 클릭
                     pydirectinput.moveTo(screen_x, screen_y)
@@ -216,8 +1000,12 @@ class ProgramMonitor(threading.Thread):
                     success = True
                 
                 elif action_type == 'wait':
-                    # 대기
-                    time.sleep(params.get('seconds', 1))
+                    # 대기 (중지되면 즉시 종료)
+                    self._stop_event.wait(params.get('seconds', 1))
+                    success = True
+                
+                elif action_type == 'set_state':
+                    # 화면 상태 전환은 apply_rule_hits에서 처리
                     success = True
                 
                 else:
@@ -250,9 +1038,6 @@ class ProgramMonitor(threading.Thread):
             if not self.hwnd or not win32gui.IsWindow(self.hwnd):
                 return False
             
-            # 윈도우 위치 가져오기
-            left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
-            
             # 윈도우 활성화
             win32gui.SetForegroundWindow(self.hwnd)
             time.sleep(0.3)
@@ -263,9 +1048,8 @@ class ProgramMonitor(threading.Thread):
                 y = params.get('y', 0)
                 button = params.get('button', 'left')
                 
-                # 화면 좌표로 변환
-                screen_x = left + int(x)
-                screen_y = top + int(y)
+                # 화면 좌표로 변환 (캡처 영역 기준 좌표 - 기본은 클라이언트 영역 원점)
+                screen_x, screen_y = self.capture_backend.to_screen(self.hwnd, x, y)
                 
                 # 마우스 이동
                 win32api.SetCursorPos((screen_x, screen_y))
@@ -325,9 +1109,9 @@ class ProgramMonitor(threading.Thread):
                 return True
                 
             elif action_type == 'wait':
-                # 대기 시간
+                # 대기 시간 (중지되면 즉시 종료)
                 seconds = params.get('seconds', 1)
-                time.sleep(seconds)
+                self._stop_event.wait(seconds)
                 return True
                 
             else:
@@ -386,11 +1170,22 @@ class ProgramMonitor(threading.Thread):
     def pause(self):
         """모니터링 일시 정지"""
         self.paused = True
+        self._resume_event.clear()
+        if self.capture_thread:
+            self.capture_thread.pause()
     
     def resume(self):
         """모니터링 재개"""
         self.paused = False
+        self._resume_event.set()
+        if self.capture_thread:
+            self.capture_thread.resume()
     
     def stop(self):
-        """모니터링 중지"""
-        self.running = False
\ No newline at end of file
+        """모니터링 중지 (대기 중인 루프를 즉시 깨움)"""
+        self.running = False
+        self._stop_event.set()
+        self._resume_event.set()
+        if self.capture_thread:
+            # 캡처 스레드가 끝나면 링 버퍼가 닫혀 프레임 대기도 즉시 끝남
+            self.capture_thread.stop()
\ No newline at end of file
@@ -0,0 +1,155 @@
+# monitoring/replay_runner.py
+
+import time
+import numpy as np
+from core.session_recording import SessionRecording
+from .program_monitor import ProgramMonitor
+
+class ReplayRunner:
+    """
+    기록된 세션을 ProgramMonitor 규칙 평가에 최대 속도로 통과시키는 벤치마크 실행기
+
+    실제 액션은 실행하지 않고 실행되었을 액션만 모아, 초당 프레임 수와 규칙별 매칭
+    지연 시간과 함께 보고합니다. 같은 기록으로 반복 실행하면 같은 결과가 나오므로
+    성능 회귀 확인에 사용할 수 있습니다.
+    """
+
+    def __init__(self, recording_path, resources_dir=None, program_config=None, repeat=1):
+        """
+        리플레이 실행기 초기화
+
+        Args:
+            recording_path (str): 기록 디렉토리 경로
+            resources_dir (str, optional): 리소스 디렉토리 경로
+            program_config (dict, optional): 사용할 프로그램 설정 (기본: 기록 당시 설정)
+            repeat (int): 기록 전체를 반복 재생할 횟수
+        """
+        self.recording = SessionRecording(recording_path)
+        self.repeat = max(1, int(repeat))
+
+        config = dict(program_config or self.recording.program_config)
+        if not config:
+            raise ValueError(f"기록에 프로그램 설정이 없음: {recording_path}")
+
+        # 재생 중에는 다시 기록하지 않음
+        config.pop('recording', None)
+
+        self.monitor = ProgramMonitor(config, resources_dir, action_handler=self._record_action)
+        self.fired = []          # 실행되었을 액션 목록
+        self._current_frame = None
+
+    def run(self):
+        """
+        기록 재생 및 측정
+
+        Returns:
+            dict: 측정 결과 (frames, evaluated, elapsed, fps, frame_latency, rules, actions,
+                recorded_actions)
+        """
+        self.fired = []
+        frame_times = []
+        rule_times = {}  # 규칙 인덱스 -> [소요 시간, ...]
+        evaluated = 0
+
+        started = time.perf_counter()
+        for _ in range(self.repeat):
+            self.monitor.reset_recognition_state()
+
+            for i in range(len(self.recording)):
+                image, entry = self.recording.frame(i)
+                origin = tuple(entry.get('origin') or (0, 0))
+                frame_size = tuple(entry['frame_size']) if entry.get('frame_size') else None
+                self._current_frame = entry['seq']
+
+                frame_start = time.perf_counter()
+                if self.monitor.process_frame(image, origin, frame_size, now=entry['t']):
+                    evaluated += 1
+                frame_times.append(time.perf_counter() - frame_start)
+
+                for index, elapsed in self.monitor.rule_timings.items():
+                    rule_times.setdefault(index, []).append(elapsed)
+        elapsed = time.perf_counter() - started
+
+        self.monitor.image_recognition.shutdown()
+
+        rules = {}
+        for index, times in sorted(rule_times.items()):
+            rules[index] = dict(self._latency_stats(times), template=self.monitor.rules[index].get('template'))
+
+        return {
+            'frames': len(frame_times),
+            'evaluated': evaluated,
+            'elapsed': elapsed,
+            'fps': len(frame_times) / elapsed if elapsed > 0 else 0.0,
+            'frame_latency': self._latency_stats(frame_times),
+            'rules': rules,
+            'actions': list(self.fired),
+            'recorded_actions': len(self.recording.actions) * self.repeat,
+        }
+
+    @staticmethod
+    def print_report(report):
+        """
+        측정 결과 출력
+
+        Args:
+            report (dict): run() 결과
+        """
+        frame = report['frame_latency']
+        print(f"프레임: {report['frames']} (인식 수행 {report['evaluated']}), "
+              f"소요 시간: {report['elapsed']:.3f}초, {report['fps']:.1f} fps")
+        print(f"프레임 지연: 평균 {frame['mean_ms']:.2f}ms, p50 {frame['p50_ms']:.2f}ms, "
+              f"p95 {frame['p95_ms']:.2f}ms, 최대 {frame['max_ms']:.2f}ms")
+
+        print("규칙별 매칭 지연:")
+        for index, stats in report['rules'].items():
+            print(f"  [{index}] {stats['template']}: {stats['count']}회, 평균 {stats['mean_ms']:.2f}ms, "
+                  f"p95 {stats['p95_ms']:.2f}ms, 최대 {stats['max_ms']:.2f}ms")
+
+        counts = {}
+        for action in report['actions']:
+            counts[action['template']] = counts.get(action['template'], 0) + 1
+        print(f"실행되었을 액션: {len(report['actions'])}건 (기록된 액션: {report['recorded_actions']}건)")
+        for template, count in counts.items():
+            print(f"  {template}: {count}건")
+
+    def _record_action(self, template_name, position, actions, rule):
+        """
+        실제 액션 대신 실행되었을 액션 기록 (ProgramMonitor action_handler)
+
+        Args:
+            template_name (str): 발견된 템플릿 이름
+            position (tuple): 발견된 위치 (x, y, w, h)
+            actions (list): 실행할 액션 목록
+            rule (dict): 규칙 설정 정보
+        """
+        self.fired.append({
+            'frame': self._current_frame,
+            'template': template_name,
+            'position': tuple(int(v) for v in position),
+            'actions': [action.get('type') for action in actions],
+        })
+        return True
+
+    @staticmethod
+    def _latency_stats(times):
+        """
+        소요 시간 통계 (내부 사용)
+
+        Args:
+            times (list): 소요 시간 목록 (초)
+
+        Returns:
+            dict: count, mean_ms, p50_ms, p95_ms, max_ms
+        """
+        if not times:
+            return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+
+        ms = np.asarray(times) * 1000.0
+        return {
+            'count': len(times),
+            'mean_ms': float(ms.mean()),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p95_ms': float(np.percentile(ms, 95)),
+            'max_ms': float(ms.max()),
+        }
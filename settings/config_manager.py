@@ -130,7 +130,22 @@ class ConfigManager:
             'enable_logging': True,
             'log_level': 'INFO',
             'startup_delay': 3.0,
-            'max_monitors': 10
+            'max_monitors': 10,
+            'execution_mode': 'thread',
+            'scheduler_workers': 0,
+            'process_count': 0,
+            'auto_click_change_detection': {
+                'enabled': False,
+                'threshold': 2.0,
+                'max_skip_age': 30.0
+            },
+            'auto_click_adaptive_interval': {
+                'enabled': False,
+                'min': 0.2,
+                'max': 10.0,
+                'idle_after': 5.0,
+                'backoff': 1.5
+            }
         }
         
         return self.save_system_config(default_config)
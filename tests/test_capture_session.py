@@ -0,0 +1,118 @@
+# tests/test_capture_session.py
+
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.capture_session import CaptureSession, GdiBackend
+
+class FakeGdiBackend(GdiBackend):
+    """윈도우 없이 캡처 세션을 확인하기 위한 가짜 GDI 구현 (픽셀 값은 좌표로 결정)"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.live = set()        # 해제되지 않은 가짜 핸들
+        self.read_rows = []      # read_bits로 읽은 행 수
+        self._next_handle = 0
+
+    def _handle(self, kind):
+        self._next_handle += 1
+        handle = (kind, self._next_handle)
+        self.live.add(handle)
+        return handle
+
+    def get_window_size(self, hwnd):
+        return self.width + 16, self.height + 39
+
+    def get_client_size(self, hwnd):
+        return self.width, self.height
+
+    def get_window_dc(self, hwnd):
+        return self._handle('window_dc')
+
+    def create_compatible_dc(self, window_dc):
+        return self._handle('mem_dc')
+
+    def create_bitmap(self, window_dc, width, height):
+        return self._handle('bitmap') + (width, height)
+
+    def select_object(self, mem_dc, bitmap):
+        pass
+
+    def print_window(self, hwnd, mem_dc, flags):
+        return True
+
+    def read_bits(self, bitmap, width, height, out):
+        # B = x, G = y, R = 0, A = 255
+        self.read_rows.append(height)
+        out[..., 0] = np.arange(width, dtype=np.uint8)[None, :]
+        out[..., 1] = np.arange(height, dtype=np.uint8)[:, None]
+        out[..., 2] = 0
+        out[..., 3] = 255
+        return out
+
+    def delete_bitmap(self, bitmap):
+        self.live.remove(bitmap[:2])
+
+    def delete_dc(self, mem_dc):
+        self.live.remove(mem_dc)
+
+    def release_window_dc(self, hwnd, window_dc):
+        self.live.remove(window_dc)
+
+class CaptureSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.gdi = FakeGdiBackend(64, 48)
+        self.session = CaptureSession(1, backend=self.gdi)
+
+    def test_reuses_resources_until_resize(self):
+        first = self.session.capture()
+        self.assertEqual(first.shape, (48, 64, 3))
+        self.session.capture()
+        self.assertEqual(self.session.allocated_handles, 3)
+        self.assertEqual(self.session.total_allocations, 3)
+
+        # 크기가 바뀌면 기존 핸들을 해제하고 새 크기로 다시 할당
+        self.gdi.width, self.gdi.height = 80, 60
+        resized = self.session.capture()
+        self.assertEqual(resized.shape, (60, 80, 3))
+        self.assertEqual(self.session.size, (80, 60))
+        self.assertEqual(self.session.allocated_handles, 3)
+        self.assertEqual(self.session.total_allocations, 6)
+        self.assertEqual(len(self.gdi.live), 3)
+
+    def test_sub_rect_is_clipped(self):
+        image = self.session.capture(rect=(50, 40, 30, 30))
+        self.assertEqual(image.shape, (8, 14, 3))
+        self.assertEqual(int(image[0, 0, 0]), 50)
+        self.assertEqual(int(image[0, 0, 1]), 40)
+        # 부분 영역 아래쪽 행은 읽지 않음
+        self.session.capture(rect=(0, 0, 10, 5))
+        self.assertEqual(self.gdi.read_rows, [48, 5])
+
+    def test_rect_outside_returns_none(self):
+        self.assertIsNone(self.session.capture(rect=(100, 100, 10, 10)))
+
+    def test_reuses_output_buffer(self):
+        out = np.zeros((10, 20, 3), dtype=np.uint8)
+        image = self.session.capture(out, rect=(5, 5, 20, 10))
+        self.assertIs(image, out)
+        self.assertEqual(int(out[0, 0, 0]), 5)
+
+    def test_close_releases_all_handles(self):
+        self.session.capture()
+        self.gdi.width = 32
+        self.session.capture()
+        self.session.close()
+        self.assertEqual(self.session.allocated_handles, 0)
+        self.assertEqual(len(self.gdi.live), 0)
+        self.assertTrue(self.session.closed)
+        self.assertIsNone(self.session.capture())
+
+if __name__ == '__main__':
+    unittest.main()